@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+"""
+Offline end-to-end benchmark of the Job Application Assistant pipeline
+
+Every agent is given a local stub LLM with a fixed latency and output size
+instead of the models configured in agents.yaml, so the numbers measure the
+pipeline's own overhead (crew construction, CrewAI orchestration, output
+extraction and saving) without network variance or API keys. The script
+reports the median of each phase and the estimated prompt tokens per section.
+
+Absolute times depend on the machine, so the baseline stores each phase as a
+multiple of the stub LLM time measured in the same run, plus the prompt
+tokens, which do not depend on the machine at all. The check fails when a
+phase's ratio grows by more than the allowed regression, or when a section's
+prompt grows.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py
+    python benchmarks/pipeline_benchmark.py --update-baseline
+    python benchmarks/pipeline_benchmark.py --latency 0.2 --output-chars 4000 --parallel
+    python benchmarks/pipeline_benchmark.py --structured-context
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import statistics
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = PROJECT_ROOT / "benchmarks" / "baselines" / "pipeline.json"
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Keep the run offline: no memory embeddings, telemetry, web search calls or metrics files
+os.environ.pop("OPENAI_API_KEY", None)
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("SEARCH_BACKEND", "local")
+os.environ.setdefault("METRICS_SINKS", "")
+
+from crewai.llms.base_llm import BaseLLM  # noqa: E402
+
+from src.main import JobApplicationAssistant  # noqa: E402
+from src.utils.compaction import estimate_tokens  # noqa: E402
+from src.utils.job_analysis import JobAnalysis  # noqa: E402
+from src.utils.crew_events import RunObserver, event_router  # noqa: E402
+from src.utils.result_cache import ResultCache  # noqa: E402
+
+# Section header each task prompt asks the agent to start its output with
+HEADER_PATTERN = re.compile(r'start your output with the header "(#[^"]+)"')
+
+FILLER = (
+    "Demonstrated experience delivering reliable Python services, collaborating with "
+    "product teams and mentoring engineers while keeping quality and cost in check. "
+)
+
+class StubLLM(BaseLLM):
+    """Deterministic LLM that answers every task immediately with canned text
+
+    The answer starts with the header requested by the task prompt, so the
+    output extraction runs exactly as it does with a real model. Prompts that
+    ask for no header (the structured job analysis) get a JobAnalysis as JSON.
+    """
+
+    def __init__(self, latency: float = 0.05, output_chars: int = 2000):
+        """
+        Initialize the stub
+
+        Args:
+            latency: Seconds each call sleeps to simulate the model
+            output_chars: Length of the generated answer body
+        """
+        super().__init__(model="stub/benchmark", temperature=0)
+        self.latency = latency
+        self.output_chars = output_chars
+        self.calls = 0
+        self.llm_seconds = 0.0
+        self.prompt_tokens: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs) -> str:
+        if isinstance(messages, str):
+            prompt = messages
+        else:
+            prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        match = HEADER_PATTERN.search(prompt)
+        header = match.group(1) if match else None
+
+        start = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        body = (FILLER * (self.output_chars // len(FILLER) + 1))[:self.output_chars]
+        if header:
+            answer = f"{header}\n\n{body}"
+        else:
+            answer = self.structured_answer(body)
+        with self._lock:
+            self.calls += 1
+            self.llm_seconds += time.perf_counter() - start
+            key = header or "# Job Analysis (structured)"
+            self.prompt_tokens[key] = self.prompt_tokens.get(key, 0) + estimate_tokens(prompt)
+        return f"Thought: I now know the final answer\nFinal Answer: {answer}"
+
+    @staticmethod
+    def structured_answer(body: str) -> str:
+        """Build a JobAnalysis answer of roughly the configured output size"""
+        items = [sentence.strip() for sentence in body.split(".") if sentence.strip()] or ["Python"]
+        return JobAnalysis(
+            job_title="Senior Python Developer",
+            company="Example Corp",
+            experience_level="5+ years",
+            key_skills=items[:3],
+            responsibilities=items[3:6] or items[:1],
+            keywords=["Python", "APIs", "Cloud"],
+        ).model_dump_json()
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 128000
+
+class TaskTimer(RunObserver):
+    """Records the wall time of each task of a run"""
+
+    def __init__(self):
+        """Initialize the timer"""
+        self.started: Dict[str, float] = {}
+        self.durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def on_task_started(self, task_name: str):
+        with self._lock:
+            self.started[task_name] = time.perf_counter()
+
+    def on_task_completed(self, task_name: str, output: Any):
+        with self._lock:
+            if task_name in self.started:
+                self.durations[task_name] = time.perf_counter() - self.started[task_name]
+
+def run_once(job_description: str, resume_text: str, llm: StubLLM, parallel: bool, work_dir: str,
+             structured_context: bool = False) -> Dict[str, float]:
+    """
+    Run one application end to end and time each phase
+
+    Args:
+        job_description: The job description text
+        resume_text: The resume text
+        llm: Stub LLM shared by every agent
+        parallel: Run the assistant in parallel mode
+        work_dir: Scratch directory for the cache and saved outputs
+        structured_context: Pass the job analysis to the other tasks as structured context
+
+    Returns:
+        Dict of phase name to seconds
+    """
+    timings: Dict[str, float] = {}
+    llm.calls, llm.llm_seconds, llm.prompt_tokens = 0, 0.0, {}
+    run_start = time.perf_counter()
+
+    assistant = JobApplicationAssistant(
+        parallel=parallel, cache=ResultCache(os.path.join(work_dir, "results.sqlite")), llm=llm,
+        structured_context=structured_context,
+    )
+    crew_instance = assistant.get_crew()
+    timings["crew_construction"] = time.perf_counter() - run_start
+
+    # Time extract_outputs as called from inside the processor
+    processor = assistant.processor
+    extract_outputs = processor.extract_outputs
+
+    def timed_extract_outputs(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return extract_outputs(*args, **kwargs)
+        finally:
+            timings["extract_outputs"] = timings.get("extract_outputs", 0.0) + time.perf_counter() - start
+
+    processor.extract_outputs = timed_extract_outputs
+
+    timer = TaskTimer()
+    event_router.watch(crew_instance.tasks, timer)
+    start = time.perf_counter()
+    try:
+        results = assistant.process_application(job_description, resume_text, use_cache=False)
+    finally:
+        event_router.unwatch(crew_instance.tasks, timer)
+    timings["process_application"] = time.perf_counter() - start
+    for task_name, seconds in timer.durations.items():
+        timings[f"task:{task_name}"] = seconds
+
+    missing = [section for section, content in results.items() if not content]
+    if missing:
+        raise RuntimeError(f"Sections missing from the result: {', '.join(missing)}")
+
+    start = time.perf_counter()
+    assistant.save_outputs(os.path.join(work_dir, "outputs"))
+    timings["save_outputs"] = time.perf_counter() - start
+
+    timings["total"] = time.perf_counter() - run_start
+    timings["llm"] = llm.llm_seconds
+    if not parallel:
+        # With sequential tasks every LLM second is on the critical path
+        timings["pipeline_overhead"] = timings["total"] - llm.llm_seconds
+    return timings
+
+def main():
+    """Run the pipeline benchmark"""
+    parser = argparse.ArgumentParser(description="Offline end-to-end pipeline benchmark")
+    parser.add_argument("--job", type=str, default=str(PROJECT_ROOT / "examples" / "job_description.txt"),
+                        help="Job description file")
+    parser.add_argument("--resume", type=str, default=str(PROJECT_ROOT / "examples" / "resume.txt"),
+                        help="Resume file")
+    parser.add_argument("--runs", type=int, default=5, help="Measured runs")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per stub LLM call")
+    parser.add_argument("--output-chars", type=int, default=2000, help="Characters per stub LLM answer")
+    parser.add_argument("--parallel", action="store_true", help="Benchmark the parallel task mode")
+    parser.add_argument("--structured-context", action="store_true",
+                        help="Pass the job analysis to the other tasks as structured context")
+    parser.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    parser.add_argument("--max-regression", type=float, default=0.50,
+                        help="Allowed growth of a phase's time relative to the LLM time (0.50 = 50%%); "
+                             "the overhead phases vary by about a third between runs")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="Slowdowns smaller than this many seconds are never reported")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store the measured ratios and prompt tokens as the new baseline")
+    args = parser.parse_args()
+
+    baseline: Dict[str, Any] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    elif not args.update_baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create it")
+        return 1
+
+    with open(args.job, "r", encoding="utf-8") as f:
+        job_description = f.read()
+    with open(args.resume, "r", encoding="utf-8") as f:
+        resume_text = f.read()
+
+    settings = {"latency": args.latency, "output_chars": args.output_chars, "parallel": args.parallel}
+    if args.structured_context:
+        settings["structured_context"] = True
+    llm = StubLLM(latency=args.latency, output_chars=args.output_chars)
+
+    runs: List[Dict[str, float]] = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Warm-up run so imports and first-use initialization are not measured
+        run_once(job_description, resume_text, llm, args.parallel, work_dir, args.structured_context)
+        for _ in range(args.runs):
+            runs.append(run_once(job_description, resume_text, llm, args.parallel, work_dir, args.structured_context))
+    # Prompts are deterministic, so the last run's token counts stand for every run
+    prompt_tokens = dict(sorted(llm.prompt_tokens.items()))
+
+    phases = sorted({phase for timings in runs for phase in timings},
+                    key=lambda phase: (phase.startswith("task:"), phase))
+    results = {
+        phase: round(statistics.median(timings[phase] for timings in runs if phase in timings), 4)
+        for phase in phases
+    }
+    # Each phase as a multiple of the stub LLM time of the same runs
+    llm_seconds = results["llm"]
+    ratios = {phase: round(seconds / llm_seconds, 4) for phase, seconds in results.items() if phase != "llm"}
+
+    baseline_ratios: Optional[Dict[str, float]] = baseline.get("ratios")
+    baseline_tokens: Dict[str, int] = baseline.get("prompt_tokens", {})
+    if baseline and baseline.get("settings") != settings:
+        print(f"Baseline was recorded with {baseline.get('settings')}; not comparing")
+        baseline_ratios, baseline_tokens = None, {}
+
+    print(f"Median of {args.runs} runs (stub latency {args.latency * 1000:.0f} ms, "
+          f"{args.output_chars} chars, {'parallel' if args.parallel else 'sequential'})")
+    regressions = []
+    for phase, seconds in results.items():
+        line = f"  {phase:40s} {seconds * 1000:9.1f} ms"
+        if phase in ratios:
+            line += f"  {ratios[phase]:6.2f}x llm"
+        if baseline_ratios and phase in baseline_ratios and phase in ratios:
+            reference = baseline_ratios[phase]
+            change = ratios[phase] / reference - 1 if reference else 0.0
+            line += f"  (baseline {reference:.2f}x, {change:+.0%})"
+            if change > args.max_regression and (ratios[phase] - reference) * llm_seconds > args.min_delta:
+                line += "  <-- REGRESSION"
+                regressions.append(phase)
+        print(line)
+
+    print(f"Estimated prompt tokens per section ({sum(prompt_tokens.values())} total)")
+    for header, tokens in prompt_tokens.items():
+        line = f"  {header:40s} {tokens:9d}"
+        if header in baseline_tokens:
+            line += f"  (baseline {baseline_tokens[header]})"
+            if tokens > baseline_tokens[header]:
+                line += "  <-- REGRESSION"
+                regressions.append(f"prompt {header}")
+        print(line)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"settings": settings, "ratios": ratios, "prompt_tokens": prompt_tokens}, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"Pipeline check failed for: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Shared rate limiter benchmark for the Job Application Assistant
+
+Several worker processes, each with several threads, call a simulated
+provider that answers 429 with a Retry-After header once its quota is
+exceeded. The same load is run with the shared client-side limiter and
+without it (retries only), reporting the successful call rate against the
+quota, the number of 429 answers and the call latency.
+
+Usage:
+    python benchmarks/rate_limiter_benchmark.py
+    python benchmarks/rate_limiter_benchmark.py --quota 20 --processes 4 --threads 8 --duration 10
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import statistics
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.rate_limit import RateLimiter, RetryPolicy, call_with_retry  # noqa: E402
+
+# Every retry is logged as a warning; the summary is what matters here
+logging.getLogger("src.utils.rate_limit").setLevel(logging.ERROR)
+
+PROVIDER = "bench"
+KEY = f"{PROVIDER}:default"
+
+class QuotaExceeded(Exception):
+    """429 answer of the simulated provider"""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Quota exceeded, retry after {retry_after:.2f}s")
+        self.headers = {"retry-after": f"{retry_after:.3f}"}
+
+class SimulatedProvider:
+    """Provider enforcing a quota across processes with its own bucket database"""
+
+    def __init__(self, path: str, quota: float, burst: int, latency: float):
+        self.bucket = RateLimiter(path, limits={PROVIDER: (quota, burst)})
+        self.interval = 1.0 / quota
+        self.tolerance = self.interval * (burst - 1)
+        self.latency = latency
+
+    def call(self):
+        def admit(tat: float, now: float):
+            tat = max(tat, now)
+            early = tat - self.tolerance - now
+            if early > 0:
+                # Rejected calls do not use up the quota
+                return tat, early
+            return tat + self.interval, 0.0
+
+        rejected_for = self.bucket._update(KEY, admit)
+        if rejected_for > 0:
+            raise QuotaExceeded(rejected_for)
+        time.sleep(self.latency)
+
+def worker(args, work_dir: str, limited: bool, results):
+    """Run the calls of one process and report (successes, 429s, latencies)"""
+    provider = SimulatedProvider(os.path.join(work_dir, "provider.sqlite"), args.quota, args.burst, args.latency)
+    limiter = RateLimiter(os.path.join(work_dir, "client.sqlite"), limits={PROVIDER: (args.quota, args.burst)},
+                          enabled=limited)
+    policy = RetryPolicy(max_attempts=50, base_delay=0.05, max_delay=2.0)
+    deadline = time.time() + args.duration
+    rejected = []
+
+    def counted_call():
+        try:
+            provider.call()
+        except QuotaExceeded:
+            rejected.append(1)
+            raise
+
+    def thread_loop(_):
+        latencies = []
+        while time.time() < deadline:
+            start = time.perf_counter()
+            try:
+                call_with_retry(counted_call, KEY, limiter=limiter, policy=policy, description="benchmark call")
+            except QuotaExceeded:
+                continue
+            if time.time() <= deadline:
+                latencies.append(time.perf_counter() - start)
+        return latencies
+
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        latencies = [latency for chunk in executor.map(thread_loop, range(args.threads)) for latency in chunk]
+    results.put((len(latencies), len(rejected), latencies))
+
+def run(args, limited: bool):
+    """Run the load once and summarize it"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=worker, args=(args, work_dir, limited, results))
+                     for _ in range(args.processes)]
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    successes = sum(result[0] for result in collected)
+    rejected = sum(result[1] for result in collected)
+    latencies = sorted(latency for result in collected for latency in result[2])
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    return {
+        "rate": successes / args.duration,
+        "rejected": rejected,
+        "median": statistics.median(latencies) if latencies else 0.0,
+        "p95": p95,
+    }
+
+def main():
+    """Run the rate limiter benchmark"""
+    parser = argparse.ArgumentParser(description="Shared rate limiter benchmark")
+    parser.add_argument("--quota", type=float, default=20.0, help="Provider quota in calls per second")
+    parser.add_argument("--burst", type=int, default=5, help="Provider burst size")
+    parser.add_argument("--processes", type=int, default=4, help="Worker processes")
+    parser.add_argument("--threads", type=int, default=8, help="Threads per process")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of load per mode")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds per successful provider call")
+    args = parser.parse_args()
+
+    print(f"{args.processes} processes x {args.threads} threads against a quota of {args.quota:g} calls/s "
+          f"for {args.duration:g}s")
+    for name, limited in (("shared limiter", True), ("retries only", False)):
+        summary = run(args, limited)
+        print(f"  {name:16s} {summary['rate']:7.1f} calls/s ({summary['rate'] / args.quota:4.0%} of quota)  "
+              f"{summary['rejected']:6d} x 429  median {summary['median'] * 1000:7.1f} ms  "
+              f"p95 {summary['p95'] * 1000:7.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
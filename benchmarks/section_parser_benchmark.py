@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Section parser micro-benchmark for the Job Application Assistant
+
+Generates combined crew outputs of increasing size and splits them into
+sections with the previous line-by-line string concatenation and with the
+single-pass SectionParser, both in one call and fed in streamed chunks. The
+results of every method are checked against each other.
+
+Usage:
+    python benchmarks/section_parser_benchmark.py
+    python benchmarks/section_parser_benchmark.py --sizes 1 8 32 --chunk-size 64
+"""
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.sections import SECTION_HEADERS, SectionParser, parse_sections  # noqa: E402
+
+LINE = "- Built and operated Python services handling millions of requests per day with on-call ownership\n"
+
+def build_output(size_mb: float) -> str:
+    """Build combined crew output of roughly the given size with every section in order"""
+    lines_per_section = max(1, int(size_mb * 1024 * 1024 / len(SECTION_HEADERS) / len(LINE)))
+    parts = ["Crew run summary\n"]
+    for title in SECTION_HEADERS.values():
+        parts.append(f"# {title}\n")
+        parts.append(LINE * lines_per_section)
+    return "".join(parts)
+
+def legacy_parse(result_text: str):
+    """The previous fallback: per-line header checks and string concatenation"""
+    outputs = {}
+    sections = []
+    current_section = ""
+    for line in result_text.split('\n'):
+        if any(header in line.lower() for header in ['# job analysis', '# resume suggestions', '# cover letter', '# interview preparation']):
+            if current_section.strip():
+                sections.append(current_section.strip())
+            current_section = line + '\n'
+        else:
+            current_section += line + '\n'
+    if current_section.strip():
+        sections.append(current_section.strip())
+    for section in sections:
+        section_lower = section.lower()
+        if "# job analysis" in section_lower:
+            outputs["job_analysis"] = section
+        elif "# resume suggestions" in section_lower:
+            outputs["resume_suggestions"] = section
+        elif "# cover letter" in section_lower:
+            outputs["cover_letter"] = section
+        elif "# interview preparation" in section_lower:
+            outputs["interview_prep"] = section
+    return outputs
+
+def streamed_parse(text: str, chunk_size: int):
+    """Feed the text to a SectionParser in fixed-size chunks"""
+    parser = SectionParser()
+    for start in range(0, len(text), chunk_size):
+        parser.feed(text[start:start + chunk_size])
+    return parser.close().sections()
+
+def best_time(function, *args, runs: int):
+    """Return the fastest of several runs and the last result"""
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings), result
+
+def main():
+    """Run the section parser benchmark"""
+    parser = argparse.ArgumentParser(description="Section parser micro-benchmark")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.1, 1, 4, 16], help="Output sizes in MB")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per method and size")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Characters per streamed chunk")
+    args = parser.parse_args()
+
+    methods = {
+        "legacy": lambda text: legacy_parse(text),
+        "parse_sections": lambda text: parse_sections(text),
+        f"streamed ({args.chunk_size} chars)": lambda text: streamed_parse(text, args.chunk_size),
+    }
+
+    mismatches = 0
+    for size in args.sizes:
+        text = build_output(size)
+        print(f"\n{len(text) / 1024 / 1024:.1f} MB")
+        reference = None
+        for name, method in methods.items():
+            fastest, median, result = best_time(method, text, runs=args.runs)
+            throughput = len(text) / 1024 / 1024 / fastest if fastest else float("inf")
+            status = ""
+            if reference is None:
+                reference = result
+            elif result != reference:
+                status = "  <-- RESULT DIFFERS"
+                mismatches += 1
+            print(f"  {name:24s} best {fastest * 1000:9.1f} ms  median {median * 1000:9.1f} ms  "
+                  f"{throughput:8.1f} MB/s{status}")
+
+    if mismatches:
+        print(f"{mismatches} results differ from the legacy parser")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+Startup time benchmark for the Job Application Assistant entry points
+
+Each target is started in a fresh interpreter with `python -X importtime`.
+The script reports the median wall time per target, relative to a bare
+interpreter started in the same run, together with the slowest imports.
+
+Wall times depend on the machine, so the checks only use quantities that do
+not: a target fails when it imports one of the modules it must load lazily,
+or when it imports more modules than its stored baseline by more than the
+allowed regression.
+
+Usage:
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --update-baseline
+    python benchmarks/startup_benchmark.py --max-regression 0.05 --runs 7
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = PROJECT_ROOT / "benchmarks" / "baselines" / "startup.json"
+
+# Entry points measured, as interpreter arguments
+TARGETS = {
+    "run.py (no args)": ["run.py"],
+    "import src.main": ["-c", "import src.main"],
+    "import streamlit_app": ["-c", "import streamlit_app"],
+}
+
+# Packages each target must not import at startup (they are loaded on first use)
+LAZY_MODULES = {
+    "run.py (no args)": ("crewai", "crewai_tools", "litellm"),
+    "import src.main": ("crewai_tools",),
+    "import streamlit_app": ("crewai", "crewai_tools", "litellm"),
+}
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$")
+
+def parse_importtime(stderr: str):
+    """
+    Parse `-X importtime` output
+
+    Args:
+        stderr: Standard error of the measured process
+
+    Returns:
+        Tuple of (cumulative microseconds and module name of the top-level
+        imports, names of every imported module)
+    """
+    imports = []
+    modules = set()
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4).strip())
+        # Only direct imports (a single leading space) so nested modules are not double counted
+        if len(match.group(3)) == 1:
+            imports.append((int(match.group(2)), match.group(4).strip()))
+    return imports, modules
+
+def measure(args, runs: int):
+    """
+    Start a target several times and collect timings
+
+    Args:
+        args: Interpreter arguments of the target
+        runs: Number of fresh interpreter runs
+
+    Returns:
+        Tuple of (median wall seconds, top-level imports and imported modules
+        of the last run)
+    """
+    wall_times = []
+    imports, modules = [], set()
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", *args],
+            cwd=PROJECT_ROOT, capture_output=True, text=True,
+        )
+        wall_times.append(time.perf_counter() - start)
+        if completed.returncode != 0:
+            errors = "\n".join(line for line in completed.stderr.splitlines() if not line.startswith("import time:"))
+            raise RuntimeError(f"{' '.join(args)} exited with {completed.returncode}:\n{errors[-2000:]}")
+        imports, modules = parse_importtime(completed.stderr)
+    return statistics.median(wall_times), imports, modules
+
+def main():
+    """Run the startup benchmark"""
+    parser = argparse.ArgumentParser(description="Startup time benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreter runs per target")
+    parser.add_argument("--top", type=int, default=5, help="Number of slowest imports shown per target")
+    parser.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    parser.add_argument("--max-regression", type=float, default=0.10,
+                        help="Allowed growth of the imported module count relative to the baseline (0.10 = 10%%)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store the measured module counts as the new baseline")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    elif not args.update_baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create it")
+        return 1
+
+    # Reference measured in this run, so the wall times can be compared across machines
+    bare_wall, _, bare_modules = measure(["-c", "pass"], args.runs)
+    print(f"bare interpreter: {bare_wall * 1000:.0f} ms, {len(bare_modules)} modules")
+
+    results = {}
+    regressions = []
+    for name, target_args in TARGETS.items():
+        try:
+            wall, imports, modules = measure(target_args, args.runs)
+        except RuntimeError as e:
+            print(f"{name}: failed\n{e}")
+            regressions.append(name)
+            continue
+        results[name] = {"modules": len(modules)}
+
+        line = f"{name}: {wall * 1000:.0f} ms ({wall / bare_wall:.1f}x bare), {len(modules)} modules"
+        eager = [module for module in LAZY_MODULES.get(name, ()) if module in modules]
+        if eager:
+            line += f"  <-- IMPORTS {', '.join(eager)}"
+            regressions.append(name)
+        if name in baseline:
+            expected = baseline[name]["modules"]
+            change = len(modules) / expected - 1
+            line += f" (baseline {expected} modules, {change:+.0%})"
+            if change > args.max_regression:
+                line += "  <-- REGRESSION"
+                regressions.append(name)
+        elif not args.update_baseline:
+            line += "  <-- NO BASELINE"
+            regressions.append(name)
+        print(line)
+        for cumulative, module in sorted(imports, reverse=True)[:args.top]:
+            print(f"    {cumulative / 1000:8.1f} ms  {module}")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"Startup check failed for: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,21 +6,37 @@ This script provides a convenient way to run the Job Application Assistant.
 """
 import os
 import sys
+import json
+import time
 import argparse
+import threading
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Ensure we can import the package by adding the project root to sys.path
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
-from src.main import JobApplicationAssistant
+# The assistant pulls in CrewAI, which takes seconds to import, so it is only
+# imported by the code paths that actually run a crew.
 
 def parse_args():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description='Job Application Assistant')
     parser.add_argument('--job', type=str, help='Path to job description file')
     parser.add_argument('--resume', type=str, help='Path to resume file')
+    parser.add_argument('--resumes', type=str, nargs='+', help='Paths to several resume files to run against one --job')
     parser.add_argument('--output', type=str, default='outputs', help='Output directory for generated files')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached results and run the crew again')
+    parser.add_argument('--parallel', action='store_true', help='Run the resume, cover letter and interview tasks concurrently')
+    parser.add_argument('--structured-context', action='store_true', help='Give the other tasks the structured job analysis instead of the raw job description')
+    parser.add_argument('--batch', type=str, help='Path to a JSONL manifest with one {"job", "resume", "output"} entry per line')
+    parser.add_argument('--workers', type=int, default=4, help='Number of applications processed concurrently in batch, --resumes and --serve mode')
+    parser.add_argument('--bundle', choices=['zip', 'json'], help='Save each application as one zip or JSON file instead of one file per section')
+    parser.add_argument('--serve', action='store_true', help='Run the HTTP job queue service instead of a single run')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Interface the service listens on')
+    parser.add_argument('--port', type=int, default=8000, help='Port the service listens on')
+    parser.add_argument('--results', type=str, help='JSONL file batch results are appended to (default: <output>/batch_results.jsonl)')
     return parser.parse_args()
 
 def read_file(file_path):
@@ -28,35 +44,185 @@ def read_file(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
         return f.read()
 
+def read_manifest(manifest_path):
+    """
+    Read a batch manifest
+    
+    Args:
+        manifest_path: Path to a JSONL file, one application per line
+        
+    Returns:
+        List of (line number, entry) tuples; entry is the parsed dict or the
+        exception raised while parsing the line
+    """
+    entries = []
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                if not isinstance(entry, dict) or not entry.get('job') or not entry.get('resume'):
+                    raise ValueError("each manifest line needs 'job' and 'resume' paths")
+            except ValueError as e:
+                entry = e
+            entries.append((line_number, entry))
+    return entries
+
+def run_batch(args):
+    """
+    Process every application in a batch manifest on a bounded worker pool
+    
+    Workers borrow pre-built assistants from a pool sized to the worker count,
+    so crews are only built once per worker. Results are appended to the results file as soon as each item
+    finishes; a failing item is recorded and does not stop the batch.
+    
+    Args:
+        args: Parsed command line arguments
+        
+    Returns:
+        int: Number of failed items
+    """
+    from src.assistant_pool import get_pool
+    
+    entries = read_manifest(args.batch)
+    results_path = args.results or os.path.join(args.output, "batch_results.jsonl")
+    os.makedirs(os.path.dirname(results_path) or ".", exist_ok=True)
+    
+    pool = get_pool(args.workers, parallel=args.parallel, structured_context=args.structured_context)
+    write_lock = threading.Lock()
+    
+    def process_entry(line_number, entry):
+        record = {"line": line_number, "status": "ok", "started_at": time.time()}
+        start = time.perf_counter()
+        try:
+            if isinstance(entry, Exception):
+                raise entry
+            record.update({key: entry.get(key) for key in ('id', 'job', 'resume')})
+            output_dir = entry.get('output') or os.path.join(args.output, "batch", str(line_number))
+            record["output_dir"] = output_dir
+            
+            job_description = read_file(entry['job'])
+            resume_text = read_file(entry['resume'])
+            with pool.acquire() as assistant:
+                assistant.process_application(job_description, resume_text, use_cache=not args.no_cache)
+                record["files"] = assistant.save_outputs(output_dir, bundle=args.bundle)
+                if assistant.metrics:
+                    record["metrics"] = assistant.metrics["totals"]
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {str(e)}"
+        record["duration_seconds"] = round(time.perf_counter() - start, 3)
+        
+        with write_lock:
+            with open(results_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+        return record
+    
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [executor.submit(process_entry, line_number, entry) for line_number, entry in entries]
+        for done, future in enumerate(as_completed(futures), start=1):
+            record = future.result()
+            if record["status"] != "ok":
+                failures += 1
+            print(f"[{done}/{len(futures)}] line {record['line']}: {record['status']} "
+                  f"({record['duration_seconds']}s){' - ' + record['error'] if 'error' in record else ''}")
+    
+    print(f"Batch completed: {len(entries) - failures} succeeded, {failures} failed.")
+    print(f"Results appended to {results_path}")
+    return failures
+
+def run_resumes(args):
+    """
+    Run one job description against several resumes, analyzing the job only once
+    
+    Args:
+        args: Parsed command line arguments
+        
+    Returns:
+        int: Number of resumes that failed
+    """
+    from datetime import datetime
+    from src.assistant_pool import get_pool
+    from src.utils.application_processor import ApplicationProcessor
+    
+    job_description = read_file(args.job)
+    resumes = [read_file(path) for path in args.resumes]
+    
+    with get_pool(parallel=args.parallel, structured_context=args.structured_context).acquire() as assistant:
+        results = assistant.process_resumes(
+            job_description, resumes, max_workers=args.workers, use_cache=not args.no_cache
+        )
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    failures = 0
+    for index, (resume_path, outputs) in enumerate(zip(args.resumes, results), start=1):
+        if isinstance(outputs, Exception):
+            failures += 1
+            print(f"- {resume_path}: failed ({str(outputs)})")
+            continue
+        
+        # Save each resume's outputs in its own directory
+        output_dir = os.path.join(args.output, "cmd", timestamp, f"{index}_{Path(resume_path).stem}")
+        processor = ApplicationProcessor()
+        processor.outputs = outputs
+        processor.save_outputs(output_dir, bundle=args.bundle)
+        print(f"- {resume_path}: saved to {output_dir}")
+    
+    print(f"Job Application Assistant processed {len(resumes) - failures} of {len(resumes)} resumes.")
+    return failures
+
 def main():
     """Run the Job Application Assistant from command line"""
     args = parse_args()
     
-    if args.job and args.resume:
+    if args.serve:
+        from src.service import serve
+        serve(args.host, args.port, workers=args.workers, output_dir=os.path.join(args.output, "service"),
+              parallel=args.parallel, structured_context=args.structured_context)
+    elif args.batch:
+        failures = run_batch(args)
+        sys.exit(1 if failures else 0)
+    elif args.job and args.resumes:
+        failures = run_resumes(args)
+        sys.exit(1 if failures else 0)
+    elif args.job and args.resume:
         # Read job description and resume from files
         job_description = read_file(args.job)
         resume_text = read_file(args.resume)
         
-        # Create and run the job application assistant
-        assistant = JobApplicationAssistant()
-        results = assistant.process_application(job_description, resume_text)
-        
         # Create specific output directory for command line runs
         from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         cmd_output_dir = os.path.join(args.output, "cmd", timestamp)
         
-        # Save outputs
-        saved_files = assistant.save_outputs(cmd_output_dir)
+        # Run a pooled job application assistant and save its outputs
+        from src.assistant_pool import get_pool
+        with get_pool(parallel=args.parallel, structured_context=args.structured_context).acquire() as assistant:
+            results = assistant.process_application(job_description, resume_text, use_cache=not args.no_cache)
+            saved_files = assistant.save_outputs(cmd_output_dir, bundle=args.bundle)
+            metrics = assistant.metrics
         
         print("Job Application Assistant process completed.")
         print("Files saved:")
         for output_type, file_path in saved_files.items():
             print(f"- {output_type}: {file_path}")
+        if metrics and metrics["tasks"]:
+            print("Task metrics:")
+            for task in metrics["tasks"]:
+                cost = f", ${task['cost_usd']:.4f}" if task["cost_usd"] is not None else ""
+                print(f"- {task['task']} ({task['model']}, tier {task['tier']}): {task['duration_seconds']}s, "
+                      f"{task['prompt_tokens']}+{task['completion_tokens']} tokens, "
+                      f"{task['tool_calls']} tool calls{cost}")
     else:
         print("Usage examples:")
         print("python run.py --job job_description.txt --resume resume.txt")
         print("python run.py --job job_description.txt --resume resume.txt --output my_outputs")
+        print("python run.py --job job_description.txt --resume resume.txt --parallel")
+        print("python run.py --batch manifest.jsonl --workers 8")
+        print("python run.py --job job_description.txt --resumes alice.txt bob.txt carol.txt")
+        print("python run.py --serve --port 8000 --workers 4")
         print("\nAlternatively, run the Streamlit UI with: streamlit run streamlit_app.py")
 
 if __name__ == "__main__":
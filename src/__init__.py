@@ -4,4 +4,12 @@ Job Application Assistant - A career toolkit powered by CrewAI and Gemini.
 
 # We'll use a different approach for imports to avoid circular references
 # These will be imported when someone does "from CrewAI import X"
-__all__ = ['JobApplicationAssistant', 'main']
\ No newline at end of file
+# `main` is not exported: src.main is the submodule, and its main() is the CLI entry point
+__all__ = ['JobApplicationAssistant', 'process_applications', 'process_applications_as_completed']
+
+def __getattr__(name):
+    """Import the assistant lazily so importing the package does not load CrewAI"""
+    if name in __all__:
+        from . import main as module
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
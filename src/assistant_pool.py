@@ -0,0 +1,189 @@
+"""
+Process-wide pools of pre-built Job Application Assistants
+"""
+import os
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional
+
+from .main import JobApplicationAssistant
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Default number of assistants per pool
+DEFAULT_POOL_SIZE = int(os.getenv("ASSISTANT_POOL_SIZE", "4"))
+# Largest size a pool grows to, however many workers ask for; every pooled
+# assistant keeps its agents, crews and LLM clients in memory for the process lifetime
+MAX_POOL_SIZE = int(os.getenv("ASSISTANT_POOL_MAX_SIZE", "16"))
+
+class AssistantPool:
+    """Thread-safe pool of assistants with their agents, tasks and crews already built
+
+    Building the agents, tasks, LLM clients and crew of an assistant is paid
+    once per pooled assistant instead of once per application. An assistant is
+    used by one run at a time and reset when it goes back into the pool.
+    """
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, max_size: int = MAX_POOL_SIZE, **assistant_kwargs):
+        """
+        Initialize the pool
+
+        Args:
+            size: Maximum number of assistants; acquire blocks when all are in use
+            max_size: Upper bound for size, also when ensure_size asks for more
+            **assistant_kwargs: Keyword arguments for JobApplicationAssistant
+        """
+        self.max_size = max(1, max_size)
+        self.size = min(size, self.max_size)
+        self.assistant_kwargs = assistant_kwargs
+        self._idle: List[JobApplicationAssistant] = []
+        self._created = 0
+        self._condition = threading.Condition()
+
+    def _create(self) -> JobApplicationAssistant:
+        """Build an assistant and its crew"""
+        assistant = JobApplicationAssistant(**self.assistant_kwargs)
+        assistant.warm_up()
+        return assistant
+
+    def ensure_size(self, size: int):
+        """
+        Grow the pool so at least `size` assistants can be in use at once
+
+        The size never exceeds max_size; callers asking for more share the
+        max_size assistants and wait in acquire for a free one.
+        """
+        if size > self.max_size:
+            logger.warning(f"Assistant pool capped at {self.max_size} assistants ({size} requested)")
+            size = self.max_size
+        with self._condition:
+            if size > self.size:
+                self.size = size
+                self._condition.notify_all()
+
+    def warm_up(self, count: Optional[int] = None):
+        """
+        Pre-build assistants so the first runs do not pay construction cost
+
+        Args:
+            count: Number of assistants to have ready (defaults to the pool size)
+        """
+        count = min(count or self.size, self.size)
+        while True:
+            with self._condition:
+                if self._created >= count:
+                    return
+                self._created += 1
+            try:
+                assistant = self._create()
+            except Exception:
+                with self._condition:
+                    self._created -= 1
+                raise
+            with self._condition:
+                self._idle.append(assistant)
+                self._condition.notify()
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[JobApplicationAssistant]:
+        """
+        Borrow an assistant for one run
+
+        Args:
+            timeout: Seconds to wait for a free assistant, or None to wait forever
+
+        Yields:
+            JobApplicationAssistant reserved for the caller
+        """
+        build = False
+        with self._condition:
+            while not self._idle and self._created >= self.size:
+                if not self._condition.wait(timeout):
+                    raise TimeoutError("No assistant became available in time")
+            if self._idle:
+                assistant = self._idle.pop()
+            else:
+                self._created += 1
+                build = True
+
+        if build:
+            try:
+                assistant = self._create()
+            except Exception:
+                with self._condition:
+                    self._created -= 1
+                    self._condition.notify()
+                raise
+
+        try:
+            yield assistant
+        finally:
+            assistant.reset()
+            with self._condition:
+                self._idle.append(assistant)
+                self._condition.notify()
+
+    @asynccontextmanager
+    async def acquire_async(self, timeout: Optional[float] = None) -> AsyncIterator[JobApplicationAssistant]:
+        """
+        Borrow an assistant for one run without blocking the event loop (see acquire)
+
+        Args:
+            timeout: Seconds to wait for a free assistant, or None to wait forever
+
+        Yields:
+            JobApplicationAssistant reserved for the caller
+        """
+        borrowed = self.acquire(timeout)
+        entering = asyncio.ensure_future(asyncio.to_thread(borrowed.__enter__))
+
+        def give_back(done: asyncio.Future):
+            if not done.cancelled() and done.exception() is None:
+                borrowed.__exit__(None, None, None)
+
+        try:
+            assistant = await asyncio.shield(entering)
+        except asyncio.CancelledError:
+            # The wait goes on in its thread; return the assistant once it is handed out
+            entering.add_done_callback(give_back)
+            raise
+        try:
+            yield assistant
+        finally:
+            borrowed.__exit__(None, None, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of built, idle and busy assistants"""
+        with self._condition:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "busy": self._created - len(self._idle),
+            }
+
+_pools: Dict[Any, AssistantPool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(size: Optional[int] = None, **assistant_kwargs) -> AssistantPool:
+    """
+    Return the process-wide pool for an assistant configuration
+
+    Args:
+        size: Minimum pool size
+        **assistant_kwargs: Keyword arguments for JobApplicationAssistant
+
+    Returns:
+        AssistantPool shared by every caller using the same configuration
+    """
+    key = tuple(sorted(assistant_kwargs.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = AssistantPool(size or DEFAULT_POOL_SIZE, **assistant_kwargs)
+    if size:
+        pool.ensure_size(size)
+    return pool
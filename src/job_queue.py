@@ -0,0 +1,462 @@
+"""
+Background job queue running applications on pooled Job Application Assistants
+"""
+import os
+import time
+import uuid
+import queue
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+from .assistant_pool import get_pool
+from .utils.crew_events import RunObserver, event_router
+from .utils.sections import TASK_SECTIONS, task_output_text
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Job states; the last three are final
+QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED = "queued", "running", "completed", "failed", "cancelled"
+FINAL_STATES = (COMPLETED, FAILED, CANCELLED)
+
+# Seconds between checks for jobs abandoned by their clients
+REAP_INTERVAL = 5.0
+# Seconds an idle worker waits for a job before checking whether the queue is stopping
+STOP_POLL_INTERVAL = 0.5
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+class Job:
+    """One application submitted to the queue and its progress
+
+    Section texts and task states are updated from the worker and the crew's
+    task threads; readers take a snapshot with to_dict() or block in
+    wait_for_update() until something changes.
+    """
+
+    def __init__(self, job_description: str, resume_text: str, use_cache: bool = True,
+                 heartbeat_timeout: Optional[float] = None):
+        """
+        Initialize the job
+
+        Args:
+            job_description: The job description text
+            resume_text: The resume text
+            use_cache: Reuse a cached result when available
+            heartbeat_timeout: Cancel the job when its client has not called
+                touch() for this many seconds (None: never)
+        """
+        self.id = uuid.uuid4().hex
+        self.job_description = job_description
+        self.resume_text = resume_text
+        self.use_cache = use_cache
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+        self.current_task: Optional[str] = None
+        self.tasks: Dict[str, str] = {task_name: "pending" for task_name in TASK_SECTIONS}
+        self.sections: Dict[str, str] = {}
+        self.files: Dict[str, str] = {}
+        # Saved documents by file name, kept in memory for downloads
+        self.documents: Dict[str, str] = {}
+        self.error: Optional[str] = None
+        self.metrics: Optional[Dict[str, Any]] = None
+        self.version = 0
+        self.heartbeat_timeout = heartbeat_timeout
+        self.last_seen = time.monotonic()
+        # Set to abort the run; checked before every LLM call of the crew
+        self.cancel_event = threading.Event()
+        self._condition = threading.Condition()
+
+    def _changed(self):
+        """Wake the readers waiting for an update; the caller holds the condition"""
+        self.version += 1
+        self._condition.notify_all()
+
+    def update(self, **fields):
+        """Set job fields and notify the readers"""
+        with self._condition:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self._changed()
+
+    def set_section(self, section: str, text: str):
+        """Store the latest text of a section (called from the crew's threads)"""
+        with self._condition:
+            self.sections[section] = text
+            self._changed()
+
+    def set_task(self, task_name: str, state: str):
+        """Record the state of a task (called from the crew's threads)"""
+        with self._condition:
+            self.tasks[task_name] = state
+            if state == "running":
+                self.current_task = task_name
+            elif self.current_task == task_name:
+                self.current_task = next((name for name, value in self.tasks.items() if value == "running"), None)
+            self._changed()
+
+    def start(self) -> bool:
+        """
+        Mark a queued job running
+
+        Returns:
+            bool: Whether the job was still queued (False once it was cancelled)
+        """
+        with self._condition:
+            if self.status != QUEUED:
+                return False
+            self.status = RUNNING
+            self.started_at = time.time()
+            self._changed()
+        return True
+
+    def finish(self, status: str, **fields):
+        """
+        Move the job to a final state and set job fields
+
+        A job whose cancellation was requested ends cancelled even if its run
+        got to the end, since the client was already told it would be.
+
+        Args:
+            status: COMPLETED or FAILED
+            **fields: Job fields to set along with the status
+        """
+        with self._condition:
+            if self.cancel_event.is_set():
+                status, fields = CANCELLED, {}
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.status = status
+            self.current_task = None
+            self.ended_at = time.time()
+            self._changed()
+
+    def cancel(self) -> bool:
+        """
+        Cancel the job
+
+        A queued job is cancelled at once. A running job is aborted at its next
+        LLM call; the worker then marks it cancelled and takes the next job.
+
+        Returns:
+            bool: Whether the job was still queued or running
+        """
+        with self._condition:
+            if self.done:
+                return False
+            self.cancel_event.set()
+            if self.status == QUEUED:
+                self.status = CANCELLED
+                self.ended_at = time.time()
+            self._changed()
+        return True
+
+    def touch(self):
+        """Record that the client is still interested in the job"""
+        self.last_seen = time.monotonic()
+
+    @property
+    def abandoned(self) -> bool:
+        """Whether the client stopped sending heartbeats before the job finished"""
+        return (self.heartbeat_timeout is not None and not self.done
+                and time.monotonic() - self.last_seen > self.heartbeat_timeout)
+
+    @property
+    def done(self) -> bool:
+        """Whether the job reached a final state"""
+        return self.status in FINAL_STATES
+
+    def wait_for_update(self, version: int, timeout: Optional[float] = None) -> int:
+        """
+        Block until the job changes after a known version
+
+        Args:
+            version: Version the caller has already seen
+            timeout: Seconds to wait at most
+
+        Returns:
+            int: The current version (unchanged on timeout)
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version or self.done, timeout)
+            return self.version
+
+    def to_dict(self, include_text: bool = True) -> Dict[str, Any]:
+        """
+        Snapshot of the job for API responses
+
+        Args:
+            include_text: Include the section texts (otherwise only their lengths)
+
+        Returns:
+            Dict with the job's status, timing, task states, sections and errors
+        """
+        with self._condition:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "version": self.version,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "ended_at": self.ended_at,
+                "current_task": self.current_task,
+                "cancel_requested": self.cancel_event.is_set(),
+                "tasks": dict(self.tasks),
+                "sections": dict(self.sections) if include_text else {key: len(value) for key, value in self.sections.items()},
+                "files": sorted(os.path.basename(path) for path in self.files.values()),
+                "error": self.error,
+                "metrics": self.metrics["totals"] if self.metrics else None,
+            }
+
+class JobProgress(RunObserver):
+    """Mirrors the task events of a crew run into a Job"""
+
+    def __init__(self, job: Job):
+        """
+        Initialize the observer
+
+        Args:
+            job: Job receiving the task states and finished sections
+        """
+        self.job = job
+
+    def on_task_started(self, task_name: str):
+        self.job.set_task(task_name, "running")
+
+    def on_task_completed(self, task_name: str, output: Any):
+        section = TASK_SECTIONS.get(task_name)
+        if section:
+            self.job.set_section(section, task_output_text(output))
+        self.job.set_task(task_name, "completed")
+
+    def on_task_failed(self, task_name: str, error: str):
+        self.job.set_task(task_name, "failed")
+
+class JobQueue:
+    """Bounded queue of applications processed by a fixed set of worker threads
+
+    Each worker borrows an assistant from the shared pool for one job, so the
+    number of concurrent crew runs is the number of workers, and submissions
+    beyond max_pending waiting jobs are refused instead of piling up.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 100, output_dir: str = os.path.join("outputs", "service"),
+                 max_jobs: int = 1000, **assistant_kwargs):
+        """
+        Initialize the queue (call start() to launch the workers)
+
+        Args:
+            workers: Number of applications processed at once
+            max_pending: Maximum number of jobs waiting for a worker
+            output_dir: Directory the outputs of each job are saved under (one subdirectory per job)
+            max_jobs: Number of jobs kept for lookups; the oldest finished jobs are forgotten first
+            **assistant_kwargs: Keyword arguments for the pooled JobApplicationAssistants
+        """
+        self.workers = max(1, workers)
+        self.output_dir = output_dir
+        self.max_jobs = max_jobs
+        self.pool = get_pool(self.workers, **assistant_kwargs)
+        self._pending: "queue.Queue[Job]" = queue.Queue(maxsize=max_pending)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+
+    def start(self, warm_up: bool = True):
+        """
+        Launch the worker threads
+
+        Args:
+            warm_up: Pre-build one assistant and its crews per worker in the
+                background; the queue reports ready once they are built
+        """
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        threading.Thread(target=self._reap_abandoned, name="job-reaper", daemon=True).start()
+        if warm_up:
+            threading.Thread(target=self._warm_up, name="job-warm-up", daemon=True).start()
+        else:
+            self._ready.set()
+
+    def _warm_up(self):
+        """Build the pooled assistants, then mark the queue ready"""
+        start = time.perf_counter()
+        try:
+            self.pool.warm_up(self.workers)
+            logger.info(f"Warmed up {self.workers} assistants in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            logger.error(f"Error warming up assistants: {str(e)}")
+        self._ready.set()
+
+    def _reap_abandoned(self):
+        """Cancel the jobs whose clients stopped sending heartbeats"""
+        while not self._stop.wait(REAP_INTERVAL):
+            with self._lock:
+                abandoned = [job for job in self._jobs.values() if job.abandoned]
+            for job in abandoned:
+                logger.info(f"Cancelling abandoned job {job.id}")
+                job.cancel()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the workers after the jobs already running
+
+        Jobs still waiting for a worker are cancelled. Every worker exits once
+        its current job is done, however full the queue is.
+
+        Args:
+            timeout: Seconds to wait for each worker (None: until it exits)
+        """
+        self._stop.set()
+        while True:
+            try:
+                job = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            job.cancel()
+            self._pending.task_done()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    @property
+    def ready(self) -> bool:
+        """Whether the workers are up, warmed up and able to take a job"""
+        return self._ready.is_set() and not self._stop.is_set() and any(thread.is_alive() for thread in self._threads)
+
+    def submit(self, job_description: str, resume_text: str, use_cache: bool = True,
+               heartbeat_timeout: Optional[float] = None) -> Job:
+        """
+        Queue an application
+
+        Args:
+            job_description: The job description text
+            resume_text: The resume text
+            use_cache: Reuse a cached result when available
+            heartbeat_timeout: Cancel the job when the client stops calling
+                Job.touch() for this many seconds (None: never)
+
+        Returns:
+            The queued Job
+        """
+        if len(job_description.strip()) < 10:
+            raise ValueError("Job description is too short or empty.")
+        if len(resume_text.strip()) < 10:
+            raise ValueError("Resume is too short or empty.")
+
+        if self._stop.is_set():
+            raise QueueFull("The queue is shutting down")
+
+        job = Job(job_description, resume_text, use_cache, heartbeat_timeout)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_old_jobs()
+        try:
+            self._pending.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise QueueFull(f"{self._pending.maxsize} applications are already waiting")
+        return job
+
+    def _forget_old_jobs(self):
+        """Drop the oldest finished jobs over max_jobs; the caller holds the lock"""
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done][:max(0, excess)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, or None if it is unknown or was forgotten"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job (see Job.cancel)
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            bool: Whether the job was still queued or running
+        """
+        job = self.get(job_id)
+        return job is not None and job.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return queue statistics
+
+        Returns:
+            Dict with the number of jobs per status, waiting jobs, workers and pool usage
+        """
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {status: 0 for status in (QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED)}
+        for job in jobs:
+            counts[job.status] += 1
+        return {
+            "jobs": counts,
+            "pending": self._pending.qsize(),
+            "max_pending": self._pending.maxsize,
+            "workers": self.workers,
+            "ready": self.ready,
+            "pool": self.pool.stats(),
+        }
+
+    def _work(self):
+        """Worker loop: run queued jobs until stopped"""
+        while not self._stop.is_set():
+            try:
+                job = self._pending.get(timeout=STOP_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            try:
+                if self._stop.is_set():
+                    # Taken just as the queue stopped: cancel it like the other waiting jobs
+                    job.cancel()
+                # A job cancelled while it waited stays cancelled
+                elif job.start():
+                    self._run(job)
+            except Exception as e:
+                logger.error(f"Unexpected error in job worker: {str(e)}")
+            finally:
+                self._pending.task_done()
+
+    def _run(self, job: Job):
+        """Process one job on a pooled assistant and save its outputs"""
+        try:
+            with self.pool.acquire() as assistant:
+                tasks = assistant.get_crew().tasks
+                progress = JobProgress(job)
+                event_router.watch(tasks, progress)
+                try:
+                    results = assistant.process_application(
+                        job.job_description, job.resume_text, use_cache=job.use_cache, on_update=job.set_section,
+                        cancel_event=job.cancel_event,
+                    )
+                finally:
+                    event_router.unwatch(tasks, progress)
+                files = assistant.save_outputs(os.path.join(self.output_dir, job.id))
+                documents = assistant.processor.documents()
+                metrics = assistant.metrics
+            # Cached results finish without task events
+            tasks = {task_name: "completed" if results.get(section) else "failed"
+                     for task_name, section in TASK_SECTIONS.items()}
+            job.finish(COMPLETED, sections=dict(results), tasks=tasks, files=files, documents=documents,
+                       metrics=metrics)
+        except Exception as e:
+            if not job.cancel_event.is_set():
+                logger.error(f"Error processing job {job.id}: {str(e)}")
+            job.finish(FAILED, error=str(e))
+        if job.status == CANCELLED:
+            logger.info(f"Job {job.id} cancelled")
@@ -1,16 +1,28 @@
 """
 Main Job Application Assistant implementation
 """
-from crewai import Agent, Crew, Process, Task
+from crewai import Agent, Crew, LLM, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from dotenv import load_dotenv
 import os
+import asyncio
 import logging
-from typing import Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Iterable, Tuple, AsyncIterator
 
 # Import custom tools and utilities
 from .tools.custom_tool import web_search_tool
 from .utils.application_processor import ApplicationProcessor
+from .utils.sections import TASK_SECTIONS
+from .utils.result_cache import ResultCache, result_cache, normalize_text, hash_text
+from .utils.metrics import cached_run_record, metrics_exporter
+from .utils.compaction import input_compactor
+from .utils.job_analysis import JobAnalysis
+from .utils.joinable_task import JoinableTask, join_tasks
+from .utils.rate_limit import RunCancelled
+from .utils.rate_limited_llm import RateLimitedLLM
+from .utils.model_routing import ModelCascade, agent_config, model_tiers, llm_timeout, section_validator
 
 # Load environment variables
 load_dotenv()
@@ -31,18 +43,193 @@ class JobApplicationAssistant:
     
     # Config file path (only agents.yaml is needed now)
     agents_config = os.path.join(os.path.dirname(__file__), "config/agents.yaml")
+    # CrewBase replaces agents_config with the parsed YAML, so keep the path around
+    agents_config_path = agents_config
     
-    def __init__(self):
-        """Initialize the Job Application Assistant"""
+    # Tasks that still get the raw job description in structured-context mode
+    raw_job_description_tasks: Tuple[str, ...] = ()
+    
+    def __init__(self, parallel: bool = False, cache: Optional[ResultCache] = None, stream: bool = False,
+                 shared_analysis: bool = False, llm: Optional[Any] = None, structured_context: bool = False):
+        """
+        Initialize the Job Application Assistant
+        
+        Args:
+            parallel: Run the resume, cover letter and interview tasks concurrently
+                instead of one after another
+            cache: Result cache to use (defaults to the shared on-disk cache)
+            stream: Stream LLM tokens so sections can be shown while they are written
+            shared_analysis: Give the resume, cover letter and interview tasks a
+                precomputed job analysis through the {job_analysis} input
+            llm: LLM used by every agent instead of the models in agents.yaml
+                (e.g. a local stub for offline benchmarks)
+            structured_context: Have the analysis task emit a structured JobAnalysis
+                and give it to the other tasks as context instead of the raw job
+                description (see raw_job_description_tasks)
+        """
         self.processor = ApplicationProcessor()
         # Check if memory feature should be enabled
         self.use_memory = os.getenv("OPENAI_API_KEY") is not None
+        self.parallel = parallel
+        self.stream = stream
+        self.shared_analysis = shared_analysis
+        self.llm = llm
+        self.structured_context = structured_context
+        self.cache = cache if cache is not None else result_cache
+        self._config_hash = None
+        self._crews: Dict[str, Crew] = {}
+        # LLM of each model tier per agent, and the cascade guarding each task
+        self._tier_llms: Dict[str, List[LLM]] = {}
+        self._cascades: Dict[str, ModelCascade] = {}
+    
+    def _fan_out(self, last: bool = False, uses_analysis: bool = False) -> Dict[str, Any]:
+        """
+        Extra Task arguments for parallel and structured-context mode
+        
+        None of the tasks reads another task's output, so in parallel mode every task
+        gets an empty context and all but the last one run asynchronously. CrewAI
+        joins the pending async tasks before the last (synchronous) task starts, so a
+        run takes roughly two task latencies instead of four.
+        
+        In structured-context mode the tasks that use the analysis get the analysis
+        task, and only that task, as their context.
+        
+        Args:
+            last: Whether the task must stay synchronous (the final task of the crew)
+            uses_analysis: Whether the task builds on the job analysis
+            
+        Returns:
+            Dict of keyword arguments for Task
+        """
+        kwargs = {"async_execution": not last, "context": []} if self.parallel else {}
+        if uses_analysis and self.structured_context and not self.shared_analysis:
+            kwargs["context"] = [self.analyze_job_description()]
+        return kwargs
+    
+    def _job_prompt(self, task_name: str) -> str:
+        """
+        Prompt block carrying the job description for a downstream task
+        
+        Args:
+            task_name: Name of the task method
+            
+        Returns:
+            The raw job description block, or in structured-context mode a pointer
+            to the job analysis unless the task is in raw_job_description_tasks
+        """
+        if self.structured_context and task_name not in self.raw_job_description_tasks:
+            return """
+            Use the job analysis you are given in place of the job description.
+            """
+        return """
+            Job Description:
+            {job_description}
+            """
+    
+    def _analysis_prompt(self) -> str:
+        """Prompt block carrying a precomputed job analysis in shared-analysis mode"""
+        if not self.shared_analysis:
+            return ""
+        return """
+            Job Analysis (already prepared from the job description):
+            {job_analysis}
+            """
+    
+    def _tier_llms_for(self, agent_name: str) -> List[LLM]:
+        """
+        Build the LLM of each model tier of an agent
+        
+        Args:
+            agent_name: Agent key in agents.yaml
+            
+        Returns:
+            List of rate-limited LLM instances in escalation order
+        """
+        if agent_name not in self._tier_llms:
+            config = self.agents_config[agent_name]
+            timeout = llm_timeout(config)
+            self._tier_llms[agent_name] = [
+                RateLimitedLLM(model=model, stream=self.stream, timeout=timeout) for model in model_tiers(config)
+            ]
+        return self._tier_llms[agent_name]
+    
+    def _agent_llm(self, agent_name: str) -> Optional[LLM]:
+        """
+        Return the LLM an agent starts a run with
+        
+        Args:
+            agent_name: Agent key in agents.yaml
+            
+        Returns:
+            The overriding LLM, else the rate-limited LLM of the agent's first model
+            tier, or None to let the agent use the model from its config
+        """
+        if self.llm is not None:
+            return self.llm
+        llms = self._tier_llms_for(agent_name)
+        return llms[0] if llms else None
+    
+    def _model_cascade(self, task_name: str, agent_instance: Agent, agent_name: str) -> Dict[str, Any]:
+        """
+        Extra Task arguments escalating an agent through its model tiers
+        
+        Args:
+            task_name: Name of the task method
+            agent_instance: Agent executing the task
+            agent_name: Agent key in agents.yaml
+            
+        Returns:
+            Dict with a ModelCascade check as guardrail when the agent has several tiers,
+            else an empty dict
+        """
+        llms = [] if self.llm is not None else self._tier_llms_for(agent_name)
+        if len(llms) < 2:
+            return {}
+        cascade = ModelCascade(task_name, agent_instance, llms, section_validator(TASK_SECTIONS[task_name]))
+        self._cascades[task_name] = cascade
+        return {"guardrail": cascade.check, "guardrail_max_retries": cascade.max_retries}
+    
+    def _reset_model_tiers(self):
+        """Start every task of the next run on its first model tier"""
+        for cascade in self._cascades.values():
+            cascade.reset()
+        # CrewAI never resets a task's guardrail retry count, and fails the task once
+        # it reaches guardrail_max_retries, so cached crews would stop escalating
+        for crew_instance in self._crews.values():
+            for task_instance in crew_instance.tasks:
+                task_instance.retry_count = 0
+    
+    def _begin_run(self, cancel_event: Optional[threading.Event] = None):
+        """Put the crews on their first model tiers and attach the run's cancel event"""
+        self._reset_model_tiers()
+        self._set_cancel_event(cancel_event)
+    
+    def _end_run(self, crew_instance: Crew):
+        """
+        Wait for the tasks a run left running, then detach its cancel event
+        
+        A run that fails in its final task returns while its async tasks may
+        still be running. Keeping the event set until they finish makes a
+        cancelled run's tasks stop at their next LLM call instead of carrying
+        on after the assistant went back to the pool.
+        """
+        join_tasks(crew_instance.tasks)
+        self._set_cancel_event(None)
+    
+    def _set_cancel_event(self, cancel_event: Optional[threading.Event]):
+        """Make the agents' LLM calls abort with RunCancelled once the event is set"""
+        for llms in self._tier_llms.values():
+            for llm in llms:
+                llm.cancel_event = cancel_event
+        if isinstance(self.llm, RateLimitedLLM):
+            self.llm.cancel_event = cancel_event
     
     @agent
     def job_analyzer(self) -> Agent: 
         """Create the Job Description Analyst agent"""
         return Agent(
-            config=self.agents_config['job_analyzer_agent'],
+            config=agent_config(self.agents_config['job_analyzer_agent']),
+            llm=self._agent_llm('job_analyzer_agent'),
             tools=[web_search_tool],
             verbose=True,
         )
@@ -51,7 +238,8 @@ class JobApplicationAssistant:
     def resume_tailor(self) -> Agent:
         """Create the Resume Optimization Specialist agent"""
         return Agent(
-            config=self.agents_config['resume_tailor_agent'],
+            config=agent_config(self.agents_config['resume_tailor_agent']),
+            llm=self._agent_llm('resume_tailor_agent'),
             tools=[web_search_tool],
             verbose=True,
         )
@@ -60,7 +248,8 @@ class JobApplicationAssistant:
     def cover_letter_writer(self) -> Agent:
         """Create the Cover Letter Writer agent"""
         return Agent(
-            config=self.agents_config['cover_letter_agent'],
+            config=agent_config(self.agents_config['cover_letter_agent']),
+            llm=self._agent_llm('cover_letter_agent'),
             tools=[web_search_tool],
             verbose=True,
         )
@@ -69,7 +258,8 @@ class JobApplicationAssistant:
     def interview_coach(self) -> Agent:
         """Create the Interview Coach agent"""
         return Agent(
-            config=self.agents_config['interview_prep_agent'],
+            config=agent_config(self.agents_config['interview_prep_agent']),
+            llm=self._agent_llm('interview_prep_agent'),
             tools=[web_search_tool],
             verbose=True,
         )
@@ -77,7 +267,32 @@ class JobApplicationAssistant:
     @task
     def analyze_job_description(self) -> Task:
         """Create task for analyzing job description"""
-        return Task(
+        if self.structured_context:
+            return JoinableTask(
+                description="""
+            # Job Analysis
+            
+            Analyze the provided job description and extract:
+            1. Job title and company
+            2. Key technical skills required
+            3. Main responsibilities of the role
+            4. Experience level required
+            5. Nice-to-have qualifications, keywords for ATS optimization and notes on the company's culture or mission
+            
+            Keep every item short. The other specialists receive your analysis instead of the job description,
+            so include everything they need to tailor the resume, write the cover letter and prepare for interviews.
+            
+            Job Description:
+            {job_description}
+            """,
+                expected_output="A compact structured analysis of the job description.",
+                agent=self.job_analyzer(),
+                output_pydantic=JobAnalysis,
+                # The downstream tasks read this output, so it never runs asynchronously
+                **self._fan_out(last=True),
+                **self._model_cascade('analyze_job_description', self.job_analyzer(), 'job_analyzer_agent'),
+            )
+        return JoinableTask(
             description="""
             # Job Analysis
             
@@ -94,12 +309,14 @@ class JobApplicationAssistant:
             """,
             expected_output="A simple analysis of the job description with key requirements.",
             agent=self.job_analyzer(),
+            **self._fan_out(),
+            **self._model_cascade('analyze_job_description', self.job_analyzer(), 'job_analyzer_agent'),
         )
     
     @task
     def tailor_resume(self) -> Task:
         """Create task for tailoring resume"""
-        return Task(
+        return JoinableTask(
             description="""
             # Resume Suggestions
             
@@ -111,20 +328,20 @@ class JobApplicationAssistant:
             Keep your suggestions simple and actionable.
             Always start your output with the header "# Resume Suggestions" to clearly mark this section.
             
-            Job Description:
-            {job_description}
-            
+            """ + self._job_prompt('tailor_resume') + """
             Resume:
             {resume}
-            """,
+            """ + self._analysis_prompt(),
             expected_output="Simple suggestions for tailoring the resume to better match the job requirements.",
             agent=self.resume_tailor(),
+            **self._fan_out(uses_analysis=True),
+            **self._model_cascade('tailor_resume', self.resume_tailor(), 'resume_tailor_agent'),
         )
     
     @task
     def write_cover_letter(self) -> Task:
         """Create task for writing cover letter"""
-        return Task(
+        return JoinableTask(
             description="""
             # Cover Letter
             
@@ -139,20 +356,20 @@ class JobApplicationAssistant:
             DO NOT include interview questions or preparation materials in this output.
             Always start your output with the header "# Cover Letter" to clearly mark the section.
             
-            Job Description:
-            {job_description}
-            
+            """ + self._job_prompt('write_cover_letter') + """
             Resume:
             {resume}
-            """,
+            """ + self._analysis_prompt(),
             expected_output="A simple, personalized cover letter ready to be submitted with the application.",
             agent=self.cover_letter_writer(),
+            **self._fan_out(uses_analysis=True),
+            **self._model_cascade('write_cover_letter', self.cover_letter_writer(), 'cover_letter_agent'),
         )
     
     @task
     def prepare_interview(self) -> Task:
         """Create task for interview preparation"""
-        return Task(
+        return JoinableTask(
             description="""
             # Interview Preparation
             
@@ -164,19 +381,24 @@ class JobApplicationAssistant:
             KEEP IT SIMPLE. Focus only on interview preparation content.
             Always start your output with the header "# Interview Preparation" to clearly mark this section.
             
-            Job Description:
-            {job_description}
-            
+            """ + self._job_prompt('prepare_interview') + """
             Resume:
             {resume}
-            """,
+            """ + self._analysis_prompt(),
             expected_output="A simple interview preparation guide with questions, suggested answers, and talking points.",
             agent=self.interview_coach(),
+            **self._fan_out(last=True, uses_analysis=True),
+            **self._model_cascade('prepare_interview', self.interview_coach(), 'interview_prep_agent'),
         )
     
     @crew
     def crew(self) -> Crew:
-        """Create the crew with all agents and tasks"""
+        """
+        Create the crew with all agents and tasks
+        
+        In parallel mode the process stays sequential; the fan-out comes from
+        the async tasks (see _fan_out).
+        """
         return Crew(
             agents=self.agents,
             tasks=self.tasks,
@@ -185,31 +407,370 @@ class JobApplicationAssistant:
             verbose=True,
         )
     
-    def process_application(self, job_description: str, resume_text: str) -> Dict[str, Any]:
+    def get_crew(self, name: str = "crew") -> Crew:
+        """
+        Return a crew built by this assistant, building it on first use
+        
+        Crews are kept between runs so agents, tasks and LLM clients are only
+        constructed once per assistant.
+        
+        Args:
+            name: Crew factory method ("crew", "analysis_crew" or "downstream_crew")
+            
+        Returns:
+            The cached Crew instance
+        """
+        if name not in self._crews:
+            self._crews[name] = getattr(self, name)()
+        return self._crews[name]
+    
+    def warm_up(self):
+        """Build the main crew and the cache key configuration ahead of the first run"""
+        self.get_crew("downstream_crew" if self.shared_analysis else "crew")
+        self.config_hash()
+    
+    def reset(self):
+        """Clear the state of the previous run so the assistant can be reused"""
+        self.processor.outputs = {}
+        self.processor.metrics = None
+        self._reset_model_tiers()
+        for crew_instance in self._crews.values():
+            for agent_instance in crew_instance.agents:
+                if hasattr(agent_instance, 'tools_results'):
+                    agent_instance.tools_results = []
+    
+    def analysis_crew(self) -> Crew:
+        """Create a crew that only runs the job description analysis"""
+        return Crew(
+            agents=[self.job_analyzer()],
+            tasks=[self.analyze_job_description()],
+            process=Process.sequential,
+            memory=self.use_memory,
+            verbose=True,
+        )
+    
+    def downstream_crew(self) -> Crew:
+        """Create a crew with the resume, cover letter and interview tasks only"""
+        tasks = [self.tailor_resume(), self.write_cover_letter(), self.prepare_interview()]
+        return Crew(
+            agents=[task.agent for task in tasks],
+            tasks=tasks,
+            process=Process.sequential,
+            memory=self.use_memory,
+            verbose=True,
+        )
+    
+    def config_hash(self) -> str:
+        """
+        Hash of the agent configuration and task prompts
+        
+        Any change to agents.yaml, to a task prompt or to the input compaction
+        settings changes this hash, which invalidates previously cached results.
+        
+        Returns:
+            str: Hex digest identifying the current configuration
+        """
+        if self._config_hash is None:
+            with open(self.agents_config_path, 'r', encoding='utf-8') as f:
+                parts = [f.read()]
+            for task_name in TASK_SECTIONS:
+                # Task methods are memoized by CrewBase, so the crew reuses these objects
+                task = getattr(self, task_name)()
+                # Task descriptions are overwritten with the interpolated text after a run
+                description = getattr(task, '_original_description', None) or task.description
+                expected_output = getattr(task, '_original_expected_output', None) or task.expected_output
+                parts.extend([description, expected_output])
+            # Compaction settings change what the agents see
+            parts.append(input_compactor.signature())
+            if self.llm is not None:
+                # Results of an overriding LLM must never be served for the configured models
+                parts.append(str(getattr(self.llm, 'model', type(self.llm).__name__)))
+            self._config_hash = hash_text("\x00".join(parts))
+        return self._config_hash
+    
+    def cache_key(self, job_description: str, resume_text: str) -> str:
+        """
+        Build the result cache key for a job description and resume pair
+        
+        Args:
+            job_description: The job description text
+            resume_text: The resume text
+            
+        Returns:
+            str: Cache key
+        """
+        return ":".join([
+            hash_text(normalize_text(job_description)),
+            hash_text(normalize_text(resume_text)),
+            self.config_hash(),
+        ])
+    
+    def process_application(self, job_description: str, resume_text: str, use_cache: bool = True,
+                            on_update: Optional[Callable[[str, str], None]] = None,
+                            cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
         """
         Process a job application using the crew
         
         Args:
             job_description: The job description text
             resume_text: The resume text
+            use_cache: Return a cached result when available (set False to force a fresh run)
+            on_update: Optional callback receiving (section key, text so far) as
+                sections are produced; token-level when the assistant streams
+            cancel_event: Event that aborts the run when set; the next LLM call
+                raises RunCancelled instead of reaching the provider
             
         Returns:
             Dict containing all outputs from the crew
         """
-        crew_instance = self.crew()
-        return self.processor.process_application(crew_instance, job_description, resume_text)
+        # A run cancelled before it starts must not return a cached result either
+        if cancel_event is not None and cancel_event.is_set():
+            raise RunCancelled("The run was cancelled")
+        key = self._cache_key_for(job_description, resume_text, use_cache)
+        cached = self._cached_result(key)
+        if cached is not None:
+            if on_update:
+                for section, content in cached.items():
+                    on_update(section, content)
+            return cached
+        
+        crew_instance = self.get_crew()
+        self._begin_run(cancel_event)
+        try:
+            results = self.processor.process_application(crew_instance, job_description, resume_text, on_update)
+        finally:
+            self._end_run(crew_instance)
+        
+        self._store_result(key, results)
+        return results
     
-    def save_outputs(self, output_dir: str = "outputs") -> Dict[str, str]:
+    async def process_application_async(self, job_description: str, resume_text: str, use_cache: bool = True,
+                                        on_update: Optional[Callable[[str, str], None]] = None,
+                                        cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Process a job application using CrewAI's async kickoff
+        
+        Cancelling the coroutine also cancels the crew, which keeps running in
+        its own thread otherwise; the coroutine returns once the crew stopped,
+        so the assistant can be reused right away.
+        
+        Args:
+            job_description: The job description text
+            resume_text: The resume text
+            use_cache: Return a cached result when available (set False to force a fresh run)
+            on_update: Optional section update callback (see process_application)
+            cancel_event: Event that aborts the run when set (see process_application)
+            
+        Returns:
+            Dict containing all outputs from the crew
+        """
+        # A run cancelled before it starts must not return a cached result either
+        if cancel_event is not None and cancel_event.is_set():
+            raise RunCancelled("The run was cancelled")
+        key = self._cache_key_for(job_description, resume_text, use_cache)
+        cached = self._cached_result(key)
+        if cached is not None:
+            if on_update:
+                for section, content in cached.items():
+                    on_update(section, content)
+            return cached
+        
+        crew_instance = self.get_crew()
+        cancel_event = cancel_event or threading.Event()
+        self._begin_run(cancel_event)
+        run = asyncio.ensure_future(
+            self.processor.process_application_async(crew_instance, job_description, resume_text, on_update)
+        )
+        try:
+            results = await asyncio.shield(run)
+        except asyncio.CancelledError:
+            cancel_event.set()
+            await asyncio.gather(run, return_exceptions=True)
+            raise
+        finally:
+            await asyncio.to_thread(self._end_run, crew_instance)
+        
+        self._store_result(key, results)
+        return results
+    
+    def _cache_key_for(self, job_description: str, resume_text: str, use_cache: bool) -> Optional[str]:
+        """Return the cache key for a run, or None when the cache is bypassed"""
+        return self.cache_key(job_description, resume_text) if use_cache else None
+    
+    def _cached_result(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the cached outputs for a key and make them the current outputs"""
+        if key is None:
+            return None
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info("Returning cached application result")
+            self.processor.outputs = cached
+            self.processor.metrics = cached_run_record()
+            metrics_exporter.export(self.processor.metrics)
+        return cached
+    
+    def _store_result(self, key: Optional[str], results: Dict[str, Any]):
+        """Cache the outputs of a run"""
+        # Only cache complete results so a partial run is retried next time
+        if key is not None and all(results.values()):
+            self.cache.put(key, results)
+    
+    def process_resumes(self, job_description: str, resumes: List[str], max_workers: int = 4,
+                        use_cache: bool = True) -> List[Any]:
+        """
+        Process one job description against many resumes
+        
+        The job description is analyzed once; the analysis is then passed to
+        parallel runs of the resume, cover letter and interview tasks, one per
+        resume. That is 3N+1 LLM tasks instead of 4N.
+        
+        Args:
+            job_description: The job description text
+            resumes: Resume texts
+            max_workers: Maximum number of resumes processed at once
+            use_cache: Reuse and store cached results per resume
+            
+        Returns:
+            List with the outputs dict, or the raised exception, for each resume
+        """
+        from .assistant_pool import get_pool
+        
+        analysis_crew = self.get_crew("analysis_crew")
+        self._reset_model_tiers()
+        job_analysis = self.processor.analyze_job(analysis_crew, job_description)
+        self.processor.outputs = {"job_analysis": job_analysis}
+        
+        # Each run needs its own crew and processor state, so borrow pooled assistants
+        pool = get_pool(
+            max_workers, parallel=self.parallel, cache=self.cache, stream=self.stream, shared_analysis=True,
+            structured_context=self.structured_context,
+        )
+        
+        def process_resume(resume_text: str) -> Dict[str, Any]:
+            with pool.acquire() as assistant:
+                key = assistant._cache_key_for(job_description, resume_text, use_cache)
+                cached = assistant._cached_result(key)
+                if cached is not None:
+                    return cached
+                
+                downstream_crew = assistant.get_crew("downstream_crew")
+                try:
+                    results = assistant.processor.process_application(
+                        downstream_crew, job_description, resume_text,
+                        extra_inputs={"job_analysis": job_analysis}
+                    )
+                finally:
+                    assistant._end_run(downstream_crew)
+                results["job_analysis"] = job_analysis
+                assistant._store_result(key, results)
+                return results
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [executor.submit(process_resume, resume_text) for resume_text in resumes]
+            for index, future in enumerate(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error processing resume {index}: {str(e)}")
+                    results.append(e)
+        return results
+    
+    @property
+    def metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Metrics record of the last run
+        
+        Returns:
+            Dict with per-task agent, model, timing, token, tool call, retry and
+            cost figures plus run totals, or None before the first run
+        """
+        return self.processor.metrics
+    
+    def save_outputs(self, output_dir: str = "outputs", bundle: Optional[str] = None) -> Dict[str, str]:
         """
         Save all outputs to files
         
         Args:
             output_dir: Directory to save outputs
+            bundle: Save a single "zip" or "json" bundle instead of one file per section
             
         Returns:
             Dict with paths to saved files
         """
-        return self.processor.save_outputs(output_dir)
+        return self.processor.save_outputs(output_dir, bundle)
+
+async def process_applications_as_completed(
+    applications: Iterable[Tuple[str, str]],
+    max_concurrency: int = 20,
+    **assistant_kwargs,
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Process many applications on one event loop and yield results as they complete
+    
+    Each application borrows an assistant from the shared pool for its
+    configuration, so agents, tasks and crews are built once per pooled
+    assistant rather than once per application.
+    
+    Args:
+        applications: (job description, resume text) pairs
+        max_concurrency: Maximum number of applications in flight at once
+        **assistant_kwargs: Keyword arguments for JobApplicationAssistant
+        
+    Yields:
+        (index, outputs, error) tuples in completion order; exactly one of
+        outputs and error is set
+    """
+    from .assistant_pool import get_pool
+    
+    pool = get_pool(max_concurrency, **assistant_kwargs)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run_one(index: int, job_description: str, resume_text: str):
+        async with semaphore:
+            try:
+                async with pool.acquire_async() as assistant:
+                    outputs = await assistant.process_application_async(job_description, resume_text)
+                return index, outputs, None
+            except Exception as e:
+                logger.error(f"Error processing application {index}: {str(e)}")
+                return index, None, e
+    
+    pending = [
+        asyncio.ensure_future(run_one(index, job_description, resume_text))
+        for index, (job_description, resume_text) in enumerate(applications)
+    ]
+    try:
+        for next_done in asyncio.as_completed(pending):
+            yield await next_done
+    finally:
+        # Stop outstanding work if the consumer stops iterating early
+        for future in pending:
+            future.cancel()
+
+async def process_applications(
+    applications: Iterable[Tuple[str, str]],
+    max_concurrency: int = 20,
+    **assistant_kwargs,
+) -> List[Any]:
+    """
+    Process many applications concurrently and return results in input order
+    
+    Args:
+        applications: (job description, resume text) pairs
+        max_concurrency: Maximum number of applications in flight at once
+        **assistant_kwargs: Keyword arguments for JobApplicationAssistant
+        
+    Returns:
+        List with the outputs dict, or the raised exception, for each application
+    """
+    applications = list(applications)
+    results = [None] * len(applications)
+    async for index, outputs, error in process_applications_as_completed(
+        applications, max_concurrency, **assistant_kwargs
+    ):
+        results[index] = outputs if error is None else error
+    return results
 
 def main():  
     # Create and run the job application assistant
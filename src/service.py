@@ -0,0 +1,261 @@
+"""
+HTTP service in front of the Job Application Assistant
+
+A small stdlib HTTP server: applications are submitted to a JobQueue and
+processed by background workers, and clients poll or subscribe (Server-Sent
+Events) for per-section results, then fetch the saved outputs.
+
+Endpoints:
+    POST   /applications                       submit {"job_description", "resume", "use_cache"}
+    GET    /applications/<id>                  job status, task states and sections
+    GET    /applications/<id>/events           Server-Sent Events stream of job updates
+    GET    /applications/<id>/outputs          saved output files ("?format=zip" or "json" for a bundle)
+    GET    /applications/<id>/outputs/<file>   one saved output file
+    DELETE /applications/<id>                  cancel a queued or running job
+    GET    /healthz                            liveness
+    GET    /readyz                             readiness (workers up and warmed up)
+    GET    /metrics                            Prometheus metrics
+"""
+import os
+import json
+import logging
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from .job_queue import FINAL_STATES, JobQueue, QueueFull
+from .utils.document_generator import DocumentGenerator, BUNDLE_FORMATS
+from .utils.metrics import PrometheusMetricsSink, metrics_exporter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Largest accepted request body
+MAX_BODY_BYTES = int(os.getenv("SERVICE_MAX_BODY_BYTES", str(2 * 1024 * 1024)))
+
+# Seconds between keep-alive comments on an idle event stream
+EVENT_HEARTBEAT = 15.0
+
+BUNDLE_TYPES = {"zip": "application/zip", "json": "application/json"}
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """Request handler; the JobQueue is available as self.server.job_queue"""
+
+    server_version = "JobApplicationAssistant/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def job_queue(self) -> JobQueue:
+        return self.server.job_queue
+
+    def log_message(self, format: str, *args):
+        logger.info(f"{self.address_string()} {format % args}")
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        """Send a complete response"""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        """Send a JSON response"""
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    def _send_error(self, status: int, message: str):
+        """Send a JSON error response"""
+        self._send_json(status, {"error": message})
+
+    def _route(self) -> Tuple[list, Dict[str, list]]:
+        """Split the request path into segments and parse the query string"""
+        url = urlparse(self.path)
+        return [part for part in url.path.split("/") if part], parse_qs(url.query)
+
+    def do_GET(self):
+        parts, query = self._route()
+        if parts == ["healthz"]:
+            return self._send_json(HTTPStatus.OK, {"status": "ok"})
+        if parts == ["readyz"]:
+            stats = self.job_queue.stats()
+            status = HTTPStatus.OK if stats["ready"] else HTTPStatus.SERVICE_UNAVAILABLE
+            return self._send_json(status, stats)
+        if parts == ["metrics"]:
+            return self._send(HTTPStatus.OK, self._metrics_text().encode("utf-8"), "text/plain; version=0.0.4")
+        if len(parts) >= 2 and parts[0] == "applications":
+            job = self.job_queue.get(parts[1])
+            if job is None:
+                return self._send_error(HTTPStatus.NOT_FOUND, "Unknown application id")
+            if len(parts) == 2:
+                return self._send_json(HTTPStatus.OK, job.to_dict())
+            if parts[2:] == ["events"]:
+                return self._stream_events(job)
+            if parts[2] == "outputs" and len(parts) <= 4:
+                return self._send_outputs(job, parts[3] if len(parts) == 4 else None, query)
+        self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+
+    def do_POST(self):
+        parts, _ = self._route()
+        if parts != ["applications"]:
+            return self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The end of the body is unknown, so the connection cannot be reused
+            self.close_connection = True
+            return self._send_error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            # The unread body would be parsed as the next request
+            self.close_connection = True
+            return self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body is too large")
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            job_description = payload["job_description"]
+            resume_text = payload["resume"]
+        except (ValueError, KeyError, TypeError):
+            return self._send_error(HTTPStatus.BAD_REQUEST, 'Expected a JSON object with "job_description" and "resume"')
+        if not all(isinstance(text, str) and text.strip() for text in (job_description, resume_text)):
+            return self._send_error(HTTPStatus.BAD_REQUEST, '"job_description" and "resume" must be non-empty strings')
+        use_cache = payload.get("use_cache", True)
+        if not isinstance(use_cache, bool):
+            # bool("false") is True, so anything but a JSON boolean is refused
+            return self._send_error(HTTPStatus.BAD_REQUEST, '"use_cache" must be true or false')
+
+        try:
+            job = self.job_queue.submit(job_description, resume_text, use_cache=use_cache)
+        except ValueError as e:
+            return self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+        except QueueFull as e:
+            return self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)}, {"Retry-After": "30"})
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict(include_text=False), {"Location": f"/applications/{job.id}"})
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+        if len(parts) != 2 or parts[0] != "applications":
+            return self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+        job = self.job_queue.get(parts[1])
+        if job is None:
+            return self._send_error(HTTPStatus.NOT_FOUND, "Unknown application id")
+        if not self.job_queue.cancel(job.id):
+            return self._send_error(HTTPStatus.CONFLICT, f"Application is already {job.status}")
+        self._send_json(HTTPStatus.OK, job.to_dict(include_text=False))
+
+    def _stream_events(self, job):
+        """Send job snapshots as Server-Sent Events until the job finishes"""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        version = -1
+        try:
+            while True:
+                current = job.wait_for_update(version, timeout=EVENT_HEARTBEAT)
+                if current == version:
+                    if job.done:
+                        # The final snapshot has been sent
+                        return
+                    self.wfile.write(b": keep-alive\n\n")
+                else:
+                    snapshot = job.to_dict()
+                    version = snapshot["version"]
+                    event = "done" if snapshot["status"] in FINAL_STATES else "update"
+                    self.wfile.write(f"id: {version}\nevent: {event}\ndata: {json.dumps(snapshot)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.info(f"Event stream of application {job.id} closed by the client")
+
+    def _send_outputs(self, job, filename: Optional[str], query: Dict[str, list]):
+        """Send the list of saved outputs, one output file, or a bundle of all of them"""
+        if not job.files:
+            return self._send_error(HTTPStatus.CONFLICT, f"Application is {job.status}; no outputs saved yet")
+        files = {os.path.basename(path): path for path in job.files.values()}
+
+        if filename is not None:
+            # Only names of files saved for this job are served, never arbitrary paths
+            path = files.get(filename)
+            if path is None or not os.path.exists(path):
+                return self._send_error(HTTPStatus.NOT_FOUND, "Unknown output file")
+            with open(path, "rb") as f:
+                return self._send(HTTPStatus.OK, f.read(), "text/markdown; charset=utf-8")
+
+        bundle_format = (query.get("format") or [None])[0]
+        if bundle_format is None:
+            return self._send_json(HTTPStatus.OK, {"files": sorted(files)})
+        if bundle_format not in BUNDLE_FORMATS:
+            return self._send_error(HTTPStatus.BAD_REQUEST, f"format must be one of {', '.join(BUNDLE_FORMATS)}")
+        documents = {}
+        for name, path in files.items():
+            with open(path, "r", encoding="utf-8") as f:
+                documents[name] = f.read()
+        self._send(HTTPStatus.OK, DocumentGenerator.bundle_bytes(documents, bundle_format), BUNDLE_TYPES[bundle_format],
+                   {"Content-Disposition": f'attachment; filename="application_{job.id}.{bundle_format}"'})
+
+    def _metrics_text(self) -> str:
+        """Run counters from the Prometheus sink plus the current queue gauges"""
+        sink = metrics_exporter.sink(PrometheusMetricsSink)
+        text = sink.render() if sink else ""
+        stats = self.job_queue.stats()
+        lines = [
+            "# HELP job_assistant_queue_jobs Jobs known to the service by status",
+            "# TYPE job_assistant_queue_jobs gauge",
+        ]
+        lines.extend(f'job_assistant_queue_jobs{{status="{status}"}} {count}' for status, count in stats["jobs"].items())
+        lines.extend([
+            "# HELP job_assistant_queue_pending Jobs waiting for a worker",
+            "# TYPE job_assistant_queue_pending gauge",
+            f"job_assistant_queue_pending {stats['pending']}",
+            "# HELP job_assistant_ready Whether the service is ready to take applications",
+            "# TYPE job_assistant_ready gauge",
+            f"job_assistant_ready {int(stats['ready'])}",
+        ])
+        return text + "\n".join(lines) + "\n"
+
+class ServiceServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the service's JobQueue"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], job_queue: JobQueue):
+        """
+        Initialize the server
+
+        Args:
+            address: (host, port) to listen on
+            job_queue: Queue the applications are submitted to
+        """
+        super().__init__(address, ServiceHandler)
+        self.job_queue = job_queue
+
+def serve(host: str = "127.0.0.1", port: int = 8000, workers: int = 2, max_pending: int = 100,
+          output_dir: str = os.path.join("outputs", "service"), **assistant_kwargs):
+    """
+    Run the HTTP service until interrupted
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on
+        workers: Number of applications processed at once
+        max_pending: Maximum number of applications waiting for a worker
+        output_dir: Directory the outputs of each application are saved under
+        **assistant_kwargs: Keyword arguments for the pooled JobApplicationAssistants
+    """
+    job_queue = JobQueue(workers=workers, max_pending=max_pending, output_dir=output_dir, **assistant_kwargs)
+    job_queue.start()
+    server = ServiceServer((host, port), job_queue)
+    logger.info(f"Serving on http://{host}:{server.server_address[1]} with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server.server_close()
+        job_queue.stop(timeout=5)
@@ -1,6 +1,7 @@
 """
 Custom tools for Job Application Assistant agents
 """
-from .custom_tool import web_search_tool
+from .custom_tool import web_search_tool, search_cache
+from .search_cache import SearchBackend, LocalSearchBackend
 
-__all__ = ['web_search_tool']
\ No newline at end of file
+__all__ = ['web_search_tool', 'search_cache', 'SearchBackend', 'LocalSearchBackend']
\ No newline at end of file
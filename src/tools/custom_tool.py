@@ -4,14 +4,19 @@ Tools for the Job Application Assistant agents
 import os
 from typing import Dict, Any, List
 from dotenv import load_dotenv
-from crewai_tools import SerperDevTool
 from crewai.tools import BaseTool
+from .search_cache import SearchCache, backend_from_env
 
 # Load environment variables
 load_dotenv()
 
-# Create an instance of SerperDevTool directly
-serper_tool = SerperDevTool()
+# Search results are cached and shared by every agent and application in the process.
+# The Serper client is only created on the first search that misses the cache.
+search_cache = SearchCache(
+    backend_from_env(),
+    ttl=float(os.getenv("SEARCH_CACHE_TTL", "3600")),
+    max_entries=int(os.getenv("SEARCH_CACHE_SIZE", "1000")),
+)
 
 class WebSearchTool(BaseTool):
     """Tool for web search using SerperDev through CrewAI Tools"""
@@ -30,8 +35,8 @@ class WebSearchTool(BaseTool):
             str: Search results formatted as text
         """
         try:
-            # Use the SerperDevTool to perform the search
-            results = serper_tool.search(query)
+            # Use the shared cache, which calls the search backend on a miss
+            results = search_cache.search(query)
             return results
         except Exception as e:
             return f"Error performing web search: {str(e)}"
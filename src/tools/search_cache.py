@@ -0,0 +1,250 @@
+"""
+Search backends and a shared result cache for the web search tool
+"""
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, Optional
+from ..utils.rate_limit import RateLimiter, RetryPolicy, bucket_key, call_with_retry
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query so trivially different spellings share a cache entry
+
+    Args:
+        query: Raw query from an agent
+
+    Returns:
+        str: Lowercased query with collapsed whitespace and no surrounding quotes
+    """
+    return " ".join(query.casefold().split()).strip("\"' ")
+
+class SearchBackend:
+    """Interface for the services that answer web search queries"""
+
+    def search(self, query: str) -> Any:
+        """
+        Run a search query
+
+        Args:
+            query: The search query
+
+        Returns:
+            Search results
+        """
+        raise NotImplementedError
+
+class SerperSearchBackend(SearchBackend):
+    """Search backend using SerperDev through CrewAI Tools
+
+    crewai_tools is slow to import, so the SerperDevTool client is created on
+    the first search rather than when the backend is built.
+    """
+
+    def __init__(self, serper_tool=None):
+        """
+        Initialize the backend
+
+        Args:
+            serper_tool: SerperDevTool instance (created on first use if omitted)
+        """
+        self._serper_tool = serper_tool
+        self._lock = threading.Lock()
+
+    @property
+    def serper_tool(self):
+        """The SerperDevTool client, created on first access"""
+        if self._serper_tool is None:
+            with self._lock:
+                if self._serper_tool is None:
+                    from crewai_tools import SerperDevTool
+                    self._serper_tool = SerperDevTool()
+        return self._serper_tool
+
+    def search(self, query: str) -> Any:
+        return self.serper_tool.search(query)
+
+class RateLimitedSearchBackend(SearchBackend):
+    """Backend wrapper drawing every query from the shared rate limiter
+
+    Queries wait for the provider's token bucket, which is shared by every
+    thread and process, and rate-limited or transient failures are retried
+    with jittered backoff.
+    """
+
+    def __init__(self, backend: SearchBackend, provider: str = "serper", limiter: Optional[RateLimiter] = None,
+                 policy: Optional[RetryPolicy] = None):
+        """
+        Initialize the wrapper
+
+        Args:
+            backend: Backend answering the queries
+            provider: Provider name selecting the rate limit and API key
+            limiter: Limiter to draw from (defaults to the shared one)
+            policy: Retry policy (defaults to the shared one)
+        """
+        self.backend = backend
+        self.provider = provider
+        self.limiter = limiter
+        self.policy = policy
+
+    def search(self, query: str) -> Any:
+        return call_with_retry(
+            lambda: self.backend.search(query), bucket_key(self.provider),
+            limiter=self.limiter, policy=self.policy, description=f"{self.provider} search",
+        )
+
+class LocalSearchBackend(SearchBackend):
+    """Offline search backend answering from a fixed set of results
+
+    Useful for tests and offline runs. Results are looked up by normalized
+    query; unknown queries get a fixed "no results" answer.
+    """
+
+    def __init__(self, results: Optional[Dict[str, Any]] = None, path: Optional[str] = None):
+        """
+        Initialize the backend
+
+        Args:
+            results: Mapping of query to results
+            path: JSON file holding such a mapping
+        """
+        results = dict(results or {})
+        if path:
+            with open(path, 'r', encoding='utf-8') as f:
+                results.update(json.load(f))
+        self.results = {normalize_query(query): value for query, value in results.items()}
+
+    def search(self, query: str) -> Any:
+        return self.results.get(normalize_query(query), f"No results found for: {query}")
+
+class SearchCache:
+    """Thread-safe TTL/LRU cache in front of a search backend
+
+    Identical queries that are already being fetched wait for the running
+    request instead of starting their own.
+    """
+
+    def __init__(self, backend: SearchBackend, ttl: float = 3600, max_entries: int = 1000):
+        """
+        Initialize the cache
+
+        Args:
+            backend: Backend answering cache misses
+            ttl: Seconds a result stays valid
+            max_entries: Maximum number of cached queries
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+        self.latency_saved = 0.0
+
+    def set_backend(self, backend: SearchBackend):
+        """Swap the backend and drop results cached from the previous one"""
+        with self._lock:
+            self.backend = backend
+            self._entries.clear()
+
+    def search(self, query: str) -> Any:
+        """
+        Return results for a query, from the cache when possible
+
+        Args:
+            query: The search query
+
+        Returns:
+            Search results
+        """
+        key = normalize_query(query)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.latency_saved += entry[2]
+                return entry[1]
+            if entry:
+                del self._entries[key]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.deduplicated += 1
+                owner = False
+            else:
+                future = self._in_flight[key] = Future()
+                self.misses += 1
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        start = time.perf_counter()
+        try:
+            results = self.backend.search(query)
+        except Exception as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        latency = time.perf_counter() - start
+
+        with self._lock:
+            del self._in_flight[key]
+            self._entries[key] = (time.monotonic(), results, latency)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        future.set_result(results)
+        return results
+
+    def clear(self):
+        """Remove all cached results"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return cache statistics for this process
+
+        Returns:
+            Dict with hits, misses, deduplicated requests, hit rate and the
+            backend latency saved in seconds
+        """
+        with self._lock:
+            lookups = self.hits + self.misses + self.deduplicated
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "deduplicated": self.deduplicated,
+                "entries": len(self._entries),
+                "hit_rate": (self.hits + self.deduplicated) / lookups if lookups else 0.0,
+                "latency_saved_seconds": round(self.latency_saved, 3),
+            }
+
+def backend_from_env() -> SearchBackend:
+    """
+    Choose the search backend from the SEARCH_BACKEND environment variable
+
+    SEARCH_BACKEND=local answers from the JSON file named by SEARCH_LOCAL_RESULTS
+    (or from nothing), anything else uses Serper behind the shared rate limiter.
+
+    Returns:
+        SearchBackend instance
+    """
+    if os.getenv("SEARCH_BACKEND", "serper").lower() == "local":
+        return LocalSearchBackend(path=os.getenv("SEARCH_LOCAL_RESULTS"))
+    return RateLimitedSearchBackend(SerperSearchBackend())
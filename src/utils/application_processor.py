@@ -1,22 +1,81 @@
 """
 Application processor utilities for the Job Application Assistant
 """
-import os
 import logging
-from typing import Dict, Any
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional
 from .document_generator import DocumentGenerator
+from .crew_events import event_router
+from .metrics import RunMetrics, metrics_exporter
+from .compaction import input_compactor
+from .sections import (
+    TASK_SECTIONS, SECTION_HEADERS, SectionStream, format_section, parse_sections, section_of, task_output_text,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# File each output section is saved to
+OUTPUT_FILES = {
+    "job_analysis": "job_analysis.md",
+    "resume_suggestions": "resume_suggestions.md",
+    "cover_letter": "cover_letter.md",
+    "interview_prep": "interview_prep.md",
+}
+
 class ApplicationProcessor:
     """Handles processing and output management for job applications"""
     
     def __init__(self):
         """Initialize the application processor"""
         self.outputs = {}
+        # Metrics record of the last crew run
+        self.metrics: Optional[Dict[str, Any]] = None
+    
+    @contextmanager
+    def observe_run(self, crew_instance, on_update: Optional[Callable[[str, str], None]] = None,
+                    extra: Optional[Dict[str, Any]] = None) -> Iterator[Optional[SectionStream]]:
+        """
+        Collect metrics, and optionally stream sections, for one crew run
+        
+        The metrics record is kept in self.metrics and exported through the
+        configured sinks when the run ends, whether it succeeded or not.
+        
+        Args:
+            crew_instance: The CrewAI crew instance about to run
+            on_update: Optional section update callback (see process_application)
+            extra: Additional fields for the metrics record, e.g. the input compaction report
+            
+        Yields:
+            SectionStream following the run, or None without on_update
+        """
+        tasks = crew_instance.tasks
+        metrics = RunMetrics(tasks)
+        stream = SectionStream(on_update) if on_update else None
+        observers = [metrics] + ([stream] if stream else [])
+        for observer in observers:
+            event_router.watch(tasks, observer)
+        
+        status = "failed"
+        try:
+            yield stream
+            status = "completed"
+        finally:
+            for observer in observers:
+                event_router.unwatch(tasks, observer)
+            self.metrics = metrics.finish(status)
+            self.metrics.update(extra or {})
+            totals = self.metrics["totals"]
+            logger.info(
+                f"Run {metrics.run_id} {status} in {self.metrics['duration_seconds']:.1f}s: "
+                f"{totals['prompt_tokens']} prompt / {totals['completion_tokens']} completion tokens, "
+                f"{totals['tool_calls']} tool calls, slowest task {totals['slowest_task']}"
+            )
+            metrics_exporter.export(self.metrics)
     
-    def process_application(self, crew_instance, job_description: str, resume_text: str) -> Dict[str, Any]:
+    def process_application(self, crew_instance, job_description: str, resume_text: str,
+                            on_update: Optional[Callable[[str, str], None]] = None,
+                            extra_inputs: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         Process a job application using the crew
         
@@ -24,10 +83,79 @@ class ApplicationProcessor:
             crew_instance: The CrewAI crew instance
             job_description: The job description text
             resume_text: The resume text
+            on_update: Optional callback receiving (section key, text so far) while
+                the crew runs; called from the threads executing the tasks
+            extra_inputs: Additional template inputs for the task prompts
+            
+        Returns:
+            Dict containing all outputs from the crew; the metrics record of the
+            run is kept in self.metrics
+        """
+        inputs, compaction = input_compactor.compact(self.prepare_inputs(job_description, resume_text), crew_instance.tasks)
+        inputs.update(extra_inputs or {})
+        
+        # Run the crew to process the application
+        logger.info("Starting job application processing")
+        with self.observe_run(crew_instance, on_update, {"compaction": compaction}) as stream:
+            results = crew_instance.kickoff(inputs=inputs)
+        
+        return self.handle_results(results, stream.sections() if stream else None, crew_instance.tasks)
+    
+    async def process_application_async(self, crew_instance, job_description: str, resume_text: str,
+                                        on_update: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """
+        Process a job application using the crew without blocking the event loop
+        
+        Args:
+            crew_instance: The CrewAI crew instance
+            job_description: The job description text
+            resume_text: The resume text
+            on_update: Optional callback receiving (section key, text so far) while
+                the crew runs; called from the threads executing the tasks
             
         Returns:
             Dict containing all outputs from the crew
         """
+        inputs, compaction = input_compactor.compact(self.prepare_inputs(job_description, resume_text), crew_instance.tasks)
+        
+        logger.info("Starting async job application processing")
+        with self.observe_run(crew_instance, on_update, {"compaction": compaction}) as stream:
+            results = await crew_instance.kickoff_async(inputs=inputs)
+        
+        return self.handle_results(results, stream.sections() if stream else None, crew_instance.tasks)
+    
+    def analyze_job(self, crew_instance, job_description: str) -> str:
+        """
+        Run a crew that only analyzes the job description
+        
+        Args:
+            crew_instance: Crew containing just the job analysis task
+            job_description: The job description text
+            
+        Returns:
+            str: The formatted job analysis section
+        """
+        if len(job_description.strip()) < 10:
+            raise ValueError("Job description is too short or empty.")
+        
+        inputs, compaction = input_compactor.compact({"job_description": job_description}, crew_instance.tasks)
+        
+        logger.info("Starting job description analysis")
+        with self.observe_run(crew_instance, extra={"compaction": compaction}):
+            results = crew_instance.kickoff(inputs=inputs)
+        return self.extract_outputs(results, crew_instance.tasks)["job_analysis"]
+    
+    def prepare_inputs(self, job_description: str, resume_text: str) -> Dict[str, str]:
+        """
+        Validate the application inputs and build the crew inputs
+        
+        Args:
+            job_description: The job description text
+            resume_text: The resume text
+            
+        Returns:
+            Dict of inputs for crew kickoff
+        """
         # Validate inputs
         if len(job_description.strip()) < 10:
             raise ValueError("Job description is too short or empty.")
@@ -36,141 +164,118 @@ class ApplicationProcessor:
             raise ValueError("Resume is too short or empty.")
         
         # Prepare inputs for the crew
-        inputs = {
+        return {
             "job_description": job_description,
             "resume": resume_text
         }
+    
+    def handle_results(self, results, streamed: Optional[Dict[str, str]] = None,
+                       tasks: Optional[Iterable[Any]] = None) -> Dict[str, Any]:
+        """
+        Extract the sections from a crew result and keep them for saving
         
-        # Run the crew to process the application
-        logger.info("Starting job application processing")
-        results = crew_instance.kickoff(inputs=inputs)
-        
+        Args:
+            results: The raw crew results from CrewAI
+            streamed: Sections already parsed while the crew was running
+            tasks: The crew's Task objects
+            
+        Returns:
+            Dict containing all outputs from the crew
+        """
         # Process the results to extract relevant sections
-        processed_results = self.extract_outputs(results)
+        processed_results = self.extract_outputs(results, tasks)
+        for key, content in (streamed or {}).items():
+            if not processed_results.get(key):
+                processed_results[key] = content
         self.outputs = processed_results
         
         return processed_results
     
-    def extract_outputs(self, results) -> Dict[str, Any]:
+    def extract_outputs(self, results, tasks: Optional[Iterable[Any]] = None) -> Dict[str, Any]:
         """
         Extract and format outputs from the crew results
         
+        Task outputs are mapped to sections by the task that produced them: by
+        task name, or by matching the output's description against the crew's
+        tasks. Only outputs that cannot be attributed are identified by their
+        header, and only if no task output could be read at all is the combined
+        result text split into sections.
+        
         Args:
             results: The raw crew results from CrewAI
+            tasks: The crew's Task objects, used to attribute unnamed task outputs
             
         Returns:
             Dictionary with formatted outputs
         """
-        outputs = {
-            "job_analysis": "",
-            "resume_suggestions": "",
-            "cover_letter": "",
-            "interview_prep": ""
+        outputs = {key: "" for key in SECTION_HEADERS}
+        task_names = {
+            getattr(task, 'description', None): task.name for task in (tasks or []) if getattr(task, 'name', None)
         }
         
         try:
-            # CrewAI returns a CrewOutput object with tasks_output list
-            if hasattr(results, 'tasks_output') and results.tasks_output:
-                # Extract individual task results
-                for task_output in results.tasks_output:
-                    if hasattr(task_output, 'raw') and task_output.raw:
-                        content = str(task_output.raw).strip()
-                        
-                        # Determine which section this content belongs to based on headers
-                        content_lower = content.lower()
-                        if "# job analysis" in content_lower:
-                            outputs["job_analysis"] = content
-                        elif "# resume suggestions" in content_lower:
-                            outputs["resume_suggestions"] = content
-                        elif "# cover letter" in content_lower:
-                            outputs["cover_letter"] = content
-                        elif "# interview preparation" in content_lower:
-                            outputs["interview_prep"] = content
+            # CrewAI returns a CrewOutput object with tasks_output list. Async tasks in
+            # parallel mode may finish in any order, so never rely on the position.
+            for task_output in getattr(results, 'tasks_output', None) or []:
+                content = task_output_text(task_output)
+                if not content:
+                    continue
+                
+                task_name = getattr(task_output, 'name', None) or task_names.get(getattr(task_output, 'description', None))
+                section = TASK_SECTIONS.get(task_name) or section_of(content)
+                if section:
+                    outputs[section] = content
             
-            # Fallback: if extraction fails, try alternative methods
+            # Fallback: if extraction fails, split the combined result text
             if not any(outputs.values()):
                 logger.warning("Primary extraction failed, trying fallback methods")
-                result_text = str(results)
-                
-                # Simple text splitting approach
-                sections = []
-                current_section = ""
-                
-                for line in result_text.split('\n'):
-                    if any(header in line.lower() for header in ['# job analysis', '# resume suggestions', '# cover letter', '# interview preparation']):
-                        if current_section.strip():
-                            sections.append(current_section.strip())
-                        current_section = line + '\n'
-                    else:
-                        current_section += line + '\n'
-                
-                if current_section.strip():
-                    sections.append(current_section.strip())
-                
-                # Assign sections to appropriate outputs
-                for section in sections:
-                    section_lower = section.lower()
-                    if "# job analysis" in section_lower:
-                        outputs["job_analysis"] = section
-                    elif "# resume suggestions" in section_lower:
-                        outputs["resume_suggestions"] = section
-                    elif "# cover letter" in section_lower:
-                        outputs["cover_letter"] = section
-                    elif "# interview preparation" in section_lower:
-                        outputs["interview_prep"] = section
+                outputs.update(parse_sections(str(results)))
         
         except Exception as e:
             logger.error(f"Error extracting outputs: {str(e)}")
             # Provide meaningful error information
             error_msg = f"Error extracting results: {str(e)}"
-            outputs = {
-                "job_analysis": f"# Job Analysis\n\n{error_msg}",
-                "resume_suggestions": f"# Resume Suggestions\n\n{error_msg}",
-                "cover_letter": f"# Cover Letter\n\n{error_msg}",
-                "interview_prep": f"# Interview Preparation\n\n{error_msg}"
-            }
+            outputs = {key: f"# {title}\n\n{error_msg}" for key, title in SECTION_HEADERS.items()}
         
         # Ensure all outputs have appropriate headers
         for key in outputs:
-            if outputs[key] and not outputs[key].strip().startswith("#"):
-                header = f"# {key.replace('_', ' ').title()}"
-                outputs[key] = f"{header}\n\n{outputs[key]}"
+            outputs[key] = format_section(key, outputs[key])
         
         return outputs
     
-    def save_outputs(self, output_dir: str = "outputs") -> Dict[str, str]:
+    def documents(self) -> Dict[str, str]:
         """
-        Save all outputs to files
+        Build the document saved for each section
         
-        Args:
-            output_dir: Directory to save outputs
-            
         Returns:
-            Dict with paths to saved files
-        """
-        os.makedirs(output_dir, exist_ok=True)
-        saved_files = {}
-        document_generator = DocumentGenerator()
-        
-        # Define output files
-        output_files = {
-            "job_analysis": "job_analysis.md",
-            "resume_suggestions": "resume_suggestions.md", 
-            "cover_letter": "cover_letter.md",
-            "interview_prep": "interview_prep.md"
-        }
-        
-        # Save each output type
-        for output_type, filename in output_files.items():
+            Dict of document content keyed by file name, in section order
+        """
+        documents = {}
+        for output_type, filename in OUTPUT_FILES.items():
             content = self.outputs.get(output_type, "")
             
             # Ensure we have some content
             if not content or len(content.strip()) < 10:
                 title = f"# {output_type.replace('_', ' ').title()}"
                 content = f"{title}\n\nNo content was generated for this section."
+            documents[filename] = content
+        return documents
+    
+    def save_outputs(self, output_dir: str = "outputs", bundle: Optional[str] = None) -> Dict[str, str]:
+        """
+        Save all outputs to files
+        
+        Args:
+            output_dir: Directory to save outputs
+            bundle: Save a single "zip" or "json" bundle instead of one file per section
             
-            # Save to file
-            file_path = document_generator.save_document(content, filename, output_dir)
-            saved_files[output_type] = file_path
+        Returns:
+            Dict with paths to saved files ({"bundle": path} when bundled)
+        """
+        documents = self.documents()
+        if bundle:
+            return {"bundle": DocumentGenerator.save_bundle(documents, output_dir, bundle)}
         
-        return saved_files
\ No newline at end of file
+        # Write one file per section, concurrently
+        saved = DocumentGenerator.save_documents(documents, output_dir)
+        return {output_type: saved[filename] for output_type, filename in OUTPUT_FILES.items()}
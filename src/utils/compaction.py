@@ -0,0 +1,298 @@
+"""
+Input compaction for the Job Application Assistant
+
+Job descriptions and resumes are templated into several task prompts, so
+every token of noise in them is paid for once per task. This module strips
+HTML residue, equal-opportunity boilerplate and PDF page-break noise,
+removes repeated paragraphs and enforces a token budget per input.
+"""
+import os
+import re
+import html
+import math
+import logging
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Inputs that are compacted; other inputs (e.g. a precomputed job analysis) pass through
+COMPACTED_INPUTS = ("job_description", "resume")
+
+# Token budget of each compacted input in every task prompt it is templated into
+DEFAULT_BUDGETS = {
+    "job_description": int(os.getenv("JOB_DESCRIPTION_TOKEN_BUDGET", "3000")),
+    "resume": int(os.getenv("RESUME_TOKEN_BUDGET", "3000")),
+}
+
+TRUNCATION_NOTICE = "[... truncated to fit the input budget ...]"
+
+_SCRIPT_STYLE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_BLOCK_TAGS = re.compile(r"<\s*(br|/p|/div|/h[1-6]|/tr|/ul|/ol)\b[^>]*>", re.IGNORECASE)
+_LIST_ITEM = re.compile(r"<\s*li\b[^>]*>", re.IGNORECASE)
+# Only known HTML tag names are stripped, so generics like vector<int> or List<T> survive
+_TAG_NAMES = (
+    "a|abbr|address|article|aside|b|big|blockquote|body|br|button|caption|center|cite|code|col|colgroup|"
+    "dd|del|details|div|dl|dt|em|figcaption|figure|font|footer|form|h[1-6]|head|header|hr|html|i|img|input|"
+    "ins|kbd|label|li|link|main|mark|meta|nav|ol|option|p|pre|q|s|section|select|small|span|strike|strong|"
+    "sub|summary|sup|table|tbody|td|tfoot|th|thead|title|tr|tt|u|ul"
+)
+_TAGS = re.compile(r"<!--.*?-->|<!doctype\b[^>]*>|</?(" + _TAG_NAMES + r")(\s[^<>]*)?/?>", re.IGNORECASE | re.DOTALL)
+_ENTITIES = re.compile(r"&(#[0-9]+|#[xX][0-9a-fA-F]+|[a-zA-Z][a-zA-Z0-9]*);")
+
+# Version of the compaction rules; part of the cache key signature
+COMPACTION_VERSION = 4
+
+# Sentences containing any of these phrases are equal-opportunity or legal boilerplate
+_BOILERPLATE = re.compile(
+    r"equal (employment )?opportunity|without regard to (race|age|sex|gender)|"
+    r"reasonable accommodations?|protected veteran|e-verify|"
+    r"regardless of (race|gender|sexual orientation)|affirmative action employer",
+    re.IGNORECASE,
+)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# "Page 3" and "Page 3 of 5" lines are page furniture wherever they appear
+_PAGE_LABEL = re.compile(r"^\s*page\s+\d+(\s*(of|/)\s*\d+)?\s*$", re.IGNORECASE)
+# Bare page numbers ("3", "- 3 -") are only noise next to a page break (form feed)
+_PAGE_NUMBER = re.compile(r"^\s*(-\s*)?\d{1,3}(\s*-)?\s*$")
+
+_SPACES = re.compile(r"[ \t\u00a0\u200b]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+# Lines shorter than this are never treated as duplicates (headings, skills, dates)
+MIN_DUPLICATE_LINE = 40
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens of a text
+
+    Uses the common four-characters-per-token approximation, which is close
+    enough for budgeting English prose without loading a tokenizer.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    return math.ceil(len(text) / 4)
+
+def strip_html(text: str) -> str:
+    """
+    Remove HTML tags and entities left over from pasting a job posting
+
+    Text without a known HTML tag is left untouched, and only complete
+    entities (ending in ';') are decoded, so code samples and names such as
+    "AT&T" pass through unchanged.
+    """
+    if "<" in text and _TAGS.search(text):
+        text = _SCRIPT_STYLE.sub("", text)
+        text = _BLOCK_TAGS.sub("\n", text)
+        text = _LIST_ITEM.sub("\n- ", text)
+        text = _TAGS.sub("", text)
+    if "&" in text:
+        text = _ENTITIES.sub(lambda match: html.unescape(match.group(0)), text)
+    return text
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces, strip line ends and limit blank lines to one"""
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\f", "\n\n")
+    lines = [_SPACES.sub(" ", line).strip() for line in text.split("\n")]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+def remove_page_noise(text: str) -> str:
+    """
+    Drop 'Page x of y' lines and page numbers produced by PDF extraction
+
+    A bare number is only dropped when it is the first or last line of a page,
+    next to a form feed; elsewhere it may be a year, a count or a list value.
+    """
+    pages = text.split("\f")
+    for index, page in enumerate(pages):
+        lines = [line for line in page.split("\n") if not _PAGE_LABEL.match(line)]
+        filled = [position for position, line in enumerate(lines) if line.strip()]
+        edges = set()
+        if filled and index > 0:
+            edges.add(filled[0])
+        if filled and index < len(pages) - 1:
+            edges.add(filled[-1])
+        pages[index] = "\n".join(line for position, line in enumerate(lines)
+                                 if position not in edges or not _PAGE_NUMBER.match(line))
+    return "\f".join(pages)
+
+def remove_boilerplate(text: str) -> str:
+    """
+    Drop sentences of equal-opportunity and other legal boilerplate
+
+    Only the matching sentences are removed, so requirements or pay details
+    sharing a paragraph with the boilerplate are kept; sentences containing
+    digits (salary ranges, years of experience) are always kept.
+    """
+    paragraphs = []
+    for paragraph in text.split("\n\n"):
+        lines = []
+        for line in paragraph.split("\n"):
+            if _BOILERPLATE.search(line):
+                line = " ".join(sentence for sentence in _SENTENCE_END.split(line)
+                                if not _BOILERPLATE.search(sentence) or any(char.isdigit() for char in sentence))
+                if not line:
+                    continue
+            lines.append(line)
+        if lines:
+            paragraphs.append("\n".join(lines))
+    return "\n\n".join(paragraphs)
+
+def dedupe(text: str) -> str:
+    """
+    Remove repeated paragraphs and repeated long lines
+
+    Repeated page headers and footers of PDFs, and job postings pasted
+    twice, keep only their first occurrence. Short lines are left alone since
+    headings and list items legitimately repeat.
+    """
+    seen_paragraphs = set()
+    seen_lines = set()
+    paragraphs = []
+    for paragraph in text.split("\n\n"):
+        key = paragraph.casefold()
+        if not key or key in seen_paragraphs:
+            continue
+        seen_paragraphs.add(key)
+        lines = []
+        for line in paragraph.split("\n"):
+            line_key = line.casefold()
+            if len(line_key) >= MIN_DUPLICATE_LINE:
+                if line_key in seen_lines:
+                    continue
+                seen_lines.add(line_key)
+            lines.append(line)
+        if lines:
+            paragraphs.append("\n".join(lines))
+    return "\n\n".join(paragraphs)
+
+def truncate_to_budget(text: str, max_tokens: int) -> Tuple[str, bool]:
+    """
+    Shorten a text to a token budget, cutting at a line boundary
+
+    Args:
+        text: Text to shorten
+        max_tokens: Token budget
+
+    Returns:
+        Tuple of (text within the budget, whether it was truncated)
+    """
+    if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+        return text, False
+    limit = max(0, max_tokens * 4 - len(TRUNCATION_NOTICE) - 2)
+    cut = text.rfind("\n", 0, limit)
+    if cut < limit // 2:
+        # No line break in the second half of the budget; cut at a word instead
+        cut = text.rfind(" ", 0, limit)
+    if cut <= 0:
+        cut = limit
+    return f"{text[:cut].rstrip()}\n\n{TRUNCATION_NOTICE}", True
+
+def task_inputs(tasks: Iterable[Any]) -> Dict[str, List[str]]:
+    """
+    Find the inputs templated into each task prompt
+
+    Args:
+        tasks: CrewAI Task objects
+
+    Returns:
+        Dict of task name to the input names its description uses
+    """
+    used = {}
+    for task in tasks:
+        description = getattr(task, '_original_description', None) or getattr(task, 'description', '') or ''
+        used[task.name] = [key for key in COMPACTED_INPUTS if "{" + key + "}" in description]
+    return used
+
+class InputCompactor:
+    """Normalizes, deduplicates and budgets the text inputs of a crew run"""
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None, enabled: bool = True):
+        """
+        Initialize the compactor
+
+        Args:
+            budgets: Token budget per input name (defaults to DEFAULT_BUDGETS)
+            enabled: Pass inputs through unchanged when False
+        """
+        self.budgets = dict(DEFAULT_BUDGETS if budgets is None else budgets)
+        self.enabled = enabled
+
+    def signature(self) -> str:
+        """Describe the settings that change compacted inputs, for cache keys"""
+        if not self.enabled:
+            return "compaction:off"
+        return f"compaction:v{COMPACTION_VERSION}:" + ",".join(f"{key}={value}" for key, value in sorted(self.budgets.items()))
+
+    def compact_text(self, key: str, text: str) -> Tuple[str, bool]:
+        """
+        Compact one input
+
+        Args:
+            key: Input name ("job_description" or "resume")
+            text: Raw input text
+
+        Returns:
+            Tuple of (compacted text, whether it was truncated to the budget)
+        """
+        text = strip_html(text)
+        if key == "resume":
+            text = normalize_whitespace(remove_page_noise(text))
+        else:
+            text = remove_boilerplate(normalize_whitespace(text))
+        text = dedupe(text)
+        return truncate_to_budget(text, self.budgets.get(key, 0))
+
+    def compact(self, inputs: Dict[str, str], tasks: Iterable[Any] = ()) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Compact the inputs of a crew run
+
+        Args:
+            inputs: Crew inputs
+            tasks: The crew's Task objects, used to count the tokens saved per task
+
+        Returns:
+            Tuple of (compacted inputs, report with per-input token counts and
+            the tokens saved per task and for the whole run)
+        """
+        report: Dict[str, Any] = {"enabled": self.enabled, "inputs": {}, "tasks": {}, "tokens_saved": 0}
+        if not self.enabled:
+            return inputs, report
+
+        compacted = dict(inputs)
+        saved_per_input = {}
+        for key in COMPACTED_INPUTS:
+            if key not in inputs:
+                continue
+            text, truncated = self.compact_text(key, inputs[key])
+            # Keep the raw input if compaction removed everything
+            if not text.strip():
+                text, truncated = inputs[key], False
+            compacted[key] = text
+            original_tokens = estimate_tokens(inputs[key])
+            compacted_tokens = estimate_tokens(text)
+            saved_per_input[key] = max(0, original_tokens - compacted_tokens)
+            report["inputs"][key] = {
+                "original_tokens": original_tokens,
+                "compacted_tokens": compacted_tokens,
+                "truncated": truncated,
+            }
+
+        for task_name, keys in task_inputs(tasks).items():
+            saved = sum(saved_per_input.get(key, 0) for key in keys)
+            report["tasks"][task_name] = saved
+            report["tokens_saved"] += saved
+
+        sizes = ", ".join(
+            f"{key}: {counts['original_tokens']} -> {counts['compacted_tokens']}" for key, counts in report["inputs"].items()
+        )
+        logger.info(f"Input compaction saved about {report['tokens_saved']} prompt tokens ({sizes})")
+        return compacted, report
+
+# Shared compactor configured from the environment (COMPACT_INPUTS=0 disables it)
+input_compactor = InputCompactor(enabled=os.getenv("COMPACT_INPUTS", "1").lower() not in ("0", "false", "no"))
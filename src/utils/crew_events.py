@@ -0,0 +1,168 @@
+"""
+Routing of CrewAI events to the application run that produced them
+"""
+import logging
+import threading
+from typing import Dict, Any, Optional, Iterable, List, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class RunObserver:
+    """Base class for objects that follow the tasks of one crew run
+
+    Subclasses override the hooks they care about. Hooks are called from the
+    thread that executes the task, so implementations must be thread-safe.
+    """
+
+    def on_task_started(self, task_name: str):
+        """Called when a task starts executing"""
+
+    def on_llm_chunk(self, task_name: str, chunk: str):
+        """Called for every streamed LLM token chunk of a task"""
+
+    def on_task_completed(self, task_name: str, output: Any):
+        """Called with the TaskOutput of a finished task"""
+
+    def on_task_failed(self, task_name: str, error: str):
+        """Called when a task raises"""
+
+    def on_llm_call(self, task_name: str, failed: bool):
+        """Called when an LLM call of a task finishes or fails"""
+
+    def on_tool_used(self, task_name: str, tool_name: str, failed: bool):
+        """Called when a tool call of a task finishes or fails"""
+
+class EventRouter:
+    """Dispatches events from the global CrewAI event bus to per-run observers
+
+    The event bus is process-wide, so concurrent runs would see each other's
+    events. Observers are registered for the ids of their crew's tasks and only
+    receive events from those tasks; a task can have several observers.
+    """
+
+    def __init__(self):
+        """Initialize the router"""
+        self._observers: Dict[str, List[RunObserver]] = {}
+        self._task_names: Dict[str, str] = {}
+        self._current_task = threading.local()
+        self._lock = threading.Lock()
+        self._registered = False
+
+    def _register_handlers(self):
+        """Subscribe to the CrewAI event bus on first use"""
+        with self._lock:
+            if self._registered:
+                return
+            try:
+                from crewai.events import (
+                    crewai_event_bus, TaskStartedEvent, TaskCompletedEvent,
+                    TaskFailedEvent, LLMStreamChunkEvent, LLMCallCompletedEvent,
+                    LLMCallFailedEvent, ToolUsageFinishedEvent, ToolUsageErrorEvent,
+                )
+            except ImportError:
+                # Older CrewAI releases
+                from crewai.utilities.events import (
+                    crewai_event_bus, TaskStartedEvent, TaskCompletedEvent,
+                    TaskFailedEvent, LLMStreamChunkEvent, LLMCallCompletedEvent,
+                    LLMCallFailedEvent, ToolUsageFinishedEvent, ToolUsageErrorEvent,
+                )
+
+            crewai_event_bus.on(TaskStartedEvent)(self._handle_task_started)
+            crewai_event_bus.on(TaskCompletedEvent)(self._handle_task_completed)
+            crewai_event_bus.on(TaskFailedEvent)(self._handle_task_failed)
+            crewai_event_bus.on(LLMStreamChunkEvent)(self._handle_llm_chunk)
+            crewai_event_bus.on(LLMCallCompletedEvent)(self._handle_llm_call_completed)
+            crewai_event_bus.on(LLMCallFailedEvent)(self._handle_llm_call_failed)
+            crewai_event_bus.on(ToolUsageFinishedEvent)(self._handle_tool_finished)
+            crewai_event_bus.on(ToolUsageErrorEvent)(self._handle_tool_error)
+            self._registered = True
+
+    def watch(self, tasks: Iterable[Any], observer: RunObserver):
+        """
+        Send the events of the given tasks to an observer
+
+        Args:
+            tasks: CrewAI Task objects of the run
+            observer: Observer receiving the events
+        """
+        self._register_handlers()
+        with self._lock:
+            for task in tasks:
+                task_id = str(task.id)
+                self._observers.setdefault(task_id, []).append(observer)
+                self._task_names[task_id] = task.name
+
+    def unwatch(self, tasks: Iterable[Any], observer: Optional[RunObserver] = None):
+        """
+        Stop routing the events of the given tasks
+
+        Args:
+            tasks: CrewAI Task objects previously passed to watch
+            observer: Observer to remove (defaults to every observer of the tasks)
+        """
+        with self._lock:
+            for task in tasks:
+                task_id = str(task.id)
+                observers = self._observers.get(task_id, [])
+                if observer is not None and observer in observers:
+                    observers.remove(observer)
+                if observer is None or not observers:
+                    self._observers.pop(task_id, None)
+                    self._task_names.pop(task_id, None)
+
+    def _lookup(self, task_id: Optional[str]) -> Tuple[List[RunObserver], Optional[str]]:
+        """Return (observers, task name) for a task id"""
+        if task_id is None:
+            return [], None
+        with self._lock:
+            return list(self._observers.get(task_id, [])), self._task_names.get(task_id)
+
+    def _event_task_id(self, source, event) -> Optional[str]:
+        """Find the id of the task an event belongs to"""
+        task = getattr(event, 'task', None) or getattr(event, 'from_task', None)
+        if task is not None and hasattr(task, 'id'):
+            return str(task.id)
+        task_id = getattr(event, 'task_id', None)
+        if task_id:
+            return str(task_id)
+        # Events without task information are emitted on the thread executing the task
+        return getattr(self._current_task, 'task_id', None)
+
+    def _dispatch(self, task_id: Optional[str], hook: str, *args):
+        """Call an observer hook, never letting it break the crew run"""
+        observers, task_name = self._lookup(task_id)
+        for observer in observers:
+            try:
+                getattr(observer, hook)(task_name, *args)
+            except Exception as e:
+                logger.error(f"Error in run observer {hook}: {str(e)}")
+
+    def _handle_task_started(self, source, event):
+        task_id = self._event_task_id(source, event)
+        self._current_task.task_id = task_id
+        self._dispatch(task_id, 'on_task_started')
+
+    def _handle_task_completed(self, source, event):
+        self._dispatch(self._event_task_id(source, event), 'on_task_completed', event.output)
+
+    def _handle_task_failed(self, source, event):
+        self._dispatch(self._event_task_id(source, event), 'on_task_failed', str(getattr(event, 'error', '')))
+
+    def _handle_llm_chunk(self, source, event):
+        self._dispatch(self._event_task_id(source, event), 'on_llm_chunk', event.chunk)
+
+    def _handle_llm_call_completed(self, source, event):
+        self._dispatch(self._event_task_id(source, event), 'on_llm_call', False)
+
+    def _handle_llm_call_failed(self, source, event):
+        self._dispatch(self._event_task_id(source, event), 'on_llm_call', True)
+
+    def _handle_tool_finished(self, source, event):
+        self._dispatch(self._event_task_id(source, event), 'on_tool_used', getattr(event, 'tool_name', ''), False)
+
+    def _handle_tool_error(self, source, event):
+        self._dispatch(self._event_task_id(source, event), 'on_tool_used', getattr(event, 'tool_name', ''), True)
+
+# Shared router for the process
+event_router = EventRouter()
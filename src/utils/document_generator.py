@@ -1,17 +1,74 @@
 """
 Simple document generation utilities for the Job Application Assistant
 """
+import io
 import os
+import json
+import uuid
 import logging
-from typing import Optional
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Union
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# When written files are flushed to disk: "none" leaves it to the OS, "file" fsyncs
+# each file before it is renamed into place, "full" also fsyncs the directory
+FSYNC_POLICY = os.getenv("OUTPUT_FSYNC", "none").lower()
+
+# Single-file formats for save_bundle
+BUNDLE_FORMATS = ("zip", "json")
+
+# Writer threads shared by every save_documents call; threads start on first use
+_write_pool = ThreadPoolExecutor(max_workers=int(os.getenv("OUTPUT_WRITE_WORKERS", "4")),
+                                 thread_name_prefix="output-writer")
+
 class DocumentGenerator:
     """Utility for generating and saving simple documents from agent outputs"""
     
+    @staticmethod
+    def write_atomic(path: str, data: Union[str, bytes], fsync: Optional[str] = None):
+        """
+        Write a file so readers see either the old or the complete new content
+        
+        The data goes to a temporary file in the same directory, which is then
+        renamed over the target; a crash mid-write never leaves a torn file.
+        
+        Args:
+            path: Target file path
+            data: Text (written as UTF-8) or bytes
+            fsync: "none", "file" or "full" (defaults to the OUTPUT_FSYNC policy)
+        """
+        fsync = (fsync or FSYNC_POLICY).lower()
+        directory = os.path.dirname(path) or "."
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        
+        temp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+        # Created like open() would, so the file gets the process umask's usual permissions
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if fsync in ("file", "full"):
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        
+        if fsync == "full" and hasattr(os, "O_DIRECTORY"):
+            # Persist the rename itself
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+    
     @staticmethod
     def save_document(content: str, filename: str, output_dir: str = "outputs") -> Optional[str]:
         """
@@ -47,26 +104,84 @@ class DocumentGenerator:
                 # Provide some basic content if empty
                 content = f"# {filename.replace('.md', '').replace('_', ' ').title()}\n\nNo content was generated."
             
-            logger.info(f"Writing {len(content)} characters to {file_path}")
+            DocumentGenerator.write_atomic(file_path, content)
+            logger.info(f"Document saved to {file_path} ({len(content)} characters)")
             
-            # Save the content to the file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            return file_path
+        except Exception as e:
+            logger.error(f"Error saving document: {str(e)}")
+            return None
+    
+    @staticmethod
+    def save_documents(documents: Dict[str, str], output_dir: str = "outputs") -> Dict[str, Optional[str]]:
+        """
+        Save several markdown documents concurrently
+        
+        The files are written by the shared writer threads, so a slow disk
+        (or fsync policy) costs the time of the slowest file, not of all of them.
+        
+        Args:
+            documents: Content keyed by file name
+            output_dir: Directory to save the files
             
-            # Verify file was written correctly
-            if os.path.exists(file_path):
-                file_size = os.path.getsize(file_path)
-                logger.info(f"Document saved successfully to {file_path} (Size: {file_size} bytes)")
-                
-                # Double-check content
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    saved_content = f.read()
-                    if len(saved_content) < 10:
-                        logger.warning(f"File saved but content seems minimal: {saved_content}")
-            else:
-                logger.error(f"Failed to verify file existence: {file_path}")
+        Returns:
+            Dict mapping each file name to its saved path, or None if saving it failed
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        futures = {
+            filename: _write_pool.submit(DocumentGenerator.save_document, content, filename, output_dir)
+            for filename, content in documents.items()
+        }
+        return {filename: future.result() for filename, future in futures.items()}
+    
+    @staticmethod
+    def bundle_bytes(documents: Dict[str, str], bundle_format: str = "zip") -> bytes:
+        """
+        Pack several documents into one file in memory
+        
+        Args:
+            documents: Content keyed by file name
+            bundle_format: "zip" (one entry per document) or "json" (file name to content)
             
+        Returns:
+            bytes: Content of the bundle file
+        """
+        if bundle_format not in BUNDLE_FORMATS:
+            raise ValueError(f"Unknown bundle format '{bundle_format}'; choose from {', '.join(BUNDLE_FORMATS)}")
+        if bundle_format == "json":
+            return json.dumps(documents, ensure_ascii=False, indent=2).encode("utf-8")
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for filename, content in documents.items():
+                archive.writestr(filename, content)
+        return buffer.getvalue()
+    
+    @staticmethod
+    def save_bundle(documents: Dict[str, str], output_dir: str = "outputs", bundle_format: str = "zip",
+                    name: str = "application") -> Optional[str]:
+        """
+        Save several documents as one file
+        
+        High-volume batch runs produce one file per application instead of one
+        per section.
+        
+        Args:
+            documents: Content keyed by file name
+            output_dir: Directory to save the bundle
+            bundle_format: "zip" (one markdown entry per document) or "json" (file name to content)
+            name: Bundle file name without extension
+            
+        Returns:
+            str: Path to the saved bundle or None if failed
+        """
+        if bundle_format not in BUNDLE_FORMATS:
+            raise ValueError(f"Unknown bundle format '{bundle_format}'; choose from {', '.join(BUNDLE_FORMATS)}")
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            file_path = os.path.join(output_dir, f"{name}.{bundle_format}")
+            DocumentGenerator.write_atomic(file_path, DocumentGenerator.bundle_bytes(documents, bundle_format))
+            logger.info(f"Bundle of {len(documents)} documents saved to {file_path}")
             return file_path
         except Exception as e:
-            logger.error(f"Error saving document: {str(e)}")
-            return None
\ No newline at end of file
+            logger.error(f"Error saving bundle: {str(e)}")
+            return None
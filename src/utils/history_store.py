@@ -0,0 +1,321 @@
+"""
+SQLite-backed application history for the Job Application Assistant
+"""
+import os
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Result sections indexed for full-text search
+SEARCH_SECTIONS = ["job_analysis", "resume_suggestions", "cover_letter", "interview_prep"]
+
+# Metadata columns returned by listings (results are only loaded by get)
+METADATA_COLUMNS = "id, timestamp, job_title, company, results_size"
+
+class HistoryStore:
+    """Application history in an embedded SQLite database
+
+    Metadata is indexed for listing, results are stored as compressed JSON
+    blobs and only read for a single entry, and the generated content is
+    indexed with FTS5 when SQLite provides it.
+    """
+
+    def __init__(self, path: str = os.path.join("outputs", "history", "history.sqlite")):
+        """
+        Initialize the store
+
+        Args:
+            path: Location of the SQLite database file
+        """
+        self.path = path
+        self.has_fts = False
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the schema on first use"""
+        with self._lock:
+            if not self._initialized:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            if not self._initialized:
+                self._create_schema(conn)
+                self._initialized = True
+            return conn
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        """Create tables and indexes"""
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS applications (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                job_title TEXT NOT NULL,
+                company TEXT NOT NULL,
+                results_size INTEGER NOT NULL,
+                results BLOB NOT NULL,
+                source TEXT UNIQUE
+            );
+            CREATE INDEX IF NOT EXISTS idx_applications_timestamp ON applications(timestamp DESC, id DESC);
+            CREATE INDEX IF NOT EXISTS idx_applications_company ON applications(company);
+            CREATE INDEX IF NOT EXISTS idx_applications_job_title ON applications(job_title);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5("
+                f"job_title, company, {', '.join(SEARCH_SECTIONS)}, content='')"
+            )
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            logger.warning("SQLite was built without FTS5; history search falls back to LIKE")
+        conn.commit()
+
+    def add(self, job_title: str, company: str, results: Dict[str, Any],
+            timestamp: Optional[str] = None, source: Optional[str] = None) -> Optional[int]:
+        """
+        Save an application
+
+        Args:
+            job_title: Job title
+            company: Company name
+            results: Generated sections keyed by section name
+            timestamp: "%Y%m%d_%H%M%S" timestamp (defaults to now)
+            source: Identifier of an imported file, used to skip duplicates
+
+        Returns:
+            int: Id of the new entry, or None if it was already imported
+        """
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        payload = json.dumps(results).encode("utf-8")
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO applications (timestamp, job_title, company, results_size, results, source) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (timestamp, job_title, company, len(payload), zlib.compress(payload), source),
+            )
+            if cursor.rowcount == 0:
+                return None
+            entry_id = cursor.lastrowid
+            if self.has_fts:
+                conn.execute(
+                    f"INSERT INTO applications_fts (rowid, job_title, company, {', '.join(SEARCH_SECTIONS)}) "
+                    f"VALUES (?, ?, ?, {', '.join('?' for _ in SEARCH_SECTIONS)})",
+                    (entry_id, job_title, company, *[str(results.get(key, "")) for key in SEARCH_SECTIONS]),
+                )
+            conn.commit()
+            return entry_id
+        finally:
+            conn.close()
+
+    def list(self, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        List entries newest first, without their results
+
+        Args:
+            limit: Page size
+            offset: Number of entries to skip
+
+        Returns:
+            List of metadata dicts (id, timestamp, job_title, company, results_size)
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT {METADATA_COLUMNS} FROM applications ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def list_before(self, timestamp: str, entry_id: int, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        List the entries following a given entry, newest first
+
+        Keyset pagination: cost depends on the page size only, not on how deep
+        into the history the page is.
+
+        Args:
+            timestamp: Timestamp of the last entry of the previous page
+            entry_id: Id of the last entry of the previous page
+            limit: Page size
+
+        Returns:
+            List of metadata dicts
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT {METADATA_COLUMNS} FROM applications WHERE (timestamp, id) < (?, ?) "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (timestamp, entry_id, limit),
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def get(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Load a single entry including its results
+
+        Args:
+            entry_id: Entry id
+
+        Returns:
+            Dict with the metadata and "results", or None if there is no such entry
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT {METADATA_COLUMNS}, results FROM applications WHERE id = ?", (entry_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["results"] = json.loads(zlib.decompress(entry["results"]).decode("utf-8"))
+        return entry
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Full-text search over job titles, companies and generated content
+
+        Args:
+            query: Search terms
+            limit: Page size
+            offset: Number of matches to skip
+
+        Returns:
+            List of metadata dicts, newest first
+        """
+        terms = query.split()
+        if not terms:
+            return self.list(limit, offset)
+
+        conn = self._connect()
+        try:
+            if self.has_fts:
+                # Quote each term so user input cannot form FTS5 syntax errors
+                match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+                rows = conn.execute(
+                    f"SELECT {METADATA_COLUMNS} FROM applications WHERE id IN "
+                    "(SELECT rowid FROM applications_fts WHERE applications_fts MATCH ?) "
+                    "ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                    (match, limit, offset),
+                ).fetchall()
+            else:
+                pattern = f"%{query.strip()}%"
+                rows = conn.execute(
+                    f"SELECT {METADATA_COLUMNS} FROM applications WHERE job_title LIKE ? OR company LIKE ? "
+                    "ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                    (pattern, pattern, limit, offset),
+                ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def version(self) -> int:
+        """
+        Return a number that changes whenever an application is added
+
+        Callers cache listings keyed on this value so new history invalidates
+        them, also when it was written by another process.
+        """
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM applications").fetchone()[0]
+        finally:
+            conn.close()
+
+    def count(self) -> int:
+        """Return the number of saved applications"""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+        finally:
+            conn.close()
+
+    def company_count(self) -> int:
+        """Return the number of distinct companies applied to"""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(DISTINCT company) FROM applications").fetchone()[0]
+        finally:
+            conn.close()
+
+    def import_json_dir(self, history_dir: str = os.path.join("outputs", "history"), force: bool = False) -> int:
+        """
+        Import history saved as one JSON file per application
+
+        The import runs once per database; pass force=True to scan the directory
+        again. Files are recorded by name, so files imported before are skipped.
+
+        Args:
+            history_dir: Directory containing the JSON history files
+            force: Import even if an import already ran
+
+        Returns:
+            int: Number of entries imported
+        """
+        if not force and self._get_meta("json_import") is not None:
+            return 0
+        if not os.path.isdir(history_dir):
+            self._set_meta("json_import", datetime.now().isoformat())
+            return 0
+
+        imported = 0
+        start = time.perf_counter()
+        for filename in sorted(os.listdir(history_dir)):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(history_dir, filename), 'r') as f:
+                    history_data = json.load(f)
+                entry_id = self.add(
+                    history_data.get("job_title", ""),
+                    history_data.get("company", ""),
+                    history_data.get("results", {}),
+                    timestamp=history_data.get("timestamp"),
+                    source=filename,
+                )
+                if entry_id is not None:
+                    imported += 1
+            except Exception as e:
+                logger.error(f"Error importing history file {filename}: {e}")
+
+        self._set_meta("json_import", datetime.now().isoformat())
+        if imported:
+            logger.info(f"Imported {imported} history files in {time.perf_counter() - start:.2f}s")
+        return imported
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        """Read a value from the meta table"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def _set_meta(self, key: str, value: str):
+        """Write a value to the meta table"""
+        conn = self._connect()
+        try:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            conn.commit()
+        finally:
+            conn.close()
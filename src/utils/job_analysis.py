@@ -0,0 +1,52 @@
+"""
+Structured job analysis passed between the Job Application Assistant tasks
+"""
+from typing import List
+
+from pydantic import BaseModel, Field
+
+class JobAnalysis(BaseModel):
+    """Compact, structured analysis of a job description
+
+    In structured-context mode the analysis task emits this object and the
+    resume, cover letter and interview tasks receive it as task context
+    instead of the raw job description.
+    """
+
+    job_title: str = Field(default="", description="Title of the role")
+    company: str = Field(default="", description="Hiring company, empty if not stated")
+    experience_level: str = Field(default="", description="Required seniority and years of experience")
+    key_skills: List[str] = Field(default_factory=list, description="Required technical and professional skills")
+    responsibilities: List[str] = Field(default_factory=list, description="Main responsibilities of the role")
+    nice_to_have: List[str] = Field(default_factory=list, description="Preferred but optional qualifications")
+    keywords: List[str] = Field(default_factory=list, description="Terms an ATS is likely to match on")
+    company_notes: str = Field(default="", description="Culture, mission or values mentioned in the posting")
+
+    def to_markdown(self) -> str:
+        """
+        Render the analysis as the Job Analysis section
+
+        Returns:
+            str: Markdown starting with the "# Job Analysis" header
+        """
+        lines = ["# Job Analysis", ""]
+        role = " at ".join(part for part in (self.job_title, self.company) if part)
+        if role:
+            lines.extend([f"**Role:** {role}", ""])
+        if self.experience_level:
+            lines.extend([f"**Experience level:** {self.experience_level}", ""])
+
+        for title, items in (
+            ("Key Skills", self.key_skills),
+            ("Main Responsibilities", self.responsibilities),
+            ("Nice to Have", self.nice_to_have),
+            ("ATS Keywords", self.keywords),
+        ):
+            if items:
+                lines.append(f"## {title}")
+                lines.extend(f"- {item}" for item in items)
+                lines.append("")
+
+        if self.company_notes:
+            lines.extend(["## About the Company", self.company_notes, ""])
+        return "\n".join(lines).strip()
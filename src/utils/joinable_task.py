@@ -0,0 +1,60 @@
+"""
+CrewAI task whose asynchronous runs can be waited for
+"""
+from concurrent.futures import Future, wait
+from typing import Any, Iterable, Optional
+
+from crewai import Task
+from pydantic import PrivateAttr
+
+class JoinableTask(Task):
+    """Task that keeps the future of its asynchronous run
+
+    CrewAI runs an async task on a daemon thread and resolves its future only
+    when the task succeeds; if the task raises, the crew waits on the future
+    forever. This task resolves the future with the exception as well, and
+    keeps it so a run that ended early (e.g. on RunCancelled from the final,
+    synchronous task) can wait for the tasks still running before the crew
+    and its LLMs are reused.
+    """
+
+    _future: Optional[Future] = PrivateAttr(default=None)
+
+    def execute_async(self, agent: Any = None, context: Optional[str] = None,
+                      tools: Optional[list] = None) -> Future:
+        self._future = super().execute_async(agent, context, tools)
+        return self._future
+
+    def _execute_task_async(self, agent: Any, context: Optional[str], tools: Optional[list],
+                            future: Future) -> None:
+        try:
+            result = self._execute_core(agent, context, tools)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the last asynchronous run of the task
+
+        Args:
+            timeout: Seconds to wait at most (None: until it finishes)
+
+        Returns:
+            bool: Whether the task is no longer running
+        """
+        return self._future is None or not wait([self._future], timeout).not_done
+
+def join_tasks(tasks: Iterable[Any], timeout: Optional[float] = None) -> bool:
+    """
+    Wait for the asynchronous runs of a crew's tasks
+
+    Args:
+        tasks: Tasks of the crew; tasks other than JoinableTasks are skipped
+        timeout: Seconds to wait at most for each task
+
+    Returns:
+        bool: Whether every task has finished
+    """
+    return all([task.join(timeout) for task in tasks if isinstance(task, JoinableTask)])
@@ -0,0 +1,475 @@
+"""
+Per-task run metrics for the Job Application Assistant and their export sinks
+"""
+import os
+import json
+import time
+import uuid
+import logging
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from .crew_events import RunObserver
+from .sections import TASK_SECTIONS
+from .model_routing import task_cascade
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Token usage counters read from an agent's LLM
+USAGE_FIELDS = ("prompt_tokens", "completion_tokens")
+
+# USD per million (prompt, completion) tokens; extend or override with the LLM_PRICES
+# environment variable, e.g. LLM_PRICES='{"gemini/gemini-2.5-pro": [1.25, 10.0]}'
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gemini/gemini-2.5-flash": (0.30, 2.50),
+    "gemini/gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini/gemini-2.5-pro": (1.25, 10.00),
+}
+try:
+    MODEL_PRICES.update({model: tuple(prices) for model, prices in json.loads(os.getenv("LLM_PRICES", "{}")).items()})
+except (ValueError, TypeError) as e:
+    logger.warning(f"Ignoring invalid LLM_PRICES: {str(e)}")
+
+def _timestamp(seconds: float) -> str:
+    """Format an epoch time as an ISO 8601 UTC timestamp"""
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).isoformat()
+
+def llm_model_name(llm) -> str:
+    """Return the model identifier of an LLM"""
+    return str(getattr(llm, 'model', None) or llm or "")
+
+def model_name(agent) -> str:
+    """Return the model identifier of an agent's LLM"""
+    return llm_model_name(getattr(agent, 'llm', None))
+
+def usage_snapshot(agent, llm: Optional[Any] = None) -> Dict[str, int]:
+    """
+    Read the cumulative token usage of an agent's LLM
+
+    Args:
+        agent: CrewAI agent
+        llm: LLM to read instead of the agent's current one (e.g. another model tier)
+
+    Returns:
+        Dict with prompt_tokens and completion_tokens (zero when unavailable)
+    """
+    summary = None
+    try:
+        if llm is None:
+            llm = getattr(agent, 'llm', None)
+        if hasattr(llm, 'get_token_usage_summary'):
+            summary = llm.get_token_usage_summary()
+        elif hasattr(agent, '_token_process'):
+            summary = agent._token_process.get_summary()
+    except Exception as e:
+        logger.debug(f"Token usage unavailable: {str(e)}")
+    return {field: int(getattr(summary, field, 0) or 0) for field in USAGE_FIELDS}
+
+def _retry_count(task) -> int:
+    """Return the number of guardrail retries CrewAI has counted for a task"""
+    return int(getattr(task, 'retry_count', 0) or 0)
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """
+    Estimate the cost of a number of tokens
+
+    Args:
+        model: Model identifier
+        prompt_tokens: Prompt tokens used
+        completion_tokens: Completion tokens used
+
+    Returns:
+        Cost in USD, or None if the model has no known price
+    """
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        return None
+    return round((prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000, 6)
+
+class RunMetrics(RunObserver):
+    """Collects a metrics record for each task of one crew run
+
+    Token counts are the difference of the agent LLM's cumulative usage
+    between the start and the end of a task, so agents must not be shared
+    with another run while this one is in progress. Tasks guarded by a
+    ModelCascade count the usage of every model tier and record the tier
+    that produced the output.
+    """
+
+    def __init__(self, tasks: Iterable[Any]):
+        """
+        Initialize the collector
+
+        Args:
+            tasks: CrewAI Task objects of the run
+        """
+        self.run_id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self.ended_at: Optional[float] = None
+        self.status = "running"
+        self._tasks = {task.name: task for task in tasks}
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._usage_start: Dict[str, List[Dict[str, int]]] = {}
+        # Guardrail retry count of each task when it started; CrewAI keeps counting across runs
+        self._retries_start: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _task_record(self, task_name: str) -> Dict[str, Any]:
+        """Return the record of a task, creating it on first use"""
+        record = self._records.get(task_name)
+        if record is None:
+            task = self._tasks.get(task_name)
+            agent = getattr(task, 'agent', None)
+            record = self._records[task_name] = {
+                "task": task_name,
+                "section": TASK_SECTIONS.get(task_name),
+                "agent": str(getattr(agent, 'role', '') or '').strip(),
+                "model": model_name(agent),
+                "status": "running",
+                "started_at": None,
+                "ended_at": None,
+                "duration_seconds": None,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "llm_calls": 0,
+                "tool_calls": 0,
+                "tool_errors": 0,
+                "retries": 0,
+                "tier": 0,
+                "escalations": 0,
+                "cost_usd": None,
+            }
+        return record
+
+    def _task_llms(self, task_name: str) -> Tuple[Any, List[Any]]:
+        """Return the agent of a task and every LLM it may use"""
+        task = self._tasks.get(task_name)
+        agent = getattr(task, 'agent', None)
+        cascade = task_cascade(task)
+        if cascade is not None:
+            return agent, cascade.llms
+        return agent, [getattr(agent, 'llm', None)]
+
+    def on_task_started(self, task_name: str):
+        agent, llms = self._task_llms(task_name)
+        usage = [usage_snapshot(agent, llm) for llm in llms]
+        retries = _retry_count(self._tasks.get(task_name))
+        with self._lock:
+            record = self._task_record(task_name)
+            # Guardrail retries restart the task; keep the first start
+            if record["started_at"] is None:
+                record["started_at"] = time.time()
+                self._usage_start[task_name] = usage
+                self._retries_start[task_name] = retries
+
+    def on_llm_call(self, task_name: str, failed: bool):
+        with self._lock:
+            record = self._task_record(task_name)
+            record["llm_calls"] += 1
+            if failed:
+                record["retries"] += 1
+
+    def on_tool_used(self, task_name: str, tool_name: str, failed: bool):
+        with self._lock:
+            record = self._task_record(task_name)
+            record["tool_calls"] += 1
+            if failed:
+                record["tool_errors"] += 1
+
+    def on_task_completed(self, task_name: str, output: Any):
+        self._finish_task(task_name, "completed")
+
+    def on_task_failed(self, task_name: str, error: str):
+        self._finish_task(task_name, "failed")
+
+    def _finish_task(self, task_name: str, status: str):
+        """Close the record of a task"""
+        task = self._tasks.get(task_name)
+        agent, llms = self._task_llms(task_name)
+        usage = [usage_snapshot(agent, llm) for llm in llms]
+        cascade = task_cascade(task)
+        served = cascade.served() if cascade is not None else {}
+        now = time.time()
+        with self._lock:
+            record = self._task_record(task_name)
+            start_usage = self._usage_start.get(task_name) or [{} for _ in llms]
+            # Usage per tier, so each model's tokens are priced at its own rate
+            costs = []
+            for field in USAGE_FIELDS:
+                record[field] = 0
+            for llm, end, start in zip(llms, usage, start_usage):
+                delta = {field: max(0, end[field] - start.get(field, 0)) for field in USAGE_FIELDS}
+                for field in USAGE_FIELDS:
+                    record[field] += delta[field]
+                if any(delta.values()):
+                    costs.append(estimate_cost(llm_model_name(llm), delta["prompt_tokens"], delta["completion_tokens"]))
+            record["model"] = model_name(agent) or record["model"]
+            record.update(served)
+            record["status"] = status
+            record["ended_at"] = now
+            if record["started_at"] is not None:
+                record["duration_seconds"] = round(now - record["started_at"], 4)
+            record["retries"] += max(0, _retry_count(task) - self._retries_start.get(task_name, 0))
+            if costs and None not in costs:
+                record["cost_usd"] = round(sum(costs), 6)
+            else:
+                record["cost_usd"] = estimate_cost(record["model"], record["prompt_tokens"], record["completion_tokens"])
+
+    def finish(self, status: str = "completed") -> Dict[str, Any]:
+        """
+        Close the run and build its metrics record
+
+        Args:
+            status: Final status of the run ("completed" or "failed")
+
+        Returns:
+            Dict with the run id, timing, per-task records and totals
+        """
+        self.ended_at = time.time()
+        self.status = status
+        return self.record()
+
+    def record(self) -> Dict[str, Any]:
+        """
+        Build the metrics record of the run so far
+
+        Returns:
+            Dict with the run id, timing, per-task records and totals
+        """
+        with self._lock:
+            tasks = []
+            for record in self._records.values():
+                record = dict(record)
+                for field in ("started_at", "ended_at"):
+                    if record[field] is not None:
+                        record[field] = _timestamp(record[field])
+                tasks.append(record)
+
+        costs = [task["cost_usd"] for task in tasks if task["cost_usd"] is not None]
+        timed = [task for task in tasks if task["duration_seconds"] is not None]
+        ended_at = self.ended_at or time.time()
+        return {
+            "run_id": self.run_id,
+            "status": self.status,
+            "started_at": _timestamp(self.started_at),
+            "ended_at": _timestamp(ended_at) if self.ended_at else None,
+            "duration_seconds": round(ended_at - self.started_at, 4),
+            "tasks": tasks,
+            "totals": {
+                "prompt_tokens": sum(task["prompt_tokens"] for task in tasks),
+                "completion_tokens": sum(task["completion_tokens"] for task in tasks),
+                "llm_calls": sum(task["llm_calls"] for task in tasks),
+                "tool_calls": sum(task["tool_calls"] for task in tasks),
+                "retries": sum(task["retries"] for task in tasks),
+                "escalations": sum(task.get("escalations", 0) for task in tasks),
+                "cost_usd": round(sum(costs), 6) if costs else None,
+                "slowest_task": max(timed, key=lambda task: task["duration_seconds"])["task"] if timed else None,
+            },
+        }
+
+def cached_run_record() -> Dict[str, Any]:
+    """Return the metrics record of a run answered from the result cache"""
+    now = _timestamp(time.time())
+    return {
+        "run_id": uuid.uuid4().hex,
+        "status": "cached",
+        "started_at": now,
+        "ended_at": now,
+        "duration_seconds": 0.0,
+        "tasks": [],
+        "totals": {"prompt_tokens": 0, "completion_tokens": 0, "llm_calls": 0,
+                   "tool_calls": 0, "retries": 0, "escalations": 0, "cost_usd": 0.0, "slowest_task": None},
+    }
+
+class MetricsSink:
+    """Destination for run metrics records"""
+
+    def emit(self, record: Dict[str, Any]):
+        """
+        Export one run record
+
+        Args:
+            record: Record built by RunMetrics
+        """
+        raise NotImplementedError
+
+class JsonlMetricsSink(MetricsSink):
+    """Appends every run record as one JSON line"""
+
+    def __init__(self, path: str = os.path.join("outputs", "metrics", "runs.jsonl")):
+        """
+        Initialize the sink
+
+        Args:
+            path: JSONL file the records are appended to
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, record: Dict[str, Any]):
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+class PrometheusMetricsSink(MetricsSink):
+    """Aggregates run records into Prometheus counters
+
+    The counters are kept in memory for the life of the process and written
+    in the Prometheus text exposition format to a file (for the node exporter
+    textfile collector), and can be rendered for an HTTP endpoint.
+    """
+
+    # Metric name, type and help text; task counters are labelled by task, agent and model
+    METRICS = {
+        "job_assistant_runs_total": ("counter", "Application runs by status"),
+        "job_assistant_task_duration_seconds_sum": ("counter", "Total task wall time"),
+        "job_assistant_task_duration_seconds_count": ("counter", "Number of timed tasks"),
+        "job_assistant_tokens_total": ("counter", "LLM tokens used by type"),
+        "job_assistant_llm_calls_total": ("counter", "LLM calls"),
+        "job_assistant_tool_calls_total": ("counter", "Tool calls"),
+        "job_assistant_retries_total": ("counter", "Failed LLM calls and guardrail retries"),
+        "job_assistant_model_escalations_total": ("counter", "Escalations to a stronger model tier"),
+        "job_assistant_cost_usd_total": ("counter", "Estimated LLM cost in USD"),
+        "job_assistant_input_tokens_saved_total": ("counter", "Prompt tokens saved by input compaction"),
+    }
+
+    def __init__(self, path: Optional[str] = os.path.join("outputs", "metrics", "metrics.prom")):
+        """
+        Initialize the sink
+
+        Args:
+            path: File rewritten after every record, or None to only keep the counters in memory
+        """
+        self.path = path
+        self._values: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, name: str, labels: Dict[str, str], value: float):
+        """Increment a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        self._values[key] = self._values.get(key, 0.0) + value
+
+    def emit(self, record: Dict[str, Any]):
+        with self._lock:
+            self._add("job_assistant_runs_total", {"status": record["status"]}, 1)
+            if record.get("compaction"):
+                self._add("job_assistant_input_tokens_saved_total", {}, record["compaction"]["tokens_saved"])
+            for task in record["tasks"]:
+                labels = {"task": task["task"], "agent": task["agent"], "model": task["model"]}
+                if task["duration_seconds"] is not None:
+                    self._add("job_assistant_task_duration_seconds_sum", labels, task["duration_seconds"])
+                    self._add("job_assistant_task_duration_seconds_count", labels, 1)
+                self._add("job_assistant_tokens_total", {**labels, "type": "prompt"}, task["prompt_tokens"])
+                self._add("job_assistant_tokens_total", {**labels, "type": "completion"}, task["completion_tokens"])
+                self._add("job_assistant_llm_calls_total", labels, task["llm_calls"])
+                self._add("job_assistant_tool_calls_total", labels, task["tool_calls"])
+                self._add("job_assistant_retries_total", labels, task["retries"])
+                self._add("job_assistant_model_escalations_total", labels, task.get("escalations", 0))
+                if task["cost_usd"] is not None:
+                    self._add("job_assistant_cost_usd_total", labels, task["cost_usd"])
+            text = self._render()
+        if self.path:
+            self._write(text)
+
+    def _render(self) -> str:
+        """Render the counters; the caller holds the lock"""
+        lines = []
+        for name, (metric_type, help_text) in self.METRICS.items():
+            samples = sorted((labels, value) for (metric, labels), value in self._values.items() if metric == name)
+            if not samples:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                label_text = ",".join(
+                    f'{key}="' + str(label).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+                    for key, label in labels
+                )
+                lines.append(f"{name}{{{label_text}}} {value:g}" if label_text else f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def render(self) -> str:
+        """
+        Render the counters in the Prometheus text exposition format
+
+        Returns:
+            str: Exposition text, e.g. for a /metrics endpoint
+        """
+        with self._lock:
+            return self._render()
+
+    def _write(self, text: str):
+        """Replace the metrics file atomically so scrapers never read a partial file"""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, self.path)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+
+class MetricsExporter:
+    """Sends run records to every configured sink"""
+
+    def __init__(self, sinks: Optional[List[MetricsSink]] = None):
+        """
+        Initialize the exporter
+
+        Args:
+            sinks: Sinks receiving every record
+        """
+        self.sinks = list(sinks or [])
+
+    def add_sink(self, sink: MetricsSink):
+        """Register an additional sink"""
+        self.sinks.append(sink)
+
+    def sink(self, sink_type: type) -> Optional[MetricsSink]:
+        """Return the first registered sink of a type"""
+        return next((sink for sink in self.sinks if isinstance(sink, sink_type)), None)
+
+    def export(self, record: Dict[str, Any]):
+        """
+        Export a record; sink errors are logged and never raised
+
+        Args:
+            record: Record built by RunMetrics
+        """
+        for sink in self.sinks:
+            try:
+                sink.emit(record)
+            except Exception as e:
+                logger.error(f"Error exporting metrics to {type(sink).__name__}: {str(e)}")
+
+def sinks_from_env() -> List[MetricsSink]:
+    """
+    Build the sinks named by the METRICS_SINKS environment variable
+
+    METRICS_SINKS is a comma-separated list of "jsonl" and "prometheus"
+    (default: both; empty disables export). Files go to METRICS_DIR.
+
+    Returns:
+        List of sinks
+    """
+    directory = os.getenv("METRICS_DIR", os.path.join("outputs", "metrics"))
+    sinks: List[MetricsSink] = []
+    for name in os.getenv("METRICS_SINKS", "jsonl,prometheus").split(","):
+        name = name.strip().lower()
+        if name == "jsonl":
+            sinks.append(JsonlMetricsSink(os.path.join(directory, "runs.jsonl")))
+        elif name == "prometheus":
+            sinks.append(PrometheusMetricsSink(os.path.join(directory, "metrics.prom")))
+        elif name:
+            logger.warning(f"Unknown metrics sink '{name}'")
+    return sinks
+
+# Shared exporter for the process
+metrics_exporter = MetricsExporter(sinks_from_env())
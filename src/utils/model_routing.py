@@ -0,0 +1,148 @@
+"""
+Per-agent model tiers for the Job Application Assistant
+
+Each agent in agents.yaml can list several models under llm_tiers, cheapest
+and fastest first, and a per-call latency budget under llm_timeout. A task
+starts on the first tier and its ModelCascade guardrail moves the agent to
+the next tier only when the output fails validation.
+"""
+import logging
+import threading
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from .sections import SECTION_HEADERS, section_of, task_output_text
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# agents.yaml keys handled here rather than by CrewAI's Agent
+ROUTING_KEYS = ("llm_tiers", "llm_timeout")
+
+def agent_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Return an agent config without the model routing keys"""
+    return {key: value for key, value in config.items() if key not in ROUTING_KEYS}
+
+def model_tiers(config: Dict[str, Any]) -> List[str]:
+    """
+    Return the models an agent may use, in escalation order
+
+    Args:
+        config: Agent entry of agents.yaml
+
+    Returns:
+        List of model identifiers; just the llm entry when no tiers are configured
+    """
+    tiers = config.get("llm_tiers") or [config.get("llm")]
+    return [str(model) for model in tiers if model]
+
+def llm_timeout(config: Dict[str, Any]) -> Optional[float]:
+    """Return the per-call latency budget of an agent in seconds, if any"""
+    timeout = config.get("llm_timeout")
+    return float(timeout) if timeout else None
+
+def section_validator(section: str) -> Callable[[Any], Optional[str]]:
+    """
+    Build a validator checking that a task output is the expected section
+
+    Args:
+        section: Section key from TASK_SECTIONS
+
+    Returns:
+        Function taking a TaskOutput and returning None when it is valid, or
+        the reason it is not
+    """
+    header = f"# {SECTION_HEADERS[section]}"
+
+    def validate(output: Any) -> Optional[str]:
+        text = task_output_text(output)
+        if not text:
+            return "The output is empty"
+        if section_of(text) != section:
+            return f'The output does not start with the header "{header}"'
+        return None
+
+    return validate
+
+class ModelCascade:
+    """Task guardrail that escalates an agent to its next model tier
+
+    Every run starts on the first (cheapest) tier. When an output fails
+    validation the agent's LLM is replaced by the next tier and the guardrail
+    asks CrewAI to run the task again; once the last tier has answered its
+    output is accepted as is, so the run never fails on validation alone.
+
+    The task's guardrail is the bound check method rather than the cascade
+    itself: CrewAI reads the source of guardrail callables for its events,
+    which only works for functions and methods (see task_cascade).
+    """
+
+    def __init__(self, task_name: str, agent, llms: List[Any], validator: Callable[[Any], Optional[str]]):
+        """
+        Initialize the cascade
+
+        Args:
+            task_name: Name of the guarded task
+            agent: CrewAI agent executing the task
+            llms: LLM of each tier, in escalation order
+            validator: Function returning None for valid output, else the reason it is invalid
+        """
+        self.task_name = task_name
+        self.agent = agent
+        self.llms = list(llms)
+        self.validator = validator
+        self.tier = 0
+        self.escalations = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_retries(self) -> int:
+        """Guardrail retries needed to reach the last tier"""
+        return max(0, len(self.llms) - 1)
+
+    @property
+    def model(self) -> str:
+        """Model identifier of the current tier"""
+        llm = self.llms[self.tier]
+        return str(getattr(llm, 'model', None) or llm)
+
+    def reset(self):
+        """Put the agent back on the first tier before a new run"""
+        with self._lock:
+            self.tier = 0
+            self.escalations = 0
+            self.agent.llm = self.llms[0]
+
+    def served(self) -> Dict[str, Any]:
+        """Return the tier that produced the task's output, for the metrics record"""
+        with self._lock:
+            return {"tier": self.tier, "model": self.model, "escalations": self.escalations}
+
+    def check(self, output: Any) -> Tuple[bool, Any]:
+        """
+        Validate a task output, escalating to the next tier when it is invalid
+
+        Args:
+            output: TaskOutput of the current tier
+
+        Returns:
+            (True, output) to accept it, or (False, feedback) to run the task again
+        """
+        problem = self.validator(output)
+        if problem is None:
+            return (True, output)
+
+        with self._lock:
+            if self.tier + 1 >= len(self.llms):
+                logger.warning(f"{self.task_name}: {problem} on the last model tier ({self.model}); keeping the output")
+                return (True, output)
+            previous = self.model
+            self.tier += 1
+            self.escalations += 1
+            self.agent.llm = self.llms[self.tier]
+            logger.info(f"{self.task_name}: {problem} from {previous}; escalating to {self.model}")
+        return (False, f"{problem}. Follow the task instructions exactly.")
+
+def task_cascade(task) -> Optional[ModelCascade]:
+    """Return the ModelCascade guarding a task, if any"""
+    cascade = getattr(getattr(task, 'guardrail', None), '__self__', None)
+    return cascade if isinstance(cascade, ModelCascade) else None
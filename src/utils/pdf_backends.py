@@ -0,0 +1,156 @@
+"""
+Pluggable PDF text extraction backends for the Job Application Assistant
+"""
+import os
+import logging
+from typing import Any, Dict, List, Optional, Type
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class PDFBackend:
+    """Interface for PDF text extraction libraries
+
+    Backends import their library lazily, so a missing library only matters
+    when that backend is selected.
+    """
+
+    name = ""
+    module = ""
+    package = ""
+
+    @classmethod
+    def available(cls) -> bool:
+        """Return whether the library behind this backend can be imported"""
+        try:
+            __import__(cls.module)
+            return True
+        except ImportError:
+            return False
+
+    def open(self, source) -> Any:
+        """
+        Open a PDF document
+
+        Args:
+            source: Seekable binary file object, memory map or path
+
+        Returns:
+            Backend-specific document handle
+        """
+        raise NotImplementedError
+
+    def page_count(self, document) -> int:
+        """Return the number of pages of an opened document"""
+        raise NotImplementedError
+
+    def extract_pages(self, document, start: int, end: int) -> List[str]:
+        """
+        Extract the text of a range of pages
+
+        Args:
+            document: Handle returned by open
+            start: First page index
+            end: Page index after the last page
+
+        Returns:
+            List of page texts (empty strings for pages without text)
+        """
+        raise NotImplementedError
+
+class PyPDF2Backend(PDFBackend):
+    """Backend using PyPDF2"""
+
+    name = "pypdf2"
+    module = "PyPDF2"
+    package = "PyPDF2"
+
+    def open(self, source):
+        from PyPDF2 import PdfReader
+        return PdfReader(source)
+
+    def page_count(self, document) -> int:
+        return len(document.pages)
+
+    def extract_pages(self, document, start: int, end: int) -> List[str]:
+        return [document.pages[index].extract_text() or "" for index in range(start, end)]
+
+class PypdfBackend(PyPDF2Backend):
+    """Backend using pypdf, the maintained successor of PyPDF2"""
+
+    name = "pypdf"
+    module = "pypdf"
+    package = "pypdf"
+
+    def open(self, source):
+        from pypdf import PdfReader
+        return PdfReader(source)
+
+class PdfMinerBackend(PDFBackend):
+    """Backend using pdfminer.six, slower but more faithful on complex layouts"""
+
+    name = "pdfminer"
+    module = "pdfminer"
+    package = "pdfminer.six"
+
+    def open(self, source):
+        # pdfminer parses lazily from the source, so the handle is the source itself
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return source
+
+    def page_count(self, document) -> int:
+        from pdfminer.pdfpage import PDFPage
+        if hasattr(document, 'seek'):
+            document.seek(0)
+        if isinstance(document, str):
+            with open(document, 'rb') as f:
+                return sum(1 for _ in PDFPage.get_pages(f))
+        return sum(1 for _ in PDFPage.get_pages(document))
+
+    def extract_pages(self, document, start: int, end: int) -> List[str]:
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+        if hasattr(document, 'seek'):
+            document.seek(0)
+        return [
+            "".join(element.get_text() for element in page_layout if isinstance(element, LTTextContainer))
+            for page_layout in extract_pages(document, page_numbers=range(start, end))
+        ]
+
+# Registered backends by name
+BACKENDS: Dict[str, Type[PDFBackend]] = {
+    backend.name: backend for backend in (PypdfBackend, PyPDF2Backend, PdfMinerBackend)
+}
+
+# Order in which backends are tried when the preferred one is missing
+DEFAULT_BACKEND_ORDER = ["pypdf", "pypdf2", "pdfminer"]
+
+def get_backend(name: Optional[str] = None) -> PDFBackend:
+    """
+    Return a PDF backend, falling back to the next available one
+
+    Args:
+        name: Preferred backend (defaults to the PDF_BACKEND environment variable)
+
+    Returns:
+        PDFBackend instance
+
+    Raises:
+        ImportError: If none of the backend libraries is installed
+    """
+    name = (name or os.getenv("PDF_BACKEND", "")).strip().lower()
+    if name and name not in BACKENDS:
+        logger.warning(f"Unknown PDF backend '{name}'; choose from {', '.join(BACKENDS)}")
+
+    order = ([name] if name in BACKENDS else []) + [other for other in DEFAULT_BACKEND_ORDER if other != name]
+    for candidate in order:
+        if BACKENDS[candidate].available():
+            if name and candidate != name:
+                logger.warning(f"PDF backend '{name}' is not installed; using '{candidate}'")
+            return BACKENDS[candidate]()
+
+    raise ImportError(
+        "A PDF library is required for PDF processing. Please install one using: "
+        "pip install pypdf (or PyPDF2, or pdfminer.six)"
+    )
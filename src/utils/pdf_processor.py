@@ -3,47 +3,254 @@ PDF Processing utility for the Job Application Assistant
 """
 import os
 import io
+import mmap
+import hashlib
 import logging
-from typing import Optional, BinaryIO
-
-# Importing PyPDF2 for PDF processing
-try:
-    from PyPDF2 import PdfReader
-except ImportError:
-    # Provide helpful error message if PyPDF2 is not installed
-    raise ImportError(
-        "PyPDF2 is required for PDF processing. Please install it using: pip install PyPDF2"
-    )
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional, BinaryIO, Iterator, List
+from .result_cache import ResultCache
+from .pdf_backends import PDFBackend, get_backend
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Limits for uploaded PDFs; override with environment variables
+MAX_PDF_BYTES = int(os.getenv("PDF_MAX_BYTES", str(20 * 1024 * 1024)))
+MAX_PDF_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+# Worker processes used for page extraction, and the page count from which they pay off
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+
+# On-disk cache of extracted text keyed by a hash of the PDF bytes, so the same
+# resume uploaded again is never parsed twice
+text_cache = ResultCache(
+    os.path.join("outputs", "cache", "pdf_text.sqlite"),
+    max_entries=int(os.getenv("PDF_TEXT_CACHE_ENTRIES", "2000")),
+    max_age=None,
+    max_bytes=int(os.getenv("PDF_TEXT_CACHE_BYTES", str(64 * 1024 * 1024))),
+)
+
+# Worker processes shared by every extraction, created on first use. They are
+# started with forkserver or spawn, since forking a threaded server (Streamlit,
+# the HTTP service) can copy held locks into the child
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_lock = threading.Lock()
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    """Return the shared page extraction pool, creating it on first use"""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _page_pool = ProcessPoolExecutor(max_workers=max(1, PDF_WORKERS),
+                                             mp_context=multiprocessing.get_context(start_method))
+        return _page_pool
+
+def _discard_page_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next extraction starts a new one"""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is pool:
+            _page_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+class PDFTooLargeError(ValueError):
+    """Raised when a PDF exceeds the configured size limit"""
+
+def _extract_page_range(path: str, start: int, end: int, backend_name: str) -> List[str]:
+    """
+    Extract the text of a range of pages in a worker process
+
+    The file is memory-mapped, so workers share the page cache instead of each
+    reading their own copy of the PDF.
+
+    Args:
+        path: Path of the PDF file
+        start: First page index
+        end: Page index after the last page
+        backend_name: Name of the PDF backend to use
+
+    Returns:
+        List of page texts
+    """
+    backend = get_backend(backend_name)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return backend.extract_pages(backend.open(mapped), start, end)
+
 class PDFProcessor:
     """Utility for processing PDF resume files"""
-    
+
+    @staticmethod
+    def _pdf_size(file: BinaryIO) -> int:
+        """Return the size of a PDF file object in bytes without reading it"""
+        if hasattr(file, 'getbuffer'):
+            return file.getbuffer().nbytes
+        position = file.tell()
+        size = file.seek(0, io.SEEK_END)
+        file.seek(position)
+        return size
+
+    @staticmethod
+    def _check_size(file: BinaryIO, max_bytes: int):
+        """Raise PDFTooLargeError if the file is larger than max_bytes"""
+        size = PDFProcessor._pdf_size(file)
+        if size > max_bytes:
+            raise PDFTooLargeError(f"PDF is {size / 1024 / 1024:.1f} MB; the limit is {max_bytes / 1024 / 1024:.1f} MB.")
+
+    @staticmethod
+    def content_hash(file: BinaryIO) -> str:
+        """
+        Hash the bytes of a PDF file object
+
+        Args:
+            file: PDF file object
+
+        Returns:
+            str: SHA-256 hex digest of the file content
+        """
+        if hasattr(file, 'getbuffer'):
+            return hashlib.sha256(file.getbuffer()).hexdigest()
+        digest = hashlib.sha256()
+        file.seek(0)
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+        file.seek(0)
+        return digest.hexdigest()
+
     @staticmethod
-    def extract_text_from_pdf(file: BinaryIO) -> Optional[str]:
+    def cache_stats() -> Dict[str, Any]:
+        """Return hit/miss statistics of the extracted text cache"""
+        return text_cache.stats()
+
+    @staticmethod
+    def iter_pages(file: BinaryIO, max_pages: Optional[int] = None, max_bytes: Optional[int] = None,
+                   workers: Optional[int] = None, backend: Optional[PDFBackend] = None) -> Iterator[str]:
+        """
+        Extract the text of a PDF page by page
+
+        The PDF is read from the uploaded buffer itself rather than a copy. Long
+        documents are split into page ranges extracted in the shared worker
+        processes; pages are still yielded in order. Extraction stops after
+        max_pages pages, and remaining work is cancelled if the caller stops
+        iterating early.
+
+        Args:
+            file: PDF file object (file upload from Streamlit or an open binary file)
+            max_pages: Maximum number of pages extracted (defaults to PDF_MAX_PAGES)
+            max_bytes: Maximum accepted file size (defaults to PDF_MAX_BYTES)
+            workers: Number of page ranges extracted in parallel (defaults to
+                PDF_WORKERS, the size of the worker pool; 1 disables the workers)
+            backend: PDF backend (defaults to the one selected by PDF_BACKEND)
+
+        Yields:
+            str: Text of each page (empty for pages without text)
+
+        Raises:
+            PDFTooLargeError: If the file is larger than max_bytes
+        """
+        max_pages = MAX_PDF_PAGES if max_pages is None else max_pages
+        max_bytes = MAX_PDF_BYTES if max_bytes is None else max_bytes
+        workers = PDF_WORKERS if workers is None else workers
+        backend = backend or get_backend()
+
+        PDFProcessor._check_size(file, max_bytes)
+
+        file.seek(0)
+        document = backend.open(file)
+        page_count = backend.page_count(document)
+        if page_count > max_pages:
+            logger.warning(f"PDF has {page_count} pages; only the first {max_pages} are extracted")
+            page_count = max_pages
+
+        if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+            for index in range(page_count):
+                yield from backend.extract_pages(document, index, index + 1)
+            return
+
+        # The workers parse the file themselves; drop this process's copy first
+        del document
+        yield from PDFProcessor._iter_pages_parallel(file, page_count, workers, backend)
+
+    @staticmethod
+    def _iter_pages_parallel(file: BinaryIO, page_count: int, workers: int, backend: PDFBackend) -> Iterator[str]:
+        """Extract page ranges in worker processes and yield the pages in order"""
+        path = getattr(file, 'name', None)
+        temp_path = None
+        if not (isinstance(path, str) and os.path.isfile(path)):
+            # In-memory upload: hand the workers a temp file written straight from the buffer
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
+                if hasattr(file, 'getbuffer'):
+                    temp_file.write(file.getbuffer())
+                else:
+                    file.seek(0)
+                    temp_file.write(file.read())
+                temp_path = path = temp_file.name
+
+        chunk_size = max(1, -(-page_count // workers))
+        pool = _get_page_pool()
+        futures = []
+        try:
+            futures = [
+                pool.submit(_extract_page_range, path, start, min(start + chunk_size, page_count), backend.name)
+                for start in range(0, page_count, chunk_size)
+            ]
+            for future in futures:
+                yield from future.result()
+        except BrokenProcessPool:
+            _discard_page_pool(pool)
+            raise
+        finally:
+            # Stopped early or failed: skip the ranges no worker has started, and
+            # wait for the running ones so the temp file outlives its readers
+            for future in futures:
+                future.cancel()
+            if temp_path:
+                wait(futures)
+                os.unlink(temp_path)
+
+    @staticmethod
+    def extract_text_from_pdf(file: BinaryIO, max_pages: Optional[int] = None,
+                              max_bytes: Optional[int] = None, use_cache: bool = True) -> Optional[str]:
         """
         Extract text content from a PDF file
-        
+
         Args:
             file: PDF file object (file upload from Streamlit)
-            
+            max_pages: Maximum number of pages extracted (defaults to PDF_MAX_PAGES)
+            max_bytes: Maximum accepted file size (defaults to PDF_MAX_BYTES)
+            use_cache: Reuse text previously extracted from the same bytes
+
         Returns:
             str: Extracted text or None if extraction failed
+
+        Raises:
+            PDFTooLargeError: If the file is larger than max_bytes
         """
+        max_pages = MAX_PDF_PAGES if max_pages is None else max_pages
+        max_bytes = MAX_PDF_BYTES if max_bytes is None else max_bytes
         try:
-            # Read the PDF file
-            pdf_reader = PdfReader(io.BytesIO(file.getvalue()))
-            
-            # Extract text from each page
-            text = ""
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n\n"
+            backend = get_backend()
+            key = None
+            if use_cache:
+                PDFProcessor._check_size(file, max_bytes)
+                # The page cap and the backend change the extracted text, so they are part of the key
+                key = f"{PDFProcessor.content_hash(file)}:{max_pages}:{backend.name}"
+                cached = text_cache.get(key)
+                if cached is not None:
+                    logger.info(f"Extracted PDF text served from cache ({text_cache.stats()})")
+                    return cached
             
+            pages = PDFProcessor.iter_pages(file, max_pages=max_pages, max_bytes=max_bytes, backend=backend)
+            text = "".join(f"{page_text}\n\n" for page_text in pages if page_text)
+            if key and text:
+                text_cache.put(key, text)
             return text
+        except PDFTooLargeError:
+            raise
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {str(e)}")
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,353 @@
+"""
+Shared rate limiting and retries for LLM and search calls
+
+Every worker thread and process of the Job Application Assistant draws from
+the same token buckets, one per provider and API key, kept in a small SQLite
+database. The buckets use the generic cell rate algorithm: each call reserves
+the next free slot and sleeps until it, so callers are spaced evenly at the
+quota instead of all retrying at once. A 429 answer pushes the whole bucket
+back by its Retry-After delay, and failed calls are retried with jittered
+exponential backoff.
+"""
+import os
+import re
+import json
+import time
+import random
+import sqlite3
+import hashlib
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Callable, Optional, Tuple, TypeVar
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Calls per second and burst size per provider; extend or override with the RATE_LIMITS
+# environment variable, e.g. RATE_LIMITS='{"gemini": [4, 8], "serper": [10, 20]}'.
+# Providers without a limit are only retried, never throttled.
+RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "gemini": (2.0, 5),
+    "serper": (5.0, 10),
+}
+try:
+    RATE_LIMITS.update({provider: (float(limit[0]), int(limit[1]))
+                        for provider, limit in json.loads(os.getenv("RATE_LIMITS", "{}")).items()})
+except (ValueError, TypeError, IndexError) as e:
+    logger.warning(f"Ignoring invalid RATE_LIMITS: {str(e)}")
+
+# Environment variables holding each provider's API key
+API_KEY_VARIABLES = {
+    "gemini": ("GEMINI_API_KEY", "GOOGLE_API_KEY"),
+    "openai": ("OPENAI_API_KEY",),
+    "anthropic": ("ANTHROPIC_API_KEY",),
+    "serper": ("SERPER_API_KEY",),
+}
+
+# HTTP statuses and exception class names worth retrying
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+RETRY_ERRORS = {
+    "RateLimitError", "Timeout", "APITimeoutError", "ReadTimeout", "ConnectTimeout",
+    "APIConnectionError", "ConnectionError", "ServiceUnavailableError", "InternalServerError",
+}
+
+# Retry hint in error messages of providers that do not send a Retry-After header
+_RETRY_DELAY = re.compile(r"(?:retryDelay\"?\s*:\s*\"?|retry in\s+)(\d+(?:\.\d+)?)\s*s", re.IGNORECASE)
+
+def provider_of(model: str) -> str:
+    """Return the provider prefix of a model identifier (e.g. "gemini")"""
+    return model.split("/", 1)[0].lower() if "/" in model else "openai"
+
+def bucket_key(provider: str, api_key: Optional[str] = None) -> str:
+    """
+    Build the bucket name of a provider and API key
+
+    Args:
+        provider: Provider name
+        api_key: API key, defaults to the provider's environment variable
+
+    Returns:
+        str: Bucket name; the key itself is only stored as a short hash
+    """
+    if api_key is None:
+        api_key = next((os.getenv(name) for name in API_KEY_VARIABLES.get(provider, ()) if os.getenv(name)), "")
+    digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12] if api_key else "default"
+    return f"{provider}:{digest}"
+
+def status_code(error: BaseException) -> Optional[int]:
+    """Return the HTTP status of a provider error, if it has one"""
+    status = getattr(error, 'status_code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    Read the delay a provider asked for before the next call
+
+    Args:
+        error: Exception raised by the provider client
+
+    Returns:
+        Seconds from the Retry-After header or the error message, or None
+    """
+    headers = (getattr(getattr(error, 'response', None), 'headers', None)
+               or getattr(error, 'litellm_response_headers', None) or getattr(error, 'headers', None))
+    value = None
+    if headers:
+        try:
+            value = headers.get("retry-after") or headers.get("Retry-After")
+        except AttributeError:
+            value = None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    match = _RETRY_DELAY.search(str(error))
+    return float(match.group(1)) if match else None
+
+class RunCancelled(Exception):
+    """Raised instead of making a provider call once the run has been cancelled"""
+
+def _wait(seconds: float, cancel_event: Optional[threading.Event] = None):
+    """Sleep, returning early and raising RunCancelled if the run is cancelled meanwhile"""
+    if cancel_event is None:
+        time.sleep(seconds)
+    elif cancel_event.wait(seconds):
+        raise RunCancelled("The run was cancelled")
+
+def is_retryable(error: BaseException) -> bool:
+    """Return whether an error is a rate limit, timeout or transient server failure"""
+    if status_code(error) in RETRY_STATUSES:
+        return True
+    return any(cls.__name__ in RETRY_ERRORS for cls in type(error).__mro__)
+
+class RateLimiter:
+    """Token buckets shared by every thread and process using the same database
+
+    Each bucket stores only its theoretical arrival time (TAT): the time the
+    next call would be due if calls arrived at exactly the configured rate. A
+    call may start once it is no more than the burst allowance ahead of it.
+    """
+
+    def __init__(self, path: str = os.path.join("outputs", "cache", "rate_limits.sqlite"),
+                 limits: Optional[Dict[str, Tuple[float, int]]] = None, enabled: bool = True):
+        """
+        Initialize the limiter
+
+        Args:
+            path: Location of the SQLite database shared by the processes
+            limits: Calls per second and burst size per provider (defaults to RATE_LIMITS)
+            enabled: Never wait when False
+        """
+        self.path = path
+        self.limits = dict(RATE_LIMITS if limits is None else limits)
+        self.enabled = enabled
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the database on first use"""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        if not self._initialized:
+            conn.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tat REAL NOT NULL)")
+            self._initialized = True
+        return conn
+
+    def _limit(self, key: str) -> Optional[Tuple[float, int]]:
+        """Return (rate, burst) of a bucket, or None if its provider is unlimited"""
+        return self.limits.get(key.split(":", 1)[0]) if self.enabled else None
+
+    def _update(self, key: str, schedule: Callable[[float, float], Tuple[float, float]]) -> float:
+        """
+        Atomically read and replace the TAT of a bucket
+
+        Args:
+            key: Bucket name
+            schedule: Function of (stored TAT, now) returning (new TAT, seconds to wait)
+
+        Returns:
+            Seconds to wait (0 when the database is unavailable)
+        """
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT tat FROM buckets WHERE key = ?", (key,)).fetchone()
+                # Wall-clock time, since monotonic clocks are not comparable across processes
+                now = time.time()
+                tat, wait = schedule(row[0] if row else now, now)
+                conn.execute("INSERT OR REPLACE INTO buckets (key, tat) VALUES (?, ?)", (key, tat))
+                conn.execute("COMMIT")
+                return wait
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error updating rate limit bucket {key}: {str(e)}")
+            return 0.0
+
+    def acquire(self, key: str, cancel_event: Optional[threading.Event] = None) -> float:
+        """
+        Reserve the next call slot of a bucket and sleep until it
+
+        Args:
+            key: Bucket name from bucket_key
+            cancel_event: Event that ends the wait with RunCancelled when set
+
+        Returns:
+            float: Seconds waited
+        """
+        limit = self._limit(key)
+        if limit is None:
+            return 0.0
+        interval = 1.0 / limit[0]
+        tolerance = interval * (max(1, limit[1]) - 1)
+
+        def reserve(tat: float, now: float) -> Tuple[float, float]:
+            tat = max(tat, now)
+            return tat + interval, max(0.0, tat - tolerance - now)
+
+        wait = self._update(key, reserve)
+        if wait > 0:
+            with self._lock:
+                self.waits += 1
+                self.wait_seconds += wait
+            _wait(wait, cancel_event)
+        return wait
+
+    def penalize(self, key: str, delay: float) -> bool:
+        """
+        Hold every caller of a bucket back after the provider returned 429
+
+        Args:
+            key: Bucket name
+            delay: Seconds before the next call may start
+
+        Returns:
+            bool: Whether the bucket was pushed back (False for unlimited providers)
+        """
+        limit = self._limit(key)
+        if limit is None:
+            return False
+        interval = 1.0 / limit[0]
+        tolerance = interval * (max(1, limit[1]) - 1)
+        self._update(key, lambda tat, now: (max(tat, now + delay + tolerance), 0.0))
+        return True
+
+    def clear(self):
+        """Reset every bucket"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM buckets")
+            finally:
+                conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return throttling counters for this process
+
+        Returns:
+            Dict with the number of calls that waited and the total wait in seconds
+        """
+        with self._lock:
+            return {"waits": self.waits, "wait_seconds": round(self.wait_seconds, 3)}
+
+class RetryPolicy:
+    """Jittered exponential backoff for rate-limited and transient failures"""
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        """
+        Initialize the policy
+
+        Args:
+            max_attempts: Attempts per call, including the first
+            base_delay: Backoff ceiling of the first retry in seconds
+            max_delay: Largest backoff ceiling in seconds
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, error: BaseException) -> float:
+        """
+        Seconds to wait before retrying
+
+        Uses "full jitter": a random delay up to the exponential ceiling, so
+        callers that failed together do not retry together. A Retry-After
+        from the provider is a lower bound.
+
+        Args:
+            attempt: Number of the attempt that failed, starting at 1
+            error: The error it raised
+
+        Returns:
+            float: Seconds to wait
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        backoff = random.uniform(0, ceiling)
+        hinted = retry_after(error)
+        return max(backoff, min(hinted, self.max_delay)) if hinted is not None else backoff
+
+def call_with_retry(function: Callable[[], T], key: str, limiter: Optional["RateLimiter"] = None,
+                    policy: Optional[RetryPolicy] = None, description: str = "call",
+                    cancel_event: Optional[threading.Event] = None) -> T:
+    """
+    Run a provider call under the shared rate limit, retrying transient failures
+
+    Args:
+        function: The call to make
+        key: Bucket name from bucket_key
+        limiter: Limiter to draw from (defaults to the shared rate_limiter)
+        policy: Retry policy (defaults to the shared retry_policy)
+        description: What is being called, for log messages
+        cancel_event: Event that, once set, stops the call from being made or
+            retried by raising RunCancelled
+
+    Returns:
+        The result of the call
+    """
+    limiter = limiter or rate_limiter
+    policy = policy or retry_policy
+    attempt = 0
+    while True:
+        attempt += 1
+        if cancel_event is not None and cancel_event.is_set():
+            raise RunCancelled("The run was cancelled")
+        limiter.acquire(key, cancel_event)
+        try:
+            return function()
+        except Exception as e:
+            if attempt >= policy.max_attempts or not is_retryable(e):
+                raise
+            delay = policy.delay(attempt, e)
+            logger.warning(f"{description} failed ({type(e).__name__}); retry {attempt} of "
+                           f"{policy.max_attempts - 1} in {delay:.1f}s")
+            rate_limited = status_code(e) == 429 or type(e).__name__ == "RateLimitError"
+            # A 429 pushes the shared bucket back, so every worker (this one
+            # included, in acquire) waits out the delay instead of retrying at once
+            if not (rate_limited and limiter.penalize(key, delay)):
+                _wait(delay, cancel_event)
+
+# Shared limiter and retry policy configured from the environment (RATE_LIMIT=0 disables throttling)
+rate_limiter = RateLimiter(
+    os.getenv("RATE_LIMIT_DB", os.path.join("outputs", "cache", "rate_limits.sqlite")),
+    enabled=os.getenv("RATE_LIMIT", "1").lower() not in ("0", "false", "no"),
+)
+retry_policy = RetryPolicy(
+    max_attempts=int(os.getenv("RETRY_MAX_ATTEMPTS", "5")),
+    base_delay=float(os.getenv("RETRY_BASE_DELAY", "1.0")),
+    max_delay=float(os.getenv("RETRY_MAX_DELAY", "60.0")),
+)
@@ -0,0 +1,29 @@
+"""
+CrewAI LLM drawing from the shared rate limiter
+"""
+import threading
+from typing import Any, Optional
+
+from crewai import LLM
+
+from .rate_limit import bucket_key, call_with_retry, provider_of
+
+class RateLimitedLLM(LLM):
+    """LLM whose calls wait for the provider's shared token bucket
+
+    Calls are throttled per provider and API key across every thread and
+    process, and rate-limited or transient failures are retried with jittered
+    backoff (see rate_limit.call_with_retry). Setting cancel_event makes every
+    further call, and every wait for one, raise RunCancelled, which aborts the
+    crew run without spending more quota.
+    """
+
+    # Event of the run currently using this LLM, set by JobApplicationAssistant
+    cancel_event: Optional[threading.Event] = None
+
+    def call(self, *args, **kwargs) -> Any:
+        key = bucket_key(provider_of(str(self.model)), getattr(self, 'api_key', None))
+        return call_with_retry(
+            lambda: super(RateLimitedLLM, self).call(*args, **kwargs), key,
+            description=f"LLM call to {self.model}", cancel_event=self.cancel_event,
+        )
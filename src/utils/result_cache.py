@@ -0,0 +1,183 @@
+"""
+Persistent result cache for the Job Application Assistant
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before hashing so whitespace-only differences hit the same entry
+
+    Args:
+        text: Raw input text
+
+    Returns:
+        str: Text with all whitespace runs collapsed to single spaces
+    """
+    return " ".join(text.split())
+
+def hash_text(text: str) -> str:
+    """Return the SHA-256 hex digest of a string"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class ResultCache:
+    """SQLite-backed key/value cache with size and age eviction"""
+
+    def __init__(self, path: str = os.path.join("outputs", "cache", "results.sqlite"),
+                 max_entries: int = 500, max_age: Optional[float] = 7 * 24 * 3600,
+                 max_bytes: Optional[int] = None):
+        """
+        Initialize the cache
+
+        Args:
+            path: Location of the SQLite database file
+            max_entries: Maximum number of entries kept; least recently used go first
+            max_age: Maximum age of an entry in seconds, or None to never expire
+            max_bytes: Maximum total size of the stored values, or None for no limit
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the database on first use"""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL, "
+                "size INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None on a miss or an expired entry
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                try:
+                    row = conn.execute(
+                        "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row and self.max_age is not None and now - row[1] > self.max_age:
+                        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                        conn.commit()
+                        self.evictions += 1
+                        row = None
+                    if row is None:
+                        self.misses += 1
+                        return None
+                    conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+                    conn.commit()
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                logger.error(f"Error reading result cache: {str(e)}")
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        """
+        Store a JSON-serializable value and evict old entries
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                try:
+                    payload = json.dumps(value)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at, size) VALUES (?, ?, ?, ?, ?)",
+                        (key, payload, now, now, len(payload)),
+                    )
+                    self._evict(conn, now)
+                    conn.commit()
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                logger.error(f"Error writing result cache: {str(e)}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then the least recently used ones over max_entries or max_bytes"""
+        if self.max_age is not None:
+            cursor = conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.max_age,))
+            self.evictions += cursor.rowcount
+        cursor = conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            "SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self.evictions += cursor.rowcount
+        if self.max_bytes is not None:
+            # Keep the most recently used entries whose running size fits the budget
+            cursor = conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS total "
+                "FROM entries) WHERE total > ?)",
+                (self.max_bytes,),
+            )
+            self.evictions += cursor.rowcount
+
+    def clear(self):
+        """Remove every entry from the cache"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM entries")
+                conn.commit()
+            finally:
+                conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this process
+
+        Returns:
+            Dict with hits, misses, evictions and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+# Shared cache instance for the application results
+result_cache = ResultCache()
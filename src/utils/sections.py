@@ -0,0 +1,253 @@
+"""
+Output sections of a job application and incremental section streaming
+"""
+import re
+import time
+import threading
+from typing import Dict, Any, Callable, List, Optional
+
+from .crew_events import RunObserver
+
+# Output section produced by each crew task, keyed by task name
+TASK_SECTIONS = {
+    "analyze_job_description": "job_analysis",
+    "tailor_resume": "resume_suggestions",
+    "write_cover_letter": "cover_letter",
+    "prepare_interview": "interview_prep",
+}
+
+# Header that starts each section in the combined crew output
+SECTION_HEADERS = {
+    "job_analysis": "Job Analysis",
+    "resume_suggestions": "Resume Suggestions",
+    "cover_letter": "Cover Letter",
+    "interview_prep": "Interview Preparation",
+}
+
+# Matches a markdown header line naming a section, e.g. "## Cover Letter"
+HEADER_PATTERN = re.compile(
+    r"^[ \t]*#+[ \t]*(" + "|".join(re.escape(title) for title in SECTION_HEADERS.values()) + r")\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+_HEADER_SECTIONS = {title.lower(): key for key, title in SECTION_HEADERS.items()}
+
+# Marker that precedes an agent's final answer in its streamed LLM output
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+def format_section(key: str, content: str) -> str:
+    """
+    Make sure section content starts with a markdown header
+
+    Args:
+        key: Section key, e.g. "job_analysis"
+        content: Section content
+
+    Returns:
+        str: Content, prefixed with a header derived from the key if it had none
+    """
+    if content and not content.strip().startswith("#"):
+        header = f"# {key.replace('_', ' ').title()}"
+        return f"{header}\n\n{content}"
+    return content
+
+def task_output_text(output: Any) -> str:
+    """
+    Return the text of a task output
+
+    Structured outputs that can render themselves (e.g. JobAnalysis) are
+    shown as markdown rather than as their raw JSON.
+
+    Args:
+        output: CrewAI TaskOutput
+
+    Returns:
+        str: Stripped output text, empty if there is none
+    """
+    structured = getattr(output, 'pydantic', None)
+    if structured is not None and hasattr(structured, 'to_markdown'):
+        return structured.to_markdown()
+    raw = getattr(output, 'raw', None)
+    return str(raw).strip() if raw else ""
+
+def section_of(content: str) -> Optional[str]:
+    """
+    Identify a section by its first header line
+
+    Args:
+        content: Output of a single task
+
+    Returns:
+        Section key, or None if the content has no section header
+    """
+    match = HEADER_PATTERN.search(content)
+    return _HEADER_SECTIONS[match.group(1).lower()] if match else None
+
+class SectionParser:
+    """Splits text containing several sections into the individual sections
+
+    The text is scanned once with a precompiled header pattern, so parsing is
+    linear in its length. Text can be fed in arbitrary chunks, e.g. while it is
+    streamed; a header split across chunks is recognized once its line is
+    complete. Text before the first header is ignored, and a section that
+    appears twice keeps its last occurrence.
+    """
+
+    def __init__(self):
+        """Initialize the parser"""
+        self._sections: Dict[str, List[str]] = {}
+        self._current: Optional[List[str]] = None
+        # Pieces of the unterminated last line, joined once the line is complete
+        self._partial_line: List[str] = []
+
+    def feed(self, chunk: str) -> "SectionParser":
+        """
+        Parse the next piece of text
+
+        Args:
+            chunk: Text following the previously fed text
+
+        Returns:
+            The parser, for chaining
+        """
+        # Only complete lines are scanned; the unfinished last line waits for the next chunk
+        end = chunk.rfind("\n") + 1
+        if not end:
+            self._partial_line.append(chunk)
+            return self
+        text = "".join(self._partial_line) + chunk[:end] if self._partial_line else chunk[:end]
+        self._partial_line = [chunk[end:]] if end < len(chunk) else []
+        self._scan(text)
+        return self
+
+    def close(self) -> "SectionParser":
+        """Parse any remaining unterminated line; call once the input is complete"""
+        if self._partial_line:
+            text = "".join(self._partial_line)
+            self._partial_line = []
+            self._scan(text)
+        return self
+
+    def _scan(self, text: str):
+        """Split complete lines into the current and newly started sections"""
+        position = 0
+        for match in HEADER_PATTERN.finditer(text):
+            if self._current is not None:
+                self._current.append(text[position:match.start()])
+            self._current = self._sections[_HEADER_SECTIONS[match.group(1).lower()]] = []
+            position = match.start()
+        if self._current is not None:
+            self._current.append(text[position:])
+
+    def sections(self) -> Dict[str, str]:
+        """
+        Return the sections parsed so far
+
+        Returns:
+            Dict of stripped section text (including its header) keyed by section
+        """
+        sections = {key: "".join(parts).strip() for key, parts in self._sections.items()}
+        if self._partial_line and self._current is not None:
+            # Include the unfinished line of the section being streamed
+            last_key = next(key for key, parts in self._sections.items() if parts is self._current)
+            sections[last_key] = ("".join(self._current) + "".join(self._partial_line)).strip()
+        return sections
+
+def parse_sections(text: str) -> Dict[str, str]:
+    """
+    Split text containing several sections in a single pass
+
+    Args:
+        text: Combined output, e.g. the string form of a crew result
+
+    Returns:
+        Dict of section text keyed by section
+    """
+    return SectionParser().feed(text).close().sections()
+
+class SectionStream(RunObserver):
+    """Builds up each output section while its task is still running
+
+    Streamed LLM chunks are accumulated per section. Everything an agent writes
+    before its "Final Answer:" marker (reasoning, tool calls) is held back, so
+    only answer text is reported. When a task completes, its final output
+    replaces the streamed text.
+    """
+
+    def __init__(self, on_update: Callable[[str, str], None], min_interval: float = 0.2):
+        """
+        Initialize the stream
+
+        Args:
+            on_update: Called with (section key, section text so far)
+            min_interval: Minimum seconds between partial updates of one section
+        """
+        self.on_update = on_update
+        self.min_interval = min_interval
+        self._pending: Dict[str, str] = {}
+        self._answers: Dict[str, List[str]] = {}
+        self._final: Dict[str, str] = {}
+        self._last_update: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def on_task_started(self, task_name: str):
+        section = TASK_SECTIONS.get(task_name)
+        if section:
+            # Guardrail retries restart the task; drop the rejected answer
+            with self._lock:
+                self._pending.pop(section, None)
+                self._answers.pop(section, None)
+                self._last_update.pop(section, None)
+            self.on_update(section, "")
+
+    def on_llm_chunk(self, task_name: str, chunk: str):
+        section = TASK_SECTIONS.get(task_name)
+        if not section or not chunk:
+            return
+
+        with self._lock:
+            if section in self._final:
+                return
+            answer = self._answers.get(section)
+            if answer is None:
+                # Still looking for the marker; only rescan the tail that could contain it
+                pending = self._pending.get(section, "")
+                start = max(0, len(pending) - len(FINAL_ANSWER_MARKER))
+                pending += chunk
+                position = pending.find(FINAL_ANSWER_MARKER, start)
+                if position < 0:
+                    self._pending[section] = pending
+                    return
+                self._pending.pop(section, None)
+                answer = self._answers[section] = [pending[position + len(FINAL_ANSWER_MARKER):].lstrip()]
+            else:
+                answer.append(chunk)
+
+            now = time.monotonic()
+            if now - self._last_update.get(section, 0.0) < self.min_interval:
+                return
+            self._last_update[section] = now
+            text = "".join(answer)
+
+        if text.strip():
+            self.on_update(section, text)
+
+    def on_task_completed(self, task_name: str, output: Any):
+        section = TASK_SECTIONS.get(task_name)
+        text = task_output_text(output)
+        if not section or not text:
+            return
+
+        content = format_section(section, text)
+        with self._lock:
+            self._final[section] = content
+        self.on_update(section, content)
+
+    def sections(self) -> Dict[str, str]:
+        """
+        Return the sections of the tasks that have completed
+
+        Returns:
+            Dict of formatted section content keyed by section
+        """
+        with self._lock:
+            return dict(self._final)
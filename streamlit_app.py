@@ -3,18 +3,20 @@ Modern Streamlit UI for Job Application Assistant
 """
 import streamlit as st
 import os
-import json
 import logging
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Import our components
-from src.main import JobApplicationAssistant
+# Import our components. src.main (and with it CrewAI) is imported when the
+# job queue is first needed instead of at startup so cold starts stay fast.
 from src.utils.pdf_processor import PDFProcessor
+from src.utils.history_store import HistoryStore
+from src.utils.document_generator import DocumentGenerator
+from src.utils.application_processor import OUTPUT_FILES
 from src.ui.app import UIComponents
 
 # Set page configuration with modern settings
@@ -25,6 +27,42 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Number of history entries per page on the History page
+HISTORY_PAGE_SIZE = 20
+
+# Result sections and their tab labels, in display order
+RESULT_SECTIONS = [
+    ("job_analysis", "🔍 Job Analysis"),
+    ("resume_suggestions", "📄 Resume Tips"),
+    ("cover_letter", "✉️ Cover Letter"),
+    ("interview_prep", "🎯 Interview Prep"),
+]
+
+# Applications run at once by the shared job queue
+STREAMLIT_WORKERS = int(os.getenv("STREAMLIT_WORKERS", "2"))
+
+# Seconds without a progress poll after which a run is cancelled (the browser tab was closed)
+JOB_HEARTBEAT_TIMEOUT = 30.0
+
+# Progress label of each task state
+TASK_STATE_ICONS = {"pending": "⚪", "running": "⏳", "completed": "✅", "failed": "❌"}
+
+# Download button label of each result section
+DOWNLOAD_LABELS = {
+    "job_analysis": "📥 Download Job Analysis",
+    "resume_suggestions": "📥 Download Resume Tips",
+    "cover_letter": "📥 Download Cover Letter",
+    "interview_prep": "📥 Download Interview Guide",
+}
+
+@st.cache_resource
+def get_job_queue():
+    """Process-wide job queue shared by all sessions; crews run on its workers, not the script thread"""
+    from src.job_queue import JobQueue
+    job_queue = JobQueue(workers=STREAMLIT_WORKERS, output_dir=os.path.join("outputs", "streamlit"), stream=True)
+    job_queue.start()
+    return job_queue
+
 # Helper functions for file handling
 def extract_text_from_file(uploaded_file):
     """Extract text from an uploaded file (PDF or TXT)"""
@@ -39,62 +77,46 @@ def extract_text_from_file(uploaded_file):
         return None
 
 # Helper functions for history
+@st.cache_resource
+def get_history_store() -> HistoryStore:
+    """Shared SQLite history store; JSON history files are imported on first use"""
+    store = HistoryStore()
+    store.import_json_dir()
+    return store
+
 def save_application_history(job_title: str, company: str, results: Dict[str, Any]):
-    """Save application history to a JSON file"""
-    # Create history directory if it doesn't exist
-    history_dir = os.path.join("outputs", "history")
-    os.makedirs(history_dir, exist_ok=True)
-    
-    # Generate filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    # Sanitize filenames
-    job_title_safe = "".join([c if c.isalnum() else "_" for c in job_title])
-    company_safe = "".join([c if c.isalnum() else "_" for c in company])
-    
-    # Create filename
-    filename = f"{timestamp}_{company_safe}_{job_title_safe}.json"
-    
-    # Prepare data
-    history_data = {
-        "timestamp": timestamp,
-        "job_title": job_title,
-        "company": company,
-        "results": results
-    }
-    
-    # Save to file
-    file_path = os.path.join(history_dir, filename)
+    """Save application history to the history store"""
     try:
-        with open(file_path, 'w') as f:
-            json.dump(history_data, f)
-        return filename
+        return get_history_store().add(job_title, company, results)
     except Exception as e:
-        logger.error(f"Error saving history file: {str(e)}")
+        logger.error(f"Error saving history entry: {str(e)}")
         return None
 
-def load_application_history() -> List[Dict[str, Any]]:
-    """Load application history from JSON files"""
-    history_dir = os.path.join("outputs", "history")
-    if not os.path.exists(history_dir):
-        return []
-    
-    # Get all JSON files in the history directory
-    history_files = [f for f in os.listdir(history_dir) if f.endswith('.json')]
-    history = []
-    
-    # Load each file
-    for filename in history_files:
-        try:
-            with open(os.path.join(history_dir, filename), 'r') as f:
-                history_data = json.load(f)
-                history.append(history_data)
-        except Exception as e:
-            logger.error(f"Error loading history file {filename}: {e}")
-    
-    # Sort by timestamp (newest first)
-    history.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-    return history
+@st.cache_data(max_entries=128, show_spinner=False)
+def load_history_page(query: str, cursor: Optional[Tuple[str, int]], offset: int, version: int) -> List[Dict[str, Any]]:
+    """
+    Load the metadata of one page of history, shared by all sessions
+    
+    The store version is part of the cache key, so pages are reloaded after
+    new history is written.
+    """
+    store = get_history_store()
+    if query:
+        return store.search(query, HISTORY_PAGE_SIZE, offset)
+    if cursor:
+        return store.list_before(cursor[0], cursor[1], HISTORY_PAGE_SIZE)
+    return store.list(HISTORY_PAGE_SIZE)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_history_counts(version: int) -> Tuple[int, int]:
+    """Number of applications and of distinct companies, shared by all sessions"""
+    store = get_history_store()
+    return store.count(), store.company_count()
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def load_history_entry(entry_id: int) -> Dict[str, Any]:
+    """Load the results of one history entry; entries never change once saved"""
+    return get_history_store().get(entry_id) or {}
 
 # Initialize session state
 def init_session_state():
@@ -103,8 +125,9 @@ def init_session_state():
         st.session_state.processing = False
     if "results" not in st.session_state:
         st.session_state.results = {}
-    if "saved_files" not in st.session_state:
-        st.session_state.saved_files = {}
+    if "downloads" not in st.session_state:
+        # Section key -> (file name, bytes) of the last run, served without touching disk
+        st.session_state.downloads = {}
     if "job_title" not in st.session_state:
         st.session_state.job_title = ""
     if "company" not in st.session_state:
@@ -113,10 +136,108 @@ def init_session_state():
         st.session_state.job_description = ""
     if "resume_text" not in st.session_state:
         st.session_state.resume_text = ""
-    if "history" not in st.session_state:
-        st.session_state.history = load_application_history()
+    if "history_page" not in st.session_state:
+        st.session_state.history_page = 0
+    if "history_cursors" not in st.session_state:
+        # Last entry of each page seen so far, used to fetch the page after it
+        st.session_state.history_cursors = [None]
     if "input_method" not in st.session_state:
         st.session_state.input_method = "text"
+    if "job_id" not in st.session_state:
+        # Id of the application running on the job queue for this session
+        st.session_state.job_id = None
+
+def finish_job(job):
+    """Move a finished job's results into the session and save them to history"""
+    from src.job_queue import COMPLETED, CANCELLED
+    
+    st.session_state.job_id = None
+    st.session_state.processing = False
+    if job.status == CANCELLED:
+        st.session_state.job_outcome = ("warning", "🛑 Processing was cancelled.")
+        return
+    if job.status != COMPLETED:
+        st.session_state.job_outcome = ("error", f"❌ An error occurred: {job.error}")
+        return
+    
+    results = dict(job.sections)
+    st.session_state.results = results
+    # Served from memory, without touching disk
+    st.session_state.downloads = {
+        section: (filename, job.documents[filename].encode("utf-8"))
+        for section, filename in OUTPUT_FILES.items()
+        if filename in job.documents
+    }
+    # The "download all" archive is built on first display of these results
+    st.session_state.downloads_zip = None
+    
+    # Save to history
+    if st.session_state.job_title and st.session_state.company:
+        save_application_history(
+            st.session_state.job_title, 
+            st.session_state.company, 
+            results
+        )
+        # Start the History page from the newest entry again
+        st.session_state.history_page = 0
+        st.session_state.history_cursors = [None]
+    st.session_state.just_completed = True
+
+@st.fragment(run_every=1)
+def display_job_progress(detailed: bool):
+    """
+    Poll the session's running application
+    
+    Every poll also tells the job queue the session is still open; runs of
+    closed sessions are cancelled once the polls stop.
+    
+    Args:
+        detailed: Show the running task, task states and sections so far
+            (application page) instead of a one-line status (sidebar)
+    """
+    job = get_job_queue().get(st.session_state.job_id) if st.session_state.job_id else None
+    if job is None:
+        st.session_state.job_id = None
+        st.session_state.processing = False
+        return
+    job.touch()
+    
+    if job.done:
+        finish_job(job)
+        # Rerun the whole page so the finished results replace the live view
+        st.rerun(scope="app")
+    
+    snapshot = job.to_dict(include_text=False)
+    if snapshot["cancel_requested"]:
+        status = "🛑 Cancelling..."
+    elif snapshot["status"] == "queued":
+        status = "🕒 Waiting for a free worker..."
+    else:
+        status = f"⏳ Running: {snapshot['current_task'] or 'starting'}"
+    
+    if not detailed:
+        st.caption(status)
+        return
+    
+    st.markdown("## ⏳ Generating Your Application")
+    col_status, col_cancel = st.columns([3, 1])
+    with col_status:
+        st.markdown(status)
+        st.caption(" • ".join(f"{TASK_STATE_ICONS.get(state, '⚪')} {task_name}"
+                              for task_name, state in snapshot["tasks"].items()))
+    with col_cancel:
+        if st.button("🛑 Cancel", use_container_width=True, disabled=snapshot["cancel_requested"]):
+            get_job_queue().cancel(job.id)
+            st.rerun(scope="fragment")
+    
+    sections = dict(job.sections)
+    live_tabs = st.tabs([label for _, label in RESULT_SECTIONS])
+    for (section, _), tab in zip(RESULT_SECTIONS, live_tabs):
+        with tab:
+            if section in sections:
+                st.markdown(sections[section] or "✍️ Writing...")
+            else:
+                st.info("⏳ Waiting for the previous steps...")
 
 def display_application_page():
     """Display the main application page with clear input sections"""
@@ -214,7 +335,13 @@ def display_application_page():
     # Processing Section
     st.markdown("### 🚀 Generate Your Optimized Application")
     
-    if st.button("🎯 Optimize My Application", type="primary", use_container_width=True):
+    regenerate = st.checkbox(
+        "Regenerate (ignore cached results)",
+        help="Results for the same job description and resume are reused unless this is checked."
+    )
+    
+    if st.button("🎯 Optimize My Application", type="primary", use_container_width=True,
+                 disabled=bool(st.session_state.job_id)):
         # Validate inputs
         if not st.session_state.job_description.strip():
             st.error("📋 Please provide a job description to continue.")
@@ -224,123 +351,100 @@ def display_application_page():
             st.error("👤 Please provide your resume to continue.")
             st.stop()
         
-        # Show loading
-        with st.spinner("🤖 Processing your application... This may take 2-3 minutes"):
-            try:
-                # Create Job Application Assistant
-                assistant = JobApplicationAssistant()
-                
-                # Process application
-                results = assistant.process_application(
-                    st.session_state.job_description, 
-                    st.session_state.resume_text
-                )
-                
-                # Create specific output directory for streamlit runs
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                streamlit_output_dir = os.path.join("outputs", "streamlit", timestamp)
-                
-                # Save outputs
-                saved_files = assistant.save_outputs(streamlit_output_dir)
-                
-                # Update session state
-                st.session_state.processing = False
-                st.session_state.results = results
-                st.session_state.saved_files = saved_files
-                
-                # Save to history
-                if st.session_state.job_title and st.session_state.company:
-                    save_application_history(
-                        st.session_state.job_title, 
-                        st.session_state.company, 
-                        results
-                    )
-                    # Reload history
-                    st.session_state.history = load_application_history()
-                
-                st.success("🎉 Application optimized successfully!")
-                st.balloons()
-                
-            except Exception as e:
-                st.session_state.processing = False
-                st.error(f"❌ An error occurred: {str(e)}")
-                logger.error(f"Error processing application: {e}", exc_info=True)
+        # Hand the run to the shared job queue; the progress panel below polls it,
+        # so the script thread is never blocked by the crew
+        try:
+            job = get_job_queue().submit(
+                st.session_state.job_description,
+                st.session_state.resume_text,
+                use_cache=not regenerate,
+                heartbeat_timeout=JOB_HEARTBEAT_TIMEOUT
+            )
+        except Exception as e:
+            st.error(f"❌ Could not start processing: {str(e)}")
+            logger.error(f"Error submitting application: {str(e)}")
+            st.stop()
+        st.session_state.job_id = job.id
+        st.session_state.processing = True
+        st.session_state.pop("job_outcome", None)
+
+    if st.session_state.job_id:
+        display_job_progress(detailed=True)
+    
+    outcome = st.session_state.pop("job_outcome", None)
+    if outcome:
+        level, message = outcome
+        getattr(st, level)(message)
 
     # Display results if available
     if st.session_state.results:
+        if st.session_state.pop("just_completed", False):
+            st.success("🎉 Application optimized successfully!")
+            st.balloons()
+        
         st.markdown("---")
         st.markdown("## 📊 Your Application Results")
         
-        # Create tabs for results
-        tab1, tab2, tab3, tab4 = st.tabs([
-            "🔍 Job Analysis", 
-            "📄 Resume Tips", 
-            "✉️ Cover Letter", 
-            "🎯 Interview Prep"
-        ])
-        
-        with tab1:
-            if "job_analysis" in st.session_state.results:
-                st.markdown(st.session_state.results["job_analysis"])
-                if "job_analysis" in st.session_state.saved_files:
-                    with open(st.session_state.saved_files["job_analysis"], 'r', encoding='utf-8') as f:
-                        st.download_button(
-                            label="📥 Download Job Analysis",
-                            data=f.read(),
-                            file_name="job_analysis.md",
-                            mime="text/markdown",
-                            key="download_job_analysis"
-                        )
-        
-        with tab2:
-            if "resume_suggestions" in st.session_state.results:
-                st.markdown(st.session_state.results["resume_suggestions"])
-                if "resume_suggestions" in st.session_state.saved_files:
-                    with open(st.session_state.saved_files["resume_suggestions"], 'r', encoding='utf-8') as f:
-                        st.download_button(
-                            label="📥 Download Resume Tips",
-                            data=f.read(),
-                            file_name="resume_suggestions.md",
-                            mime="text/markdown",
-                            key="download_resume_suggestions"
-                        )
-        
-        with tab3:
-            if "cover_letter" in st.session_state.results:
-                st.markdown(st.session_state.results["cover_letter"])
-                if "cover_letter" in st.session_state.saved_files:
-                    with open(st.session_state.saved_files["cover_letter"], 'r', encoding='utf-8') as f:
-                        st.download_button(
-                            label="📥 Download Cover Letter",
-                            data=f.read(),
-                            file_name="cover_letter.md",
-                            mime="text/markdown",
-                            key="download_cover_letter"
-                        )
+        downloads = st.session_state.downloads
+        if downloads:
+            if st.session_state.get("downloads_zip") is None:
+                st.session_state.downloads_zip = DocumentGenerator.bundle_bytes(
+                    {filename: data.decode("utf-8") for filename, data in downloads.values()}
+                )
+            st.download_button(
+                label="📦 Download All (.zip)",
+                data=st.session_state.downloads_zip,
+                file_name="job_application.zip",
+                mime="application/zip",
+                key="download_all",
+                on_click="ignore"
+            )
         
-        with tab4:
-            if "interview_prep" in st.session_state.results:
-                st.markdown(st.session_state.results["interview_prep"])
-                if "interview_prep" in st.session_state.saved_files:
-                    with open(st.session_state.saved_files["interview_prep"], 'r', encoding='utf-8') as f:
+        # Create tabs for results
+        result_tabs = st.tabs([label for _, label in RESULT_SECTIONS])
+        for (section, _), tab in zip(RESULT_SECTIONS, result_tabs):
+            with tab:
+                if section in st.session_state.results:
+                    st.markdown(st.session_state.results[section])
+                    if section in downloads:
+                        filename, data = downloads[section]
                         st.download_button(
-                            label="📥 Download Interview Guide",
-                            data=f.read(),
-                            file_name="interview_prep.md",
+                            label=DOWNLOAD_LABELS[section],
+                            data=data,
+                            file_name=filename,
                             mime="text/markdown",
-                            key="download_interview_prep"
+                            key=f"download_{section}",
+                            on_click="ignore"
                         )
 
 def display_history_page():
-    """Display the history page"""
+    """Display the history page, one page of entries at a time"""
     st.markdown("## 📚 Application History")
     
-    if not st.session_state.history:
+    version = get_history_store().version()
+    if version == 0:
         st.info("📭 No application history yet. Process your first application to see history here.")
         return
     
-    # Display history entries
-    for i, entry in enumerate(st.session_state.history):
+    search_query = st.text_input(
+        "🔎 Search history",
+        placeholder="Search job titles, companies and generated content...",
+        on_change=lambda: st.session_state.update(history_page=0, history_cursors=[None])
+    ).strip()
+    
+    page = st.session_state.history_page
+    cursors = st.session_state.history_cursors
+    entries = load_history_page(
+        search_query,
+        None if search_query else cursors[page],
+        page * HISTORY_PAGE_SIZE,
+        version
+    )
+    if not entries:
+        st.info("No applications match your search." if search_query else "No more applications.")
+    
+    # Display history entries (metadata only until an entry is opened)
+    for entry in entries:
         job_title = entry.get('job_title', 'Untitled Position')
         company = entry.get('company', 'Unknown Company')
         timestamp = entry.get('timestamp', '')
@@ -353,29 +457,48 @@ def display_history_page():
             formatted_date = timestamp
         
         with st.expander(f"🎯 {job_title} at {company} - {formatted_date}"):
-            if "results" in entry:
-                # Show results in tabs
-                hist_tab1, hist_tab2, hist_tab3, hist_tab4 = st.tabs([
-                    "Job Analysis", "Resume Tips", "Cover Letter", "Interview Prep"
-                ])
-                
-                with hist_tab1:
-                    st.markdown(entry["results"].get("job_analysis", "No job analysis available."))
-                
-                with hist_tab2:
-                    st.markdown(entry["results"].get("resume_suggestions", "No resume suggestions available."))
-                
-                with hist_tab3:
-                    st.markdown(entry["results"].get("cover_letter", "No cover letter available."))
-                
-                with hist_tab4:
-                    st.markdown(entry["results"].get("interview_prep", "No interview preparation available."))
+            # Expander bodies always run, so results are only fetched once asked for
+            if not st.toggle("Show documents", key=f"history_open_{entry['id']}"):
+                continue
+            
+            results = load_history_entry(entry["id"]).get("results", {})
+            # Show results in tabs
+            hist_tab1, hist_tab2, hist_tab3, hist_tab4 = st.tabs([
+                "Job Analysis", "Resume Tips", "Cover Letter", "Interview Prep"
+            ])
+            
+            with hist_tab1:
+                st.markdown(results.get("job_analysis", "No job analysis available."))
+            
+            with hist_tab2:
+                st.markdown(results.get("resume_suggestions", "No resume suggestions available."))
+            
+            with hist_tab3:
+                st.markdown(results.get("cover_letter", "No cover letter available."))
+            
+            with hist_tab4:
+                st.markdown(results.get("interview_prep", "No interview preparation available."))
+    
+    # Pagination
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("← Newer", disabled=page == 0, use_container_width=True):
+            st.session_state.history_page = page - 1
+            st.rerun()
+    with col_page:
+        st.markdown(f"<div style='text-align: center'>Page {page + 1}</div>", unsafe_allow_html=True)
+    with col_next:
+        if st.button("Older →", disabled=len(entries) < HISTORY_PAGE_SIZE, use_container_width=True):
+            if not search_query and len(cursors) == page + 1:
+                cursors.append((entries[-1]["timestamp"], entries[-1]["id"]))
+            st.session_state.history_page = page + 1
+            st.rerun()
 
 def display_analytics_page():
     """Display analytics page"""
     st.markdown("## 📊 Analytics & Insights")
     
-    total_applications = len(st.session_state.history)
+    total_applications, unique_companies = load_history_counts(get_history_store().version())
     
     if total_applications == 0:
         st.info("📈 Analytics will appear here after you process some job applications.")
@@ -388,7 +511,6 @@ def display_analytics_page():
         st.metric("Applications", total_applications)
     
     with col2:
-        unique_companies = len(set(entry.get('company', '') for entry in st.session_state.history))
         st.metric("Companies", unique_companies)
     
     with col3:
@@ -428,6 +550,11 @@ def main():
         - 📥 Document Export
         """)
     
+    # Keep polling a running application while other pages are open
+    if page != "New Application" and st.session_state.job_id:
+        with st.sidebar:
+            display_job_progress(detailed=False)
+    
     # Display selected page
     if page == "New Application":
         display_application_page()
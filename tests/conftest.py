@@ -0,0 +1,111 @@
+"""
+Shared fixtures for the Job Application Assistant tests
+
+Every test runs offline: LLM calls are answered by a fake provider in place of
+litellm, web search uses the local backend, and caches and outputs are
+written under a temporary working directory.
+"""
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Set
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Configure the environment before any module of the assistant reads it
+os.environ.pop("OPENAI_API_KEY", None)
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ["CREWAI_TESTING"] = "true"
+os.environ["CREWAI_DISABLE_TELEMETRY"] = "true"
+os.environ["OTEL_SDK_DISABLED"] = "true"
+os.environ["SEARCH_BACKEND"] = "local"
+os.environ["METRICS_SINKS"] = ""
+os.environ["RATE_LIMIT"] = "0"
+os.environ["RETRY_BASE_DELAY"] = "0.01"
+
+from src.utils.sections import HEADER_PATTERN  # noqa: E402
+
+# Body of every answer after its header
+FILLER = (
+    "Demonstrated experience delivering reliable Python services, collaborating with "
+    "product teams and mentoring engineers while keeping quality and cost in check."
+)
+
+class FakeProvider:
+    """Answers litellm completion calls offline, like a model that follows the prompts
+
+    Each answer starts with the section header the task prompt asks for.
+    Models listed in failing_models answer without it. before_call, if set,
+    runs at the start of every call.
+    """
+
+    def __init__(self):
+        """Initialize the provider"""
+        self.failing_models: Set[str] = set()
+        self.calls: List[dict] = []
+        self.before_call: Optional[Callable[[dict], None]] = None
+        self._lock = threading.Lock()
+
+    def models(self) -> List[str]:
+        """Return the model of every call so far, in call order"""
+        with self._lock:
+            return [call["model"] for call in self.calls]
+
+    def answer(self, params: dict) -> str:
+        """Build the answer to one completion call"""
+        prompt = "\n".join(str(message.get("content", "")) for message in params.get("messages", []))
+        match = HEADER_PATTERN.search(prompt)
+        if params["model"] in self.failing_models or not match:
+            body = "Here are a few notes, without the requested header."
+        else:
+            body = f"# {match.group(1)}\n\n{FILLER}"
+        return f"Thought: I now know the final answer\nFinal Answer: {body}"
+
+    def completion(self, original: Callable, **params):
+        if self.before_call:
+            self.before_call(params)
+        with self._lock:
+            self.calls.append({"model": params["model"]})
+        return original(mock_response=self.answer(params), **params)
+
+@pytest.fixture(autouse=True)
+def working_dir(tmp_path, monkeypatch):
+    """Run every test in its own directory so caches and outputs never leak between tests"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+@pytest.fixture
+def fake_provider(monkeypatch) -> FakeProvider:
+    """Route every LLM call of the agents to a FakeProvider"""
+    import crewai.llm
+
+    provider = FakeProvider()
+    original = crewai.llm.litellm.completion
+    monkeypatch.setattr(crewai.llm.litellm, "completion", lambda **params: provider.completion(original, **params))
+    return provider
+
+@pytest.fixture
+def make_assistant(tmp_path):
+    """Build JobApplicationAssistants with a private result cache"""
+    from src.main import JobApplicationAssistant
+    from src.utils.result_cache import ResultCache
+
+    def make(**kwargs):
+        kwargs.setdefault("cache", ResultCache(str(tmp_path / "results.sqlite")))
+        return JobApplicationAssistant(**kwargs)
+
+    return make
+
+@pytest.fixture
+def job_description() -> str:
+    with open(PROJECT_ROOT / "examples" / "job_description.txt", "r", encoding="utf-8") as f:
+        return f.read()
+
+@pytest.fixture
+def resume_text() -> str:
+    with open(PROJECT_ROOT / "examples" / "resume.txt", "r", encoding="utf-8") as f:
+        return f.read()
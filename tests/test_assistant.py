@@ -0,0 +1,141 @@
+"""
+End-to-end runs of the assistant against the fake provider
+"""
+import time
+import asyncio
+import threading
+
+import pytest
+
+from src.assistant_pool import AssistantPool, get_pool
+from src.main import process_applications
+from src.utils.rate_limit import RunCancelled
+from src.utils.sections import SECTION_HEADERS
+
+def test_process_application_returns_every_section(fake_provider, make_assistant, job_description, resume_text):
+    assistant = make_assistant()
+
+    results = assistant.process_application(job_description, resume_text, use_cache=False)
+
+    assert set(results) == set(SECTION_HEADERS)
+    for section, title in SECTION_HEADERS.items():
+        assert results[section].startswith(f"# {title}")
+    assert assistant.metrics["status"] == "completed"
+    assert len(assistant.metrics["tasks"]) == 4
+
+def test_parallel_mode_returns_every_section(fake_provider, make_assistant, job_description, resume_text):
+    assistant = make_assistant(parallel=True)
+
+    results = assistant.process_application(job_description, resume_text, use_cache=False)
+
+    for section, title in SECTION_HEADERS.items():
+        assert results[section].startswith(f"# {title}")
+
+def test_cached_result_skips_the_crew(fake_provider, make_assistant, job_description, resume_text):
+    assistant = make_assistant()
+    first = assistant.process_application(job_description, resume_text)
+    calls = len(fake_provider.calls)
+
+    second = assistant.process_application(job_description, resume_text)
+
+    assert second == first
+    assert len(fake_provider.calls) == calls
+    assert assistant.metrics["status"] == "cached"
+
+def test_cache_is_bypassed_on_request(fake_provider, make_assistant, job_description, resume_text):
+    assistant = make_assistant()
+    assistant.process_application(job_description, resume_text)
+    calls = len(fake_provider.calls)
+
+    assistant.process_application(job_description, resume_text, use_cache=False)
+
+    assert len(fake_provider.calls) > calls
+
+def test_pooled_assistant_is_reused_across_runs(fake_provider, tmp_path, job_description, resume_text):
+    from src.utils.result_cache import ResultCache
+
+    pool = AssistantPool(size=1, cache=ResultCache(str(tmp_path / "results.sqlite")))
+    with pool.acquire() as assistant:
+        first = assistant.process_application(job_description, resume_text, use_cache=False)
+        crew_instance = assistant.get_crew()
+    with pool.acquire() as reused:
+        second = reused.process_application(job_description, resume_text, use_cache=False)
+
+    assert reused is assistant
+    assert reused.get_crew() is crew_instance
+    assert second == first
+    assert pool.stats()["created"] == 1
+
+def test_pool_never_grows_past_its_maximum():
+    pool = AssistantPool(size=2, max_size=3)
+
+    pool.ensure_size(10)
+
+    assert pool.size == 3
+
+def test_on_update_receives_every_section(fake_provider, make_assistant, job_description, resume_text):
+    assistant = make_assistant()
+    updates = {}
+
+    assistant.process_application(job_description, resume_text, use_cache=False,
+                                  on_update=lambda section, text: updates.__setitem__(section, text))
+
+    assert set(updates) == set(SECTION_HEADERS)
+    assert all(text.startswith("#") for text in updates.values())
+
+def test_async_run_streams_every_section(fake_provider, make_assistant, job_description, resume_text):
+    assistant = make_assistant()
+    updates = {}
+
+    results = asyncio.run(assistant.process_application_async(
+        job_description, resume_text, use_cache=False, on_update=lambda section, text: updates.__setitem__(section, text)))
+
+    assert set(updates) == set(SECTION_HEADERS)
+    assert updates == results
+
+def test_batch_runs_share_pooled_assistants(fake_provider, tmp_path, job_description, resume_text):
+    from src.utils.result_cache import ResultCache
+
+    cache = ResultCache(str(tmp_path / "results.sqlite"))
+    applications = [(job_description, f"{resume_text}\nVariant {index}") for index in range(4)]
+
+    results = asyncio.run(process_applications(applications, max_concurrency=2, cache=cache))
+
+    assert all(set(outputs) == set(SECTION_HEADERS) for outputs in results)
+    assert get_pool(cache=cache).stats() == {"size": 2, "created": 2, "idle": 2, "busy": 0}
+
+def test_cancelled_async_run_stops_the_crew(fake_provider, make_assistant, job_description, resume_text):
+    assistant = make_assistant()
+    fake_provider.before_call = lambda params: time.sleep(0.1)
+
+    async def cancel_after_first_call():
+        run = asyncio.ensure_future(assistant.process_application_async(job_description, resume_text, use_cache=False))
+        while not fake_provider.calls:
+            await asyncio.sleep(0.01)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        # asyncio.run waits for the crew's thread, so check while the loop still runs
+        calls = len(fake_provider.calls)
+        await asyncio.sleep(0.5)
+        assert len(fake_provider.calls) == calls
+
+    asyncio.run(cancel_after_first_call())
+
+def test_cancelled_parallel_run_stops_every_task(fake_provider, make_assistant, job_description, resume_text):
+    assistant = make_assistant(parallel=True)
+    cancel_event = threading.Event()
+
+    def cancel_during_the_call(params):
+        cancel_event.set()
+        time.sleep(0.1)
+
+    fake_provider.before_call = cancel_during_the_call
+
+    with pytest.raises(RunCancelled):
+        assistant.process_application(job_description, resume_text, use_cache=False, cancel_event=cancel_event)
+    calls = len(fake_provider.calls)
+    time.sleep(0.3)
+
+    assert all(task.join(timeout=0) for task in assistant.get_crew().tasks)
+    assert len(fake_provider.calls) == calls
@@ -0,0 +1,60 @@
+"""
+Input compaction
+"""
+from src.utils.compaction import InputCompactor, remove_boilerplate, remove_page_noise, strip_html, truncate_to_budget
+
+def test_boilerplate_sentences_are_removed_but_their_paragraph_is_kept():
+    text = (
+        "Requirements: 5+ years of Python.\n\n"
+        "We are an equal opportunity employer. The salary range is $120,000-$150,000. "
+        "Candidates need a valid work permit.\n\n"
+        "We provide reasonable accommodations to applicants with disabilities."
+    )
+
+    compacted = remove_boilerplate(text)
+
+    assert "equal opportunity" not in compacted
+    assert "accommodations" not in compacted
+    assert "$120,000-$150,000" in compacted
+    assert "valid work permit" in compacted
+    assert compacted.startswith("Requirements: 5+ years of Python.")
+
+def test_sentences_with_numbers_are_kept():
+    text = "Pay transparency: this role pays $90k-$110k. E-verify applies to all 50 states."
+
+    assert remove_boilerplate(text) == text
+
+def test_truncation_cuts_at_a_line():
+    text = "\n".join(f"Line {index} of the resume" for index in range(200))
+
+    truncated, was_truncated = truncate_to_budget(text, 100)
+
+    assert was_truncated
+    assert truncated.endswith("[... truncated to fit the input budget ...]")
+    assert len(truncated) <= 400
+
+def test_compact_job_description():
+    compactor = InputCompactor(budgets={"job_description": 1000})
+
+    text, truncated = compactor.compact_text(
+        "job_description", "<p>Backend Engineer</p><p>Backend Engineer</p>\n\nWe are an Equal Opportunity Employer.")
+
+    assert text == "Backend Engineer\nBackend Engineer"
+    assert not truncated
+
+def test_page_noise_keeps_dates_and_numbers_inside_a_page():
+    text = "Experience\n01/2019 - 03/2021\nBackend Engineer\n12\nPage 1 of 2\n- 1 -\f2\nEducation\n2015"
+
+    cleaned = remove_page_noise(text)
+
+    assert cleaned == "Experience\n01/2019 - 03/2021\nBackend Engineer\n12\fEducation\n2015"
+
+def test_generics_are_not_mistaken_for_html():
+    text = "Strong C++ (vector<int>, map<string, int>) and Java (List<T>) skills. R&D at AT&T."
+
+    assert strip_html(text) == text
+
+def test_html_tags_and_entities_are_stripped():
+    text = "<div><h2>Requirements</h2><ul><li>Go &amp; Rust</li></ul></div><!-- tracking -->"
+
+    assert strip_html(text).split() == ["Requirements", "-", "Go", "&", "Rust"]
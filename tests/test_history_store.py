@@ -0,0 +1,51 @@
+"""
+SQLite application history
+"""
+import pytest
+
+from src.utils.history_store import HistoryStore
+
+RESULTS = {
+    "job_analysis": "# Job Analysis\nKubernetes and Go",
+    "cover_letter": "# Cover Letter\nDear Hiring Manager",
+}
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "history.sqlite"))
+
+def test_add_and_get(store):
+    entry_id = store.add("Backend Engineer", "Acme", RESULTS, timestamp="20250101_120000")
+
+    entry = store.get(entry_id)
+
+    assert entry["job_title"] == "Backend Engineer"
+    assert entry["company"] == "Acme"
+    assert entry["results"] == RESULTS
+
+def test_list_is_newest_first_and_pages_by_cursor(store):
+    for day in range(1, 6):
+        store.add(f"Role {day}", "Acme", RESULTS, timestamp=f"202501{day:02d}_120000")
+
+    first_page = store.list(2)
+    next_page = store.list_before(first_page[-1]["timestamp"], first_page[-1]["id"], 2)
+
+    assert [entry["job_title"] for entry in first_page] == ["Role 5", "Role 4"]
+    assert [entry["job_title"] for entry in next_page] == ["Role 3", "Role 2"]
+    assert "results" not in first_page[0]
+
+def test_search_matches_generated_content(store):
+    store.add("Backend Engineer", "Acme", RESULTS)
+    store.add("Designer", "Globex", {"job_analysis": "# Job Analysis\nFigma"})
+
+    assert [entry["company"] for entry in store.search("kubernetes")] == ["Acme"]
+    assert [entry["company"] for entry in store.search("globex")] == ["Globex"]
+
+def test_counts_and_version(store):
+    assert store.version() == 0
+    store.add("Backend Engineer", "Acme", RESULTS)
+    store.add("Frontend Engineer", "Acme", RESULTS)
+
+    assert store.count() == 2
+    assert store.company_count() == 1
+    assert store.version() > 0
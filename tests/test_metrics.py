@@ -0,0 +1,39 @@
+"""
+Run metrics records
+"""
+from types import SimpleNamespace
+
+from src.utils.metrics import RunMetrics
+
+def make_task(name: str, retry_count: int = 0):
+    agent = SimpleNamespace(role="Writer", llm=SimpleNamespace(model="gemini/gemini-2.5-flash"))
+    return SimpleNamespace(name=name, agent=agent, retry_count=retry_count)
+
+def test_task_record():
+    task = make_task("write_cover_letter")
+    metrics = RunMetrics([task])
+
+    metrics.on_task_started("write_cover_letter")
+    metrics.on_llm_call("write_cover_letter", failed=False)
+    metrics.on_tool_used("write_cover_letter", "search", failed=True)
+    metrics.on_task_completed("write_cover_letter", None)
+    record = metrics.finish()
+
+    task_record = record["tasks"][0]
+    assert task_record["section"] == "cover_letter"
+    assert task_record["model"] == "gemini/gemini-2.5-flash"
+    assert task_record["status"] == "completed"
+    assert (task_record["llm_calls"], task_record["tool_calls"], task_record["tool_errors"]) == (1, 1, 1)
+    assert record["totals"]["slowest_task"] == "write_cover_letter"
+
+def test_retries_count_only_this_run():
+    # A reused task still carries the guardrail retries of earlier runs
+    task = make_task("write_cover_letter", retry_count=2)
+    metrics = RunMetrics([task])
+
+    metrics.on_task_started("write_cover_letter")
+    task.retry_count += 1
+    metrics.on_task_started("write_cover_letter")
+    metrics.on_task_completed("write_cover_letter", None)
+
+    assert metrics.finish()["totals"]["retries"] == 1
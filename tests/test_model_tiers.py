@@ -0,0 +1,43 @@
+"""
+Model tier escalation
+"""
+from src.utils.sections import SECTION_HEADERS
+
+CHEAP_MODEL = "gemini/gemini-2.5-flash-lite"
+
+def test_invalid_output_escalates_to_the_next_tier(fake_provider, make_assistant, job_description, resume_text):
+    fake_provider.failing_models.add(CHEAP_MODEL)
+    assistant = make_assistant()
+
+    results = assistant.process_application(job_description, resume_text, use_cache=False)
+
+    for section, title in SECTION_HEADERS.items():
+        assert results[section].startswith(f"# {title}")
+    records = {record["task"]: record for record in assistant.metrics["tasks"]}
+    assert records["analyze_job_description"]["escalations"] == 1
+    assert records["analyze_job_description"]["model"] == "gemini/gemini-2.5-flash"
+    assert records["write_cover_letter"]["escalations"] == 0
+
+def test_reused_assistant_escalates_again(fake_provider, make_assistant, job_description, resume_text):
+    fake_provider.failing_models.add(CHEAP_MODEL)
+    assistant = make_assistant()
+
+    for _ in range(2):
+        results = assistant.process_application(job_description, resume_text, use_cache=False)
+
+        assert results["job_analysis"].startswith("# Job Analysis")
+        assert assistant.metrics["status"] == "completed"
+        assert assistant.metrics["totals"]["escalations"] == 3
+        assert assistant.metrics["totals"]["retries"] == 3
+
+def test_every_run_starts_on_the_first_tier(fake_provider, make_assistant, job_description, resume_text):
+    assistant = make_assistant()
+    fake_provider.failing_models.add(CHEAP_MODEL)
+    assistant.process_application(job_description, resume_text, use_cache=False)
+    fake_provider.failing_models.clear()
+    calls = len(fake_provider.calls)
+
+    assistant.process_application(job_description, resume_text, use_cache=False)
+
+    assert fake_provider.models()[calls] == CHEAP_MODEL
+    assert assistant.metrics["totals"]["escalations"] == 0
@@ -0,0 +1,109 @@
+"""
+Shared rate limiter and retry policy
+"""
+import time
+import threading
+
+import pytest
+
+from src.utils.rate_limit import RateLimiter, RetryPolicy, RunCancelled, call_with_retry, is_retryable, retry_after
+
+class RateLimited(Exception):
+    """429 answer with a Retry-After header"""
+
+    status_code = 429
+
+    def __init__(self, delay: str = "0.01"):
+        super().__init__("Too many requests")
+        self.headers = {"retry-after": delay}
+
+class BadRequest(Exception):
+    """400 answer, never retried"""
+
+    status_code = 400
+
+@pytest.fixture
+def limiter(tmp_path):
+    return RateLimiter(str(tmp_path / "limits.sqlite"), limits={"test": (50.0, 1)})
+
+@pytest.fixture
+def policy():
+    return RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.05)
+
+def test_calls_are_spaced_at_the_configured_rate(limiter):
+    start = time.perf_counter()
+    for _ in range(6):
+        limiter.acquire("test:default")
+
+    # Five intervals of 20 ms after the first call
+    assert time.perf_counter() - start >= 0.09
+
+def test_buckets_are_shared_through_the_database(tmp_path):
+    path = str(tmp_path / "limits.sqlite")
+    first = RateLimiter(path, limits={"test": (10.0, 1)})
+    second = RateLimiter(path, limits={"test": (10.0, 1)})
+
+    first.acquire("test:default")
+
+    assert second.acquire("test:default") > 0.05
+
+def test_unlimited_providers_never_wait(limiter):
+    assert all(limiter.acquire("other:default") == 0 for _ in range(20))
+
+def test_retries_rate_limited_calls(limiter, policy):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimited()
+        return "ok"
+
+    assert call_with_retry(flaky, "test:default", limiter=limiter, policy=policy) == "ok"
+    assert len(attempts) == 3
+
+def test_gives_up_after_max_attempts(limiter, policy):
+    def always_limited():
+        raise RateLimited()
+
+    with pytest.raises(RateLimited):
+        call_with_retry(always_limited, "test:default", limiter=limiter, policy=policy)
+
+def test_client_errors_are_not_retried(limiter, policy):
+    attempts = []
+
+    def bad_request():
+        attempts.append(1)
+        raise BadRequest("invalid model")
+
+    with pytest.raises(BadRequest):
+        call_with_retry(bad_request, "test:default", limiter=limiter, policy=policy)
+    assert len(attempts) == 1
+
+def test_retry_hints():
+    assert retry_after(RateLimited("2.5")) == 2.5
+    assert retry_after(Exception('quota exceeded, "retryDelay": "7s"')) == 7.0
+    assert is_retryable(RateLimited())
+    assert not is_retryable(BadRequest())
+
+def test_cancelled_call_is_never_made(limiter, policy):
+    cancel_event = threading.Event()
+    cancel_event.set()
+
+    with pytest.raises(RunCancelled):
+        call_with_retry(lambda: pytest.fail("called"), "test:default", limiter=limiter, policy=policy,
+                        cancel_event=cancel_event)
+
+def test_cancel_interrupts_the_backoff(limiter):
+    cancel_event = threading.Event()
+    slow_policy = RetryPolicy(max_attempts=3, base_delay=10.0, max_delay=10.0)
+
+    def limited_then_cancelled():
+        cancel_event.set()
+        raise RateLimited("10")
+
+    start = time.perf_counter()
+    with pytest.raises(RunCancelled):
+        call_with_retry(limited_then_cancelled, "other:default", limiter=limiter, policy=slow_policy,
+                        cancel_event=cancel_event)
+    assert time.perf_counter() - start < 1.0
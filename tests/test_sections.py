@@ -0,0 +1,75 @@
+"""
+Section parsing and streaming
+"""
+from types import SimpleNamespace
+
+from src.utils.sections import SectionParser, SectionStream, format_section, parse_sections, section_of
+
+COMBINED = """Some preamble the agents wrote first.
+# Job Analysis
+Python, APIs and cloud.
+
+## Resume Suggestions
+- Lead with the Django project
+
+# Cover Letter
+Dear Hiring Manager,
+
+# Interview Preparation
+1. Tell me about a service you scaled.
+"""
+
+def test_parse_sections_splits_on_headers():
+    sections = parse_sections(COMBINED)
+
+    assert set(sections) == {"job_analysis", "resume_suggestions", "cover_letter", "interview_prep"}
+    assert sections["job_analysis"].startswith("# Job Analysis")
+    assert "Django" in sections["resume_suggestions"]
+    assert "preamble" not in "".join(sections.values())
+
+def test_parser_handles_headers_split_across_chunks():
+    parser = SectionParser()
+    for start in range(0, len(COMBINED), 7):
+        parser.feed(COMBINED[start:start + 7])
+
+    assert parser.close().sections() == parse_sections(COMBINED)
+
+def test_section_of_and_format_section():
+    assert section_of("## cover letter\nDear Hiring Manager") == "cover_letter"
+    assert section_of("No header here") is None
+    assert format_section("cover_letter", "Dear Hiring Manager").startswith("# Cover Letter")
+
+def test_stream_reports_only_the_final_answer():
+    updates = []
+    stream = SectionStream(lambda section, text: updates.append((section, text)), min_interval=0)
+
+    stream.on_task_started("write_cover_letter")
+    for chunk in ["Thought: I should search", " first\nFinal ", "Answer: # Cover Letter\n", "Dear Hiring Manager"]:
+        stream.on_llm_chunk("write_cover_letter", chunk)
+
+    assert updates[0] == ("cover_letter", "")
+    assert updates[-1] == ("cover_letter", "# Cover Letter\nDear Hiring Manager")
+    assert all("Thought" not in text for _, text in updates)
+
+def test_retry_starts_the_section_over():
+    updates = []
+    stream = SectionStream(lambda section, text: updates.append((section, text)), min_interval=0)
+
+    stream.on_task_started("write_cover_letter")
+    stream.on_llm_chunk("write_cover_letter", "Final Answer: Dear Sir")
+    stream.on_task_started("write_cover_letter")
+    stream.on_llm_chunk("write_cover_letter", "Thought: add the header\nFinal Answer: # Cover Letter\nDear Hiring Manager")
+
+    assert updates[-2] == ("cover_letter", "")
+    assert updates[-1] == ("cover_letter", "# Cover Letter\nDear Hiring Manager")
+
+def test_completed_output_replaces_the_streamed_text():
+    updates = []
+    stream = SectionStream(lambda section, text: updates.append((section, text)), min_interval=0)
+
+    stream.on_llm_chunk("prepare_interview", "Final Answer: # Interview Preparation\ndraft")
+    stream.on_task_completed("prepare_interview", SimpleNamespace(raw="# Interview Preparation\nfinal"))
+    stream.on_llm_chunk("prepare_interview", "late chunk")
+
+    assert updates[-1] == ("interview_prep", "# Interview Preparation\nfinal")
+    assert stream.sections() == {"interview_prep": "# Interview Preparation\nfinal"}
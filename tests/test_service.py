@@ -0,0 +1,160 @@
+"""
+Job queue and HTTP service
+"""
+import json
+import time
+import threading
+import http.client
+
+import pytest
+
+from src.job_queue import CANCELLED, COMPLETED, RUNNING, Job, JobQueue
+from src.service import ServiceServer
+from src.utils.result_cache import ResultCache
+
+@pytest.fixture
+def job_queue(fake_provider, tmp_path):
+    job_queue = JobQueue(workers=1, output_dir=str(tmp_path / "service"),
+                         cache=ResultCache(str(tmp_path / "results.sqlite")))
+    job_queue.start(warm_up=False)
+    yield job_queue
+    job_queue.stop(timeout=5)
+
+@pytest.fixture
+def server(job_queue):
+    server = ServiceServer(("127.0.0.1", 0), job_queue)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def request(server, method: str, path: str, body=None, headers=None):
+    """Send one request and return (status, headers, body)"""
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=30)
+    try:
+        payload = json.dumps(body).encode("utf-8") if body is not None and not isinstance(body, bytes) else body
+        conn.request(method, path, body=payload, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+def wait_until_done(job, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while not job.done:
+        assert time.monotonic() < deadline, f"job still {job.status}"
+        job.wait_for_update(job.version, timeout=0.5)
+
+def test_queued_job_runs_to_completion(job_queue, job_description, resume_text):
+    job = job_queue.submit(job_description, resume_text, use_cache=False)
+
+    wait_until_done(job)
+
+    assert job.status == COMPLETED
+    assert set(job.tasks.values()) == {"completed"}
+    assert set(job.sections) == {"job_analysis", "resume_suggestions", "cover_letter", "interview_prep"}
+    assert "cover_letter.md" in job.documents
+
+def test_submit_poll_and_download(server, job_queue, job_description, resume_text):
+    status, headers, body = request(server, "POST", "/applications",
+                                    {"job_description": job_description, "resume": resume_text})
+    assert status == 202
+    job_id = json.loads(body)["id"]
+    assert headers["Location"] == f"/applications/{job_id}"
+
+    wait_until_done(job_queue.get(job_id))
+    status, _, body = request(server, "GET", f"/applications/{job_id}")
+    assert status == 200
+    assert json.loads(body)["status"] == COMPLETED
+
+    status, _, body = request(server, "GET", f"/applications/{job_id}/outputs")
+    assert sorted(json.loads(body)["files"]) == sorted(
+        ["job_analysis.md", "resume_suggestions.md", "cover_letter.md", "interview_prep.md"])
+    status, _, body = request(server, "GET", f"/applications/{job_id}/outputs/cover_letter.md")
+    assert status == 200 and body.startswith(b"# Cover Letter")
+    status, headers, _ = request(server, "GET", f"/applications/{job_id}/outputs?format=zip")
+    assert status == 200 and headers["Content-Type"] == "application/zip"
+
+def test_finished_jobs_cannot_be_cancelled(server, job_queue, job_description, resume_text):
+    job = job_queue.submit(job_description, resume_text)
+    wait_until_done(job)
+
+    status, _, _ = request(server, "DELETE", f"/applications/{job.id}")
+
+    assert status == 409
+
+def test_job_cancelled_before_it_starts_stays_cancelled(job_description, resume_text):
+    job = Job(job_description, resume_text)
+
+    assert job.cancel()
+
+    assert not job.start()
+    assert job.status == CANCELLED
+
+def test_cancelled_job_does_not_serve_a_cached_result(fake_provider, job_queue, job_description, resume_text):
+    wait_until_done(job_queue.submit(job_description, resume_text))
+    job = Job(job_description, resume_text)
+    job.start()
+    job.cancel()
+
+    job_queue._run(job)
+
+    assert job.status == CANCELLED
+    assert job.sections == {}
+
+def test_cancel_aborts_a_running_job(fake_provider, job_queue, job_description, resume_text):
+    job = job_queue.submit(job_description, resume_text, use_cache=False)
+    fake_provider.before_call = lambda params: job.cancel()
+
+    wait_until_done(job)
+
+    assert job.status == CANCELLED
+    assert len(fake_provider.calls) == 1
+
+def test_stop_ends_every_worker_when_the_queue_is_full(fake_provider, tmp_path, job_description, resume_text):
+    job_queue = JobQueue(workers=2, max_pending=1, output_dir=str(tmp_path / "service"),
+                         cache=ResultCache(str(tmp_path / "results.sqlite")))
+    release = threading.Event()
+    fake_provider.before_call = lambda params: release.wait(10)
+    job_queue.start(warm_up=False)
+    running = []
+    for _ in range(2):
+        running.append(job_queue.submit(job_description, resume_text, use_cache=False))
+        deadline = time.monotonic() + 30
+        while running[-1].status != RUNNING:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+    waiting = job_queue.submit(job_description, resume_text, use_cache=False)
+
+    stopper = threading.Thread(target=job_queue.stop, kwargs={"timeout": 10})
+    stopper.start()
+    release.set()
+    stopper.join(30)
+
+    assert not any(thread.is_alive() for thread in job_queue._threads)
+    assert waiting.status == CANCELLED
+    assert all(job.done for job in running)
+
+def test_unknown_paths_and_ids(server):
+    assert request(server, "GET", "/applications/missing")[0] == 404
+    assert request(server, "GET", "/nothing")[0] == 404
+    assert request(server, "GET", "/healthz")[0] == 200
+
+def test_rejects_incomplete_submissions(server):
+    assert request(server, "POST", "/applications", {"job_description": "too short"})[0] == 400
+    assert request(server, "POST", "/applications", b"not json")[0] == 400
+    assert request(server, "POST", "/applications", {"job_description": 42, "resume": ["a"]})[0] == 400
+    assert request(server, "POST", "/applications", {"job_description": "", "resume": "  "})[0] == 400
+    assert request(server, "POST", "/applications", [1, 2])[0] == 400
+
+def test_rejects_a_non_boolean_use_cache(server, job_description, resume_text):
+    for use_cache in ("false", 0, None):
+        body = {"job_description": job_description, "resume": resume_text, "use_cache": use_cache}
+        assert request(server, "POST", "/applications", body)[0] == 400
+
+def test_rejects_invalid_and_oversized_bodies(server):
+    status, _, _ = request(server, "POST", "/applications", b"{}", {"Content-Length": "abc"})
+    assert status == 400
+    status, _, _ = request(server, "POST", "/applications", b"{}", {"Content-Length": str(10 ** 9)})
+    assert status == 413
+    assert request(server, "GET", "/healthz")[0] == 200